@@ -0,0 +1,272 @@
+"""
+API HTTP do Ecossistema de Direct Response
+
+Serviço headless que expõe o garimpo, a modelagem de copy e a criação de
+entregáveis para outros sistemas. Cada requisição vira um job no pool de
+workers (modules/jobs_module.py); o cliente submete, consulta o status e
+busca o resultado. O Streamlit (app.py) é apenas mais um cliente dos
+mesmos jobs.
+
+Execução:
+    uvicorn api:app --host 0.0.0.0 --port 8000
+
+Variáveis de ambiente:
+    API_TOKEN    Se definida, exige o cabeçalho X-API-Key com este valor
+    API_WORKERS  Número de jobs executados em paralelo (padrão: 8)
+"""
+
+import os
+import asyncio
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from modules.contexto_module import ContextoSessao
+from modules.jobs_module import GerenciadorJobs, obter_gerenciador
+
+app = FastAPI(
+    title="Ecossistema DR - API",
+    description="Garimpo de ofertas, modelagem de copy e criação de entregáveis via jobs assíncronos.",
+    version="1.0.0",
+)
+
+
+# --- ESQUEMAS ---
+
+class Credenciais(BaseModel):
+    """Credenciais opcionais da requisição (têm prioridade sobre o .env do servidor)."""
+    openai_api_key: Optional[str] = None
+    google_api_key: Optional[str] = None
+    clickbank_username: Optional[str] = None
+    clickbank_password: Optional[str] = None
+    hotmart_email: Optional[str] = None
+    hotmart_password: Optional[str] = None
+
+
+class PedidoGarimpo(BaseModel):
+    credenciais: Credenciais = Field(default_factory=Credenciais)
+
+
+class PedidoCopy(BaseModel):
+    copy_original: str = Field(..., min_length=1)
+    nicho: str = ""
+    publico_alvo: str = ""
+    provider: Literal["manus", "openai", "gemini", "auto"] = "manus"
+    secao: Optional[Literal["hooks", "cta"]] = Field(
+        None, description="Refaz só esta seção de uma copy já gerada com os mesmos campos (prompt menor)"
+    )
+    variacoes: int = Field(1, ge=1, le=5, description="Acima de 1, gera N variações ranqueadas localmente")
+    usar_cache: bool = True
+    hedge: bool = Field(False, description="No provedor auto, dispara um pedido de reserva se o primeiro demorar")
+    credenciais: Credenciais = Field(default_factory=Credenciais)
+
+
+class PedidoEntregavel(BaseModel):
+    topico: str = Field(..., min_length=1)
+    tipo: str = "E-book"
+    idioma: Literal["pt", "en", "es", "it", "de", "fr"] = "pt"
+    traducoes: List[Literal["pt", "en", "es", "it", "de", "fr"]] = Field(
+        default_factory=list, description="Idiomas traduzidos a partir da versão gerada em `idioma`"
+    )
+    publico_alvo: str = ""
+    provider: Literal["manus", "openai", "gemini", "auto"] = "openai"
+    usar_cache: bool = True
+    hedge: bool = Field(False, description="No provedor auto, dispara um pedido de reserva se o primeiro demorar")
+    rascunho: Optional[str] = Field(
+        None, description="ID de um job de entregável longo cancelado ou com falha, para retomar do rascunho dele"
+    )
+    credenciais: Credenciais = Field(default_factory=Credenciais)
+
+
+class PedidoLote(BaseModel):
+    """Vários pedidos em uma única chamada (para integrações em massa)."""
+    copies: List[PedidoCopy] = Field(default_factory=list)
+    entregaveis: List[PedidoEntregavel] = Field(default_factory=list)
+
+
+class JobCriado(BaseModel):
+    job_id: str
+    status: str
+
+
+class StatusJob(BaseModel):
+    job_id: str
+    tipo: str
+    status: str
+    progresso: float
+    mensagem: Optional[str] = None
+    erro: Optional[str] = None
+    resultado_parcial: Optional[Any] = None
+    criado_em: str
+    iniciado_em: Optional[str] = None
+    concluido_em: Optional[str] = None
+
+
+class ResultadoJob(BaseModel):
+    job_id: str
+    status: str
+    resultado: Any
+
+
+# --- DEPENDÊNCIAS ---
+
+def verificar_token(x_api_key: Optional[str] = Header(default=None)):
+    """Exige X-API-Key quando API_TOKEN estiver configurado no servidor."""
+    token = os.getenv("API_TOKEN")
+    if token and x_api_key != token:
+        raise HTTPException(status_code=401, detail="X-API-Key inválida ou ausente")
+
+
+_gerenciador: Optional[GerenciadorJobs] = None
+
+
+def gerenciador() -> GerenciadorJobs:
+    """Pool de workers do serviço (criado na primeira requisição)."""
+    global _gerenciador
+    if _gerenciador is None:
+        _gerenciador = obter_gerenciador(max_workers=int(os.getenv("API_WORKERS", "8")))
+    return _gerenciador
+
+
+def _contexto(credenciais: Credenciais, provider: str = "manus", hedge: bool = False) -> ContextoSessao:
+    return ContextoSessao.do_ambiente(**credenciais.model_dump(), provider=provider, hedge=hedge)
+
+
+async def _submeter(tipo: str, parametros: Dict, contexto: ContextoSessao) -> JobCriado:
+    # A inserção na tabela de jobs é síncrona (SQLite); roda fora do event loop
+    job_id = await asyncio.to_thread(gerenciador().submeter, tipo, parametros, {"contexto": contexto})
+    return JobCriado(job_id=job_id, status="pendente")
+
+
+async def _buscar_job(job_id: str) -> Dict:
+    job = await asyncio.to_thread(gerenciador().status, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    return job
+
+
+# --- ENDPOINTS ---
+
+@app.get("/saude")
+async def saude():
+    """Verificação simples de disponibilidade."""
+    return {"status": "ok"}
+
+
+@app.post("/jobs/garimpo", response_model=JobCriado, status_code=202, dependencies=[Depends(verificar_token)])
+async def criar_job_garimpo(pedido: PedidoGarimpo):
+    """Submete um garimpo completo (ClickBank + Hotmart)."""
+    return await _submeter("garimpo", {}, _contexto(pedido.credenciais))
+
+
+@app.post("/jobs/copy", response_model=JobCriado, status_code=202, dependencies=[Depends(verificar_token)])
+async def criar_job_copy(pedido: PedidoCopy):
+    """Submete a modelagem de uma copy."""
+    parametros = pedido.model_dump(exclude={"credenciais", "hedge"})
+    return await _submeter("copy", parametros, _contexto(pedido.credenciais, pedido.provider, pedido.hedge))
+
+
+@app.post("/jobs/entregavel", response_model=JobCriado, status_code=202, dependencies=[Depends(verificar_token)])
+async def criar_job_entregavel(pedido: PedidoEntregavel):
+    """Submete a criação de um entregável."""
+    parametros = pedido.model_dump(exclude={"credenciais", "hedge"})
+    return await _submeter("entregavel", parametros, _contexto(pedido.credenciais, pedido.provider, pedido.hedge))
+
+
+@app.post("/jobs/lote", response_model=List[JobCriado], status_code=202, dependencies=[Depends(verificar_token)])
+async def criar_jobs_lote(pedido: PedidoLote):
+    """Submete vários pedidos de copy e entregável de uma vez; retorna os IDs na mesma ordem."""
+    tarefas = [
+        _submeter("copy", p.model_dump(exclude={"credenciais", "hedge"}), _contexto(p.credenciais, p.provider, p.hedge))
+        for p in pedido.copies
+    ] + [
+        _submeter("entregavel", p.model_dump(exclude={"credenciais", "hedge"}), _contexto(p.credenciais, p.provider, p.hedge))
+        for p in pedido.entregaveis
+    ]
+    return await asyncio.gather(*tarefas)
+
+
+@app.get("/jobs", response_model=List[StatusJob], dependencies=[Depends(verificar_token)])
+async def listar_jobs(tipo: Optional[str] = None, limite: int = Query(20, ge=1, le=200)):
+    """Lista os jobs mais recentes."""
+    jobs = await asyncio.to_thread(gerenciador().listar, None, tipo, limite)
+    return [StatusJob(job_id=job["id"], **job) for job in jobs]
+
+
+@app.get("/jobs/{job_id}", response_model=StatusJob, dependencies=[Depends(verificar_token)])
+async def status_job(job_id: str):
+    """Status, progresso e resultado parcial de um job."""
+    job = await _buscar_job(job_id)
+    return StatusJob(job_id=job["id"], **job)
+
+
+@app.get("/jobs/{job_id}/resultado", response_model=ResultadoJob, dependencies=[Depends(verificar_token)])
+async def resultado_job(job_id: str, estruturado: bool = False):
+    """
+    Resultado final de um job concluído (409 enquanto ele não terminar).
+
+    Com estruturado=true, o resultado de um job de copy vem separado nas
+    seções hooks, corpo, cta e analise (em jobs de variações, cada variação
+    ganha o campo "secoes").
+    """
+    job = await _buscar_job(job_id)
+    if job["status"] != "concluido":
+        raise HTTPException(status_code=409, detail=f"Job ainda não concluído (status: {job['status']})")
+    resultado = job["resultado"]
+    if estruturado and job["tipo"] == "copy":
+        from modules.copy_module import CopyEstruturada
+        if isinstance(resultado, dict) and "variacoes" in resultado:
+            resultado = {**resultado, "variacoes": [
+                {**variacao, "secoes": CopyEstruturada.de_markdown(variacao.get("texto") or "").para_dict()}
+                for variacao in resultado["variacoes"]
+            ]}
+        elif isinstance(resultado, str) or resultado is None:
+            resultado = CopyEstruturada.de_markdown(resultado or "").para_dict()
+    return ResultadoJob(job_id=job["id"], status=job["status"], resultado=resultado)
+
+
+@app.delete("/jobs/{job_id}", response_model=StatusJob, dependencies=[Depends(verificar_token)])
+async def cancelar_job(job_id: str):
+    """Solicita o cancelamento de um job."""
+    await _buscar_job(job_id)
+    await asyncio.to_thread(gerenciador().cancelar, job_id)
+    job = await _buscar_job(job_id)
+    return StatusJob(job_id=job["id"], **job)
+
+
+@app.get("/cache/metricas", dependencies=[Depends(verificar_token)])
+async def metricas_cache():
+    """Acertos, falhas e tamanho do cache de respostas da IA."""
+    from modules.cache_respostas_module import obter_cache_respostas
+    return await asyncio.to_thread(lambda: obter_cache_respostas().metricas())
+
+
+@app.get("/ofertas", dependencies=[Depends(verificar_token)])
+async def listar_ofertas(
+    plataforma: Optional[List[str]] = Query(None),
+    categoria: Optional[List[str]] = Query(None),
+    busca: Optional[str] = None,
+    ordenar_por: str = "id",
+    descendente: bool = True,
+    limite: int = Query(50, ge=1, le=500),
+    apos_valor: Optional[str] = None,
+    apos_id: Optional[int] = None,
+):
+    """Página do histórico de ofertas (paginação por cursor: apos_valor + apos_id)."""
+    from modules.armazem_module import ArmazemOfertas, COLUNAS_NUMERICAS
+
+    filtros = {"plataforma": plataforma, "categoria": categoria, "busca": busca}
+    apos = None
+    if apos_id is not None:
+        valor = apos_valor
+        if ordenar_por in COLUNAS_NUMERICAS and valor is not None:
+            valor = float(valor)
+        apos = (valor if ordenar_por != "id" else apos_id, apos_id)
+
+    try:
+        return await asyncio.to_thread(
+            ArmazemOfertas().consultar_ofertas, filtros, ordenar_por, descendente, limite, 0, None, apos
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
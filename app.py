@@ -7,8 +7,10 @@ Esta aplicação Streamlit integra todos os módulos do ecossistema:
 - Criação de Entregáveis
 """
 
+import time
+_inicio_script = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
 import os
 import sys
 from datetime import datetime
@@ -16,14 +18,27 @@ from datetime import datetime
 # Adicionar o diretório modules ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'modules'))
 
-# Importar módulos
-try:
-    from modules.garimpo_module_v2 import iniciar_garimpo
-    from modules.copy_module import gerar_copy_modelada
-    from modules.entregaveis_module import gerar_entregavel
-except ImportError as e:
-    st.error(f"Erro ao importar módulos: {e}")
-    st.stop()
+# Registro de módulos: cada página importa seu backend só quando é aberta
+from modules.carregador_module import registro_modulos
+from modules.contexto_module import ContextoSessao
+
+
+def carregar_backend(nome, *atributos):
+    """Importa o backend de uma página sob demanda (interrompe a página se falhar)."""
+    try:
+        return registro_modulos.obter(nome, *atributos)
+    except ImportError as e:
+        st.error(f"Erro ao importar módulos: {e}")
+        st.stop()
+
+BANDEIRAS_IDIOMAS = {
+    "pt": "🇧🇷 Português",
+    "en": "🇺🇸 Inglês",
+    "es": "🇪🇸 Espanhol",
+    "it": "🇮🇹 Italiano",
+    "de": "🇩🇪 Alemão",
+    "fr": "🇫🇷 Francês"
+}
 
 # Configuração da página
 st.set_page_config(
@@ -33,6 +48,267 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- CACHE DE DADOS E RECURSOS ---
+# O Streamlit reexecuta este script a cada interação; os dados do garimpo ficam
+# em cache por versão (ID do snapshot mais recente) e são invalidados ao fim
+# de cada garimpo.
+
+@st.cache_resource
+def obter_armazem():
+    """Instância única do armazém de ofertas por processo."""
+    ArmazemOfertas = carregar_backend("armazem", "ArmazemOfertas")
+    return ArmazemOfertas()
+
+
+@st.cache_data(show_spinner=False, max_entries=200)
+def consultar_pagina_ofertas(snapshot_id, filtros, ordenar_por, descendente, limite, colunas, apos):
+    """Uma página do explorador de ofertas (o snapshot_id versiona o cache)."""
+    return obter_armazem().consultar_ofertas(
+        filtros, ordenar_por=ordenar_por, descendente=descendente,
+        limite=limite, colunas=list(colunas), apos=apos
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=200)
+def contar_ofertas_filtradas(snapshot_id, filtros):
+    """Total de ofertas que atendem aos filtros do explorador."""
+    return obter_armazem().contar_ofertas(filtros)
+
+
+@st.cache_data(show_spinner=False)
+def carregar_valores_distintos(snapshot_id):
+    """Opções dos filtros de plataforma e categoria."""
+    return obter_armazem().valores_distintos()
+
+
+@st.cache_data(show_spinner=False)
+def carregar_agregados(snapshot_id):
+    """Agregados materializados na versão do snapshot informado."""
+    return obter_armazem().agregados()
+
+
+def invalidar_cache_dados():
+    """Descarta os dados em cache (chamado quando um garimpo termina)."""
+    consultar_pagina_ofertas.clear()
+    contar_ofertas_filtradas.clear()
+    carregar_valores_distintos.clear()
+    carregar_agregados.clear()
+
+
+def importar_csv_legado(armazem):
+    """Importa o CSV de garimpo mais recente para um armazém ainda vazio."""
+    data_dir = "data"
+    if not os.path.exists(data_dir):
+        return None
+    csv_files = [f for f in os.listdir(data_dir) if f.startswith("ofertas_garimpadas") and f.endswith(".csv")]
+    if not csv_files:
+        return None
+    latest_file = max(csv_files, key=lambda x: os.path.getctime(os.path.join(data_dir, x)))
+    armazem.importar_csv(os.path.join(data_dir, latest_file))
+    return armazem.ultimo_snapshot()
+
+# --- JOBS EM SEGUNDO PLANO ---
+# Garimpos e gerações rodam no pool de workers; a página só submete o job e
+# acompanha o progresso, então o usuário pode navegar enquanto ele roda.
+
+@st.cache_resource
+def obter_jobs():
+    """Gerenciador de jobs único por processo."""
+    return carregar_backend("jobs", "obter_gerenciador")()
+
+
+def submeter_job(tipo, parametros, segredos=None):
+    """Submete um job com o contexto da sessão e o associa à sessão atual."""
+    segredos = {**(segredos or {}), "contexto": contexto_sessao}
+    job_id = obter_jobs().submeter(tipo, parametros, segredos)
+    st.session_state.setdefault("jobs_sessao", []).append(job_id)
+    return job_id
+
+
+@st.fragment(run_every="1s")
+def painel_jobs(tipo, exibir_resultado, retomavel=False):
+    """
+    Lista os jobs da sessão deste tipo, atualizando o progresso (e o texto já gerado) a cada 1s.
+    
+    Com retomavel=True, jobs cancelados ou com erro ganham um botão que os
+    submete de novo com os mesmos parâmetros e o rascunho do job original
+    (retomando de onde parou) e outro que recomeça do zero.
+    """
+    jobs = obter_jobs().listar(ids=st.session_state.get("jobs_sessao", []), tipo=tipo, limite=5)
+    if not jobs:
+        return
+    
+    st.markdown("---")
+    st.subheader("🗂️ Seus Processamentos")
+    
+    for job in jobs:
+        criado = datetime.fromisoformat(job["criado_em"]).strftime("%H:%M:%S")
+        with st.container(border=True):
+            if job["status"] in ("pendente", "executando"):
+                col1, col2 = st.columns([4, 1])
+                with col1:
+                    st.progress(job["progresso"] / 100, text=f"⏳ {criado} · {job.get('mensagem') or 'Na fila...'}")
+                with col2:
+                    if st.button("🛑 Cancelar", key=f"cancelar_{job['id']}", use_container_width=True):
+                        obter_jobs().cancelar(job["id"])
+                
+                # Gerações em streaming publicam o texto parcial enquanto rodam
+                parcial = job.get("resultado_parcial")
+                if isinstance(parcial, dict) and parcial.get("texto"):
+                    if parcial.get("ttft_s") is not None:
+                        st.caption(f"⚡ Primeiro trecho em {parcial['ttft_s']:.1f}s")
+                    st.markdown(parcial["texto"] + " ▌")
+            elif job["status"] == "concluido":
+                st.markdown(f"✅ **Concluído** · iniciado às {criado}")
+                exibir_resultado(job)
+            else:
+                if job["status"] == "cancelado":
+                    st.warning(f"🛑 Cancelado · iniciado às {criado}")
+                else:
+                    st.error(f"❌ Erro: {job.get('erro') or 'Erro desconhecido'}")
+                if retomavel:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button("🔁 Retomar", key=f"retomar_{job['id']}", use_container_width=True):
+                            rascunho = job["parametros"].get("rascunho") or job["id"]
+                            submeter_job(tipo, {**job["parametros"], "rascunho": rascunho})
+                    with col2:
+                        if st.button("🆕 Recomeçar do zero", key=f"recomecar_{job['id']}", use_container_width=True):
+                            submeter_job(tipo, {c: v for c, v in job["parametros"].items() if c != "rascunho"})
+
+
+def exibir_resultado_garimpo(job):
+    """Resultado de um job de garimpo (invalida o cache de dados na primeira exibição)."""
+    import pandas as pd
+    resultado = job["resultado"] or {}
+    
+    vistos = st.session_state.setdefault("jobs_vistos", set())
+    if job["id"] not in vistos:
+        vistos.add(job["id"])
+        invalidar_cache_dados()
+        st.rerun()
+    
+    st.success(f"✅ Garimpo concluído! {resultado.get('total_ofertas', 0)} ofertas encontradas.")
+    
+    # Mostrar plataformas processadas
+    if job["parametros"].get("plataformas"):
+        st.info(f"📊 Plataformas processadas: {', '.join(job['parametros']['plataformas'])}")
+    
+    with st.expander("📊 Análise"):
+        if resultado.get("analise"):
+            st.json(resultado["analise"])
+    
+    # Mapa de nichos
+    if resultado.get("nichos"):
+        st.markdown("#### 🧭 Mapa de Nichos")
+        st.dataframe(
+            pd.DataFrame(resultado["nichos"]),
+            use_container_width=True,
+            hide_index=True
+        )
+
+
+def exibir_metricas_stream(job):
+    """Tempo até o primeiro trecho e tempo total de uma geração em streaming."""
+    metricas = job.get("resultado_parcial")
+    if isinstance(metricas, dict) and metricas.get("ttft_s") is not None:
+        st.caption(f"⚡ Primeiro trecho em {metricas['ttft_s']:.1f}s · geração completa em {metricas.get('duracao_s', 0):.1f}s")
+
+
+def exibir_variacoes_copy(job):
+    """Variações de um job N-best, da melhor para a pior pontuação do ranqueador local."""
+    variacoes = job["resultado"]["variacoes"]
+    st.subheader(f"🧪 {len(variacoes)} Variações para Teste A/B")
+    exibir_metricas_stream(job)
+    
+    medalhas = ["🥇", "🥈", "🥉"]
+    abas = st.tabs([
+        f"{medalhas[i] if i < len(medalhas) else f'#{i + 1}'} {variacao['pontuacao']:.0f} pts"
+        for i, variacao in enumerate(variacoes)
+    ])
+    for i, (aba, variacao) in enumerate(zip(abas, variacoes)):
+        with aba:
+            criterios = variacao["criterios"]
+            st.caption(" · ".join(f"{nome}: {valor:.0%}" for nome, valor in criterios.items()))
+            if variacao["placeholders"]:
+                st.warning(f"⚠️ Marcações a preencher: {', '.join(dict.fromkeys(variacao['placeholders']))}")
+            st.markdown(variacao["texto"])
+            st.download_button(
+                label="📥 Baixar Variação",
+                data=variacao["texto"],
+                file_name=f"copy_variacao_{i + 1}_{datetime.fromisoformat(job['criado_em']).strftime('%Y%m%d_%H%M%S')}.txt",
+                mime="text/plain",
+                key=f"download_{job['id']}_{i}"
+            )
+
+
+def exibir_resultado_copy(job, regeneravel=True):
+    """
+    Resultado de um job de modelagem de copy.
+    
+    Com regeneravel=False (histórico), os botões de refazer hooks/CTA não
+    aparecem: o job novo só é exibido no painel da página de copy.
+    """
+    if isinstance(job["resultado"], dict) and "variacoes" in job["resultado"]:
+        exibir_variacoes_copy(job)
+        return
+    resultado_copy = job["resultado"] or ""
+    
+    st.subheader("✨ Copy Otimizada")
+    exibir_metricas_stream(job)
+    st.markdown(resultado_copy)
+    
+    # Refazer uma seção reaproveita o resto da copy (cache por seção) com um prompt bem menor
+    parametros = job["parametros"]
+    if regeneravel and parametros.get("provider") != "manus":
+        col1, col2, _ = st.columns([1, 1, 2])
+        with col1:
+            if st.button("🔄 Novos hooks", key=f"hooks_{job['id']}", use_container_width=True):
+                submeter_job("copy", {**parametros, "secao": "hooks"})
+        with col2:
+            if st.button("🔄 Nova CTA", key=f"cta_{job['id']}", use_container_width=True):
+                submeter_job("copy", {**parametros, "secao": "cta"})
+    
+    # Opção de download
+    st.download_button(
+        label="📥 Baixar Copy Otimizada",
+        data=resultado_copy,
+        file_name=f"copy_otimizada_{datetime.fromisoformat(job['criado_em']).strftime('%Y%m%d_%H%M%S')}.txt",
+        mime="text/plain",
+        key=f"download_{job['id']}"
+    )
+
+
+def exibir_resultado_entregavel(job):
+    """Resultado de um job de criação de entregável (com uma aba por idioma, se houve tradução)."""
+    resultado = job["resultado"] or ""
+    parametros = job["parametros"]
+    versoes = resultado["versoes"] if isinstance(resultado, dict) else {parametros.get("idioma", "pt"): resultado}
+    
+    st.subheader("📚 Entregável Criado")
+    exibir_metricas_stream(job)
+    parcial = job.get("resultado_parcial")
+    traducao = parcial.get("traducao") if isinstance(parcial, dict) else None
+    if traducao:
+        st.caption(
+            f"🌐 {traducao['secoes_traduzidas']} seção(ões) traduzidas · "
+            f"{traducao['secoes_reaproveitadas']} reaproveitadas da memória de tradução"
+        )
+    
+    abas = st.tabs([BANDEIRAS_IDIOMAS.get(idioma, idioma) for idioma in versoes]) if len(versoes) > 1 else [st.container()]
+    for aba, (idioma, texto) in zip(abas, versoes.items()):
+        with aba:
+            st.markdown(texto)
+            
+            # Opção de download
+            st.download_button(
+                label="📥 Baixar Estrutura",
+                data=texto,
+                file_name=f"{parametros['tipo'].lower()}_{parametros['topico'][:30].replace(' ', '_')}_{idioma}_{datetime.fromisoformat(job['criado_em']).strftime('%Y%m%d_%H%M%S')}.md",
+                mime="text/markdown",
+                key=f"download_{job['id']}_{idioma}"
+            )
+
 # CSS customizado para melhorar a aparência
 st.markdown("""
 <style>
@@ -71,25 +347,19 @@ st.sidebar.markdown("---")
 # Configuração de API Keys
 st.sidebar.markdown("### 🤖 Configuração de IA")
 
-# Verificação de API Keys
-manus_status = "✅ Sempre Disponível"
-openai_key_status = "✅ Configurada" if os.getenv("OPENAI_API_KEY") else "❌ Não configurada"
-gemini_key_status = "✅ Configurada" if os.getenv("GOOGLE_API_KEY") else "❌ Não configurada"
-
 with st.sidebar.expander("🔑 Configurar API Keys"):
     st.markdown("**Manus AI (Nativo):**")
     st.success("✅ Sempre disponível - Sem configuração necessária")
     
+    # As chaves ficam só no contexto desta sessão (nunca em os.environ)
     st.markdown("**OpenAI:**")
     openai_key = st.text_input("API Key OpenAI:", type="password", placeholder="sk-...")
     if openai_key:
-        os.environ["OPENAI_API_KEY"] = openai_key
         st.success("✅ OpenAI configurada!")
     
     st.markdown("**Google Gemini:**")
     gemini_key = st.text_input("API Key Gemini:", type="password", placeholder="AIza...")
     if gemini_key:
-        os.environ["GOOGLE_API_KEY"] = gemini_key
         st.success("✅ Gemini configurada!")
     
     st.markdown("---")
@@ -97,6 +367,14 @@ with st.sidebar.expander("🔑 Configurar API Keys"):
     st.markdown("• [OpenAI API](https://platform.openai.com/api-keys)")
     st.markdown("• [Google AI Studio](https://makersuite.google.com/app/apikey)")
 
+# Contexto da sessão: chaves digitadas têm prioridade sobre as do .env
+contexto_sessao = ContextoSessao.do_ambiente(openai_api_key=openai_key, google_api_key=gemini_key)
+
+# Verificação de API Keys
+manus_status = "✅ Sempre Disponível"
+openai_key_status = "✅ Configurada" if contexto_sessao.openai_api_key else "❌ Não configurada"
+gemini_key_status = "✅ Configurada" if contexto_sessao.google_api_key else "❌ Não configurada"
+
 # Status das APIs
 st.sidebar.markdown(f"**Manus AI:** {manus_status}")
 st.sidebar.markdown(f"**OpenAI:** {openai_key_status}")
@@ -111,7 +389,7 @@ st.sidebar.info(f"🕒 {datetime.now().strftime('%d/%m/%Y %H:%M')}")
 # Seleção de módulo
 modulo_selecionado = st.sidebar.selectbox(
     "Selecione um Módulo:",
-    ("🏠 Início", "⛏️ Garimpo de Ofertas", "✍️ Modelagem de Copy", "📦 Criação de Entregáveis")
+    ("🏠 Início", "⛏️ Garimpo de Ofertas", "✍️ Modelagem de Copy", "📦 Criação de Entregáveis", "📜 Histórico")
 )
 
 st.sidebar.markdown("---")
@@ -120,8 +398,24 @@ st.sidebar.markdown("### 🔧 Configurações")
 # Seleção do provedor de IA
 provider_ia = st.sidebar.selectbox(
     "Provedor de IA:",
-    ("manus", "gemini", "openai"),  # Manus AI como padrão
-    help="Escolha o provedor de IA para os módulos de copy e entregáveis"
+    ("manus", "gemini", "openai", "auto"),  # Manus AI como padrão
+    help="Escolha o provedor de IA para os módulos de copy e entregáveis. "
+         "\"auto\" envia cada pedido ao provedor configurado com menor latência no momento."
+)
+hedge_ia = False
+if provider_ia == "auto":
+    hedge_ia = st.sidebar.checkbox(
+        "🏎️ Hedging (pedido de reserva)",
+        value=False,
+        help="Se o provedor escolhido demorar mais que o normal, dispara o mesmo pedido no outro "
+             "e usa a resposta que chegar primeiro (pode dobrar o custo desses pedidos)"
+    )
+contexto_sessao = contexto_sessao.com(provider=provider_ia, hedge=hedge_ia)
+
+usar_cache_respostas = st.sidebar.checkbox(
+    "♻️ Reaproveitar respostas em cache",
+    value=True,
+    help="Pedidos idênticos (mesmo texto, provedor e modelo) voltam na hora, sem nova chamada à IA"
 )
 
 # --- PÁGINA INICIAL ---
@@ -199,6 +493,9 @@ if modulo_selecionado == "🏠 Início":
 
 # --- PÁGINA DE GARIMPO DE OFERTAS ---
 elif modulo_selecionado == "⛏️ Garimpo de Ofertas":
+    import pandas as pd
+    COLUNAS_EXPLORADOR = carregar_backend("armazem", "COLUNAS_EXPLORADOR")
+    
     st.title("⛏️ Garimpo de Ofertas em Alta")
     st.markdown("Identifique automaticamente as ofertas e produtos que estão performando melhor no mercado.")
     
@@ -231,37 +528,27 @@ elif modulo_selecionado == "⛏️ Garimpo de Ofertas":
             if not (tem_clickbank or tem_hotmart):
                 st.error("❌ Por favor, forneça credenciais para pelo menos uma plataforma (ClickBank ou Hotmart).")
             else:
-                with st.spinner('🔍 Garimpando ofertas... Este processo pode levar alguns minutos.'):
-                    try:
-                        # Mostrar quais plataformas serão processadas
-                        plataformas = []
-                        if tem_clickbank:
-                            plataformas.append("ClickBank")
-                        if tem_hotmart:
-                            plataformas.append("Hotmart")
-                        
-                        st.info(f"🎯 Processando: {', '.join(plataformas)}")
-                        
-                        resultado = iniciar_garimpo(
-                            clickbank_user=cb_user if tem_clickbank else None,
-                            clickbank_pass=cb_pass if tem_clickbank else None,
-                            hotmart_email=hm_email if tem_hotmart else None,
-                            hotmart_pass=hm_pass if tem_hotmart else None
-                        )
-                        
-                        if resultado.get("sucesso"):
-                            st.success(f"✅ Garimpo concluído! {resultado.get('total_ofertas', 0)} ofertas encontradas.")
-                            
-                            # Mostrar plataformas processadas
-                            if resultado.get("plataformas_processadas"):
-                                st.info(f"📊 Plataformas processadas: {', '.join(resultado['plataformas_processadas'])}")
-                            
-                            if resultado.get("analise"):
-                                st.json(resultado["analise"])
-                        else:
-                            st.error(f"❌ Erro no garimpo: {resultado.get('erro', 'Erro desconhecido')}")
-                    except Exception as e:
-                        st.error(f"❌ Erro durante o garimpo: {str(e)}")
+                # Mostrar quais plataformas serão processadas
+                plataformas = []
+                if tem_clickbank:
+                    plataformas.append("ClickBank")
+                if tem_hotmart:
+                    plataformas.append("Hotmart")
+                
+                # Credenciais vão como segredos: usadas pelo job, nunca gravadas na tabela
+                submeter_job(
+                    "garimpo",
+                    {"plataformas": plataformas},
+                    segredos={
+                        "clickbank_user": cb_user if tem_clickbank else None,
+                        "clickbank_pass": cb_pass if tem_clickbank else None,
+                        "hotmart_email": hm_email if tem_hotmart else None,
+                        "hotmart_pass": hm_pass if tem_hotmart else None
+                    }
+                )
+                st.info(f"🎯 Garimpo enviado para processamento: {', '.join(plataformas)}. Você pode navegar entre as páginas enquanto ele roda.")
+    
+    painel_jobs("garimpo", exibir_resultado_garimpo)
     
     st.markdown("---")
     
@@ -269,36 +556,113 @@ elif modulo_selecionado == "⛏️ Garimpo de Ofertas":
     st.subheader("📊 Ofertas Garimpadas")
     
     try:
-        # Procurar pelo arquivo mais recente
-        data_dir = "data"
-        if os.path.exists(data_dir):
-            csv_files = [f for f in os.listdir(data_dir) if f.startswith("ofertas_garimpadas") and f.endswith(".csv")]
-            if csv_files:
-                # Pegar o arquivo mais recente
-                latest_file = max(csv_files, key=lambda x: os.path.getctime(os.path.join(data_dir, x)))
-                df_ofertas = pd.read_csv(os.path.join(data_dir, latest_file))
-                
-                # Exibir tabela
-                st.dataframe(
-                    df_ofertas.head(20),
-                    use_container_width=True,
-                    hide_index=True
+        armazem = obter_armazem()
+        snapshot = armazem.ultimo_snapshot()
+        
+        # Migração única: importar o CSV mais recente se o armazém estiver vazio
+        if snapshot is None:
+            snapshot = importar_csv_legado(armazem)
+        
+        if snapshot:
+            # Explorador paginado: filtros, ordenação e página resolvidos no banco
+            opcoes = carregar_valores_distintos(snapshot["id"])
+            
+            col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+            with col1:
+                filtro_plataformas = st.multiselect("Plataformas:", opcoes["plataforma"])
+            with col2:
+                filtro_categorias = st.multiselect("Categorias:", opcoes["categoria"])
+            with col3:
+                filtro_busca = st.text_input("Buscar no título:", placeholder="Ex: keto")
+            with col4:
+                apenas_ultimo = st.checkbox("Só último garimpo", value=True)
+            
+            col1, col2, col3, col4 = st.columns([2, 1, 1, 3])
+            with col1:
+                ordenar_por = st.selectbox(
+                    "Ordenar por:",
+                    ["id", "gravidade_num", "comissao_num", "titulo", "plataforma", "categoria", "data_garimpo"],
+                    format_func=lambda x: {"id": "Mais recentes", "gravidade_num": "Gravidade",
+                                           "comissao_num": "Comissão", "titulo": "Título",
+                                           "plataforma": "Plataforma", "categoria": "Categoria",
+                                           "data_garimpo": "Data do garimpo"}[x]
                 )
-                
-                # Estatísticas
-                col1, col2, col3 = st.columns(3)
+            with col2:
+                descendente = st.selectbox("Ordem:", ["Decrescente", "Crescente"]) == "Decrescente"
+            with col3:
+                tamanho_pagina = st.selectbox("Por página:", [20, 50, 100], index=0)
+            with col4:
+                colunas_exibidas = st.multiselect(
+                    "Colunas:",
+                    COLUNAS_EXPLORADOR,
+                    default=["plataforma", "titulo", "categoria", "gravidade", "comissao", "preco"]
+                )
+            
+            filtros = {
+                "plataforma": filtro_plataformas,
+                "categoria": filtro_categorias,
+                "busca": filtro_busca.strip() or None,
+                "snapshot_id": snapshot["id"] if apenas_ultimo else None,
+            }
+            
+            # Cursores de paginação por chave (keyset); reiniciam quando a consulta muda
+            assinatura_consulta = (snapshot["id"], str(filtros), ordenar_por, descendente, tamanho_pagina)
+            if st.session_state.get("explorador_consulta") != assinatura_consulta:
+                st.session_state["explorador_consulta"] = assinatura_consulta
+                st.session_state["explorador_cursores"] = [None]
+            cursores = st.session_state["explorador_cursores"]
+            
+            pagina = consultar_pagina_ofertas(
+                snapshot["id"], filtros, ordenar_por, descendente, tamanho_pagina,
+                tuple(colunas_exibidas), cursores[-1]
+            )
+            total_filtrado = contar_ofertas_filtradas(snapshot["id"], filtros)
+            
+            st.dataframe(
+                pd.DataFrame(pagina["linhas"], columns=colunas_exibidas),
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            total_paginas = max(1, -(-total_filtrado // tamanho_pagina))
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                if st.button("⬅️ Anterior", disabled=len(cursores) == 1, use_container_width=True):
+                    cursores.pop()
+                    st.rerun()
+            with col2:
+                st.caption(f"Página {len(cursores)} de {total_paginas} · {total_filtrado} ofertas")
+            with col3:
+                if st.button("Próxima ➡️", disabled=pagina["proximo_cursor"] is None, use_container_width=True):
+                    cursores.append(pagina["proximo_cursor"])
+                    st.rerun()
+            
+            # Estatísticas (agregados materializados do armazém)
+            agregados = carregar_agregados(snapshot["id"])
+            gravidade = agregados["gravidade"]
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Total de Ofertas", agregados["total_ofertas"])
+            with col2:
+                st.metric("Plataformas", len(agregados["plataformas"]))
+            with col3:
+                st.metric("Gravidade Média", gravidade.get("media", "N/A"))
+            with col4:
+                st.metric("Gravidade P90", gravidade.get("p90", "N/A"))
+            
+            with st.expander("📈 Distribuições"):
+                col1, col2 = st.columns(2)
                 with col1:
-                    st.metric("Total de Ofertas", len(df_ofertas))
+                    st.markdown("**Categorias mais populares**")
+                    st.bar_chart(pd.Series(agregados["categorias_populares"], name="ofertas"))
                 with col2:
-                    st.metric("Plataformas", df_ofertas['plataforma'].nunique())
-                with col3:
-                    if 'categoria' in df_ofertas.columns:
-                        st.metric("Categorias", df_ofertas['categoria'].nunique())
+                    st.markdown("**Comissões por faixa**")
+                    if agregados["comissoes"]:
+                        st.dataframe(pd.DataFrame(agregados["comissoes"]), use_container_width=True, hide_index=True)
                 
-            else:
-                st.info("📝 Nenhum dado de garimpo encontrado. Execute o garimpo para ver os resultados.")
         else:
-            st.info("📁 Diretório de dados não encontrado. Execute o garimpo primeiro.")
+            st.info("📝 Nenhum dado de garimpo encontrado. Execute o garimpo para ver os resultados.")
             
     except Exception as e:
         st.error(f"❌ Erro ao carregar dados: {str(e)}")
@@ -315,6 +679,11 @@ elif modulo_selecionado == "✍️ Modelagem de Copy":
             nicho_copy = st.text_input("Nicho/Mercado:", placeholder="Ex: emagrecimento, marketing digital, investimentos")
         with col2:
             publico_copy = st.text_input("Público-alvo:", placeholder="Ex: mulheres 25-45 anos, empreendedores iniciantes")
+        variacoes_copy = st.slider(
+            "🧪 Variações (teste A/B):", 1, 5, 1,
+            help="Acima de 1, gera várias versões em paralelo (uma só chamada na OpenAI) e as ordena por legibilidade, força dos hooks, tamanho e marcações não preenchidas.",
+            disabled=provider_ia == "manus"
+        )
     
     # Área de input da copy
     st.subheader("📝 Sua Copy Original")
@@ -329,31 +698,18 @@ elif modulo_selecionado == "✍️ Modelagem de Copy":
     with col2:
         if st.button("🧠 Modelar Copy", type="primary", use_container_width=True):
             if user_copy.strip():
-                with st.spinner('🤖 A IA está analisando e otimizando sua copy...'):
-                    try:
-                        resultado_copy = gerar_copy_modelada(
-                            user_copy, 
-                            nicho_copy, 
-                            publico_copy, 
-                            provider_ia
-                        )
-                        
-                        st.markdown("---")
-                        st.subheader("✨ Copy Otimizada")
-                        st.markdown(resultado_copy)
-                        
-                        # Opção de download
-                        st.download_button(
-                            label="📥 Baixar Copy Otimizada",
-                            data=resultado_copy,
-                            file_name=f"copy_otimizada_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                            mime="text/plain"
-                        )
-                        
-                    except Exception as e:
-                        st.error(f"❌ Erro ao processar copy: {str(e)}")
+                submeter_job("copy", {
+                    "copy_original": user_copy,
+                    "nicho": nicho_copy,
+                    "publico_alvo": publico_copy,
+                    "provider": provider_ia,
+                    "usar_cache": usar_cache_respostas,
+                    "variacoes": variacoes_copy if provider_ia != "manus" else 1
+                })
             else:
                 st.warning("⚠️ Por favor, insira uma copy para ser modelada.")
+    
+    painel_jobs("copy", exibir_resultado_copy)
 
 # --- PÁGINA DE CRIAÇÃO DE ENTREGÁVEIS ---
 elif modulo_selecionado == "📦 Criação de Entregáveis":
@@ -382,15 +738,15 @@ elif modulo_selecionado == "📦 Criação de Entregáveis":
         
         idioma_entregavel = st.selectbox(
             "🌍 Idioma:",
-            ["pt", "en", "es", "it", "de", "fr"],
-            format_func=lambda x: {
-                "pt": "🇧🇷 Português",
-                "en": "🇺🇸 Inglês", 
-                "es": "🇪🇸 Espanhol",
-                "it": "🇮🇹 Italiano",
-                "de": "🇩🇪 Alemão",
-                "fr": "🇫🇷 Francês"
-            }[x]
+            list(BANDEIRAS_IDIOMAS),
+            format_func=BANDEIRAS_IDIOMAS.get
+        )
+        
+        # A versão no idioma principal é gerada uma vez; as demais são traduzidas dela
+        traducoes_entregavel = st.multiselect(
+            "🌐 Traduzir também para:",
+            [idioma for idioma in BANDEIRAS_IDIOMAS if idioma != idioma_entregavel],
+            format_func=BANDEIRAS_IDIOMAS.get
         )
     
     # Botão de geração
@@ -398,32 +754,144 @@ elif modulo_selecionado == "📦 Criação de Entregáveis":
     with col2:
         if st.button("🚀 Gerar Entregável", type="primary", use_container_width=True):
             if topico_entregavel.strip():
-                with st.spinner('📝 Criando estrutura do entregável...'):
-                    try:
-                        resultado_entregavel = gerar_entregavel(
-                            topico_entregavel,
-                            tipo_entregavel,
-                            idioma_entregavel,
-                            publico_entregavel,
-                            provider_ia
-                        )
-                        
-                        st.markdown("---")
-                        st.subheader("📚 Entregável Criado")
-                        st.markdown(resultado_entregavel)
-                        
-                        # Opção de download
-                        st.download_button(
-                            label="📥 Baixar Estrutura",
-                            data=resultado_entregavel,
-                            file_name=f"{tipo_entregavel.lower()}_{topico_entregavel[:30].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
-                            mime="text/markdown"
-                        )
-                        
-                    except Exception as e:
-                        st.error(f"❌ Erro ao gerar entregável: {str(e)}")
+                submeter_job("entregavel", {
+                    "topico": topico_entregavel,
+                    "tipo": tipo_entregavel,
+                    "idioma": idioma_entregavel,
+                    "traducoes": traducoes_entregavel,
+                    "publico_alvo": publico_entregavel,
+                    "provider": provider_ia,
+                    "usar_cache": usar_cache_respostas
+                })
             else:
                 st.warning("⚠️ Por favor, insira o tópico para gerar o entregável.")
+    
+    if tipo_entregavel in ("E-book", "Workbook", "Guia Prático"):
+        st.caption("📖 Este tipo é escrito capítulo a capítulo, em paralelo. Se a geração for cancelada ou falhar, use 🔁 Retomar para continuar de onde parou ou 🆕 Recomeçar do zero para gerar um novo.")
+    
+    painel_jobs("entregavel", exibir_resultado_entregavel, retomavel=True)
+
+# --- PÁGINA DE HISTÓRICO ---
+elif modulo_selecionado == "📜 Histórico":
+    st.title("📜 Histórico de Gerações")
+    st.markdown("Reabra copies e entregáveis já gerados sem chamar a IA de novo.")
+    
+    historico = carregar_backend("historico", "obter_historico")()
+    valores_historico = historico.valores_distintos()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        categoria_historico = st.selectbox(
+            "Categoria:", ["", "copy", "entregavel"],
+            format_func=lambda c: {"": "Todas", "copy": "✍️ Copy", "entregavel": "📦 Entregável"}[c]
+        )
+    with col2:
+        tipo_historico = st.selectbox("Tipo:", [""] + valores_historico["tipo"], format_func=lambda t: t or "Todos")
+    with col3:
+        nicho_historico = st.selectbox("Nicho/Tópico:", [""] + valores_historico["nicho"], format_func=lambda n: n or "Todos")
+    with col4:
+        periodo_historico = st.date_input("Período:", value=())
+    
+    desde_historico = ate_historico = None
+    if len(periodo_historico) == 2:
+        desde_historico, ate_historico = (data.isoformat() for data in periodo_historico)
+    
+    geracoes = historico.buscar(
+        categoria=categoria_historico or None, tipo=tipo_historico or None, nicho=nicho_historico or None,
+        desde=desde_historico, ate=ate_historico, limite=100
+    )
+    
+    metricas_historico = historico.metricas()
+    if metricas_historico["geracoes"]:
+        st.caption(
+            f"🗄️ {metricas_historico['geracoes']} gerações · {metricas_historico['conteudos']} conteúdos únicos · "
+            f"{metricas_historico['bytes_originais'] / 1024:.0f} KB comprimidos em "
+            f"{metricas_historico['bytes_comprimidos'] / 1024:.0f} KB"
+        )
+    
+    if not geracoes:
+        st.info("📭 Nenhuma geração encontrada. As copies e entregáveis concluídos aparecem aqui.")
+    else:
+        geracao_id = st.selectbox(
+            "Geração:",
+            [geracao["id"] for geracao in geracoes],
+            format_func={
+                geracao["id"]: f"{datetime.fromisoformat(geracao['criado_em']).strftime('%d/%m/%Y %H:%M')} · "
+                               f"{geracao['tipo']} · {geracao['titulo'][:60]}"
+                for geracao in geracoes
+            }.get
+        )
+        geracao = historico.obter(geracao_id)
+        latencia = f" · {geracao['latencia_s']:.1f}s de job" if geracao["latencia_s"] is not None else ""
+        st.caption(
+            f"🤖 {geracao['provider']} ({geracao['modelo']}){latencia} · "
+            f"~{geracao['tokens_entrada']} tokens de entrada · ~{geracao['tokens_saida']} de saída"
+        )
+        st.caption("ℹ️ Tokens estimados pelo tamanho do texto (não são a contagem do provedor); o tempo é a duração "
+                   "da geração no job, incluindo acertos de cache e traduções.")
+        
+        # Reaproveita a exibição dos jobs, com o registro no formato de um job concluído
+        resultado = geracao["resultado"]
+        job_historico = {
+            "id": f"historico_{geracao['id']}",
+            "criado_em": geracao["criado_em"],
+            "parametros": {**geracao["entradas"], "provider": geracao["provider"]},
+            "resultado": {"variacoes": resultado} if isinstance(resultado, list) else resultado,
+            "resultado_parcial": None
+        }
+        if geracao["categoria"] == "copy":
+            exibir_resultado_copy(job_historico, regeneravel=False)
+        else:
+            exibir_resultado_entregavel(job_historico)
+        
+        if st.button("🗑️ Remover do histórico", key=f"remover_historico_{geracao['id']}"):
+            historico.remover(geracao["id"])
+            st.rerun()
+
+# Tempo de renderização e de importação dos módulos
+with st.sidebar.expander("⏱️ Desempenho"):
+    st.markdown(f"**Renderização desta página:** {(time.perf_counter() - _inicio_script) * 1000:.0f} ms")
+    metricas_importacao = registro_modulos.metricas_importacao()
+    if metricas_importacao:
+        st.markdown("**Importação dos módulos (primeira carga):**")
+        st.table(metricas_importacao)
+    else:
+        st.caption("Nenhum módulo de backend carregado ainda.")
+    
+    # As gerações rodam nos jobs: com eles carregados, as métricas de IA já existem
+    if registro_modulos.carregado("jobs"):
+        metricas_cache = carregar_backend("cache_respostas", "obter_cache_respostas")().metricas()
+        st.markdown(
+            f"**Cache de respostas:** {metricas_cache['taxa_acerto']:.0%} de acertos · "
+            f"{metricas_cache['hits_memoria']} memória · {metricas_cache['hits_disco']} disco · "
+            f"{metricas_cache['misses']} falhas · {metricas_cache['entradas_disco']} entradas"
+        )
+        
+        metricas_voos = carregar_backend("coalescencia", "obter_coordenador_voos")().metricas()
+        coalescidas = metricas_voos["coalescidas_processo"] + metricas_voos["coalescidas_externas"]
+        if coalescidas:
+            st.markdown(
+                f"**Pedidos idênticos coalescidos:** {coalescidas} "
+                f"({metricas_voos['coalescidas_externas']} de outros processos) · "
+                f"{metricas_voos['lideradas']} chamadas feitas"
+            )
+        
+        metricas_roteador = carregar_backend("roteador", "obter_roteador")().metricas()
+        if metricas_roteador:
+            st.markdown("**Latência dos provedores (janela móvel):**")
+            st.table(metricas_roteador)
+        
+        metricas_limites = carregar_backend("limites", "obter_agendador")().metricas()
+        for provider, valores in metricas_limites.items():
+            st.markdown(
+                f"**Limites {provider}:** {valores['requisicoes']} requisições · "
+                f"{valores['espera_s']:.1f}s em fila · {valores['erros_429']} respostas 429"
+            )
+        
+        metricas_prompt = carregar_backend("prompts", "obter_metricas_prompt")().metricas()
+        if metricas_prompt:
+            st.markdown("**Cache de prompt dos provedores (tokens de entrada):**")
+            st.table(metricas_prompt)
 
 # Footer
 st.markdown("---")
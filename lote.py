@@ -0,0 +1,207 @@
+"""
+Geração em Lote pela Linha de Comando
+
+Gera copies ou entregáveis para centenas de entradas de um CSV ou JSONL,
+com concorrência configurável. Cada resultado é gravado no arquivo de saída
+(JSONL) assim que fica pronto; ao reexecutar o mesmo comando, as linhas já
+concluídas com sucesso são puladas, então uma falha no meio de um lote de
+500 linhas não obriga a recomeçar do zero.
+
+Uso:
+    python lote.py copy entradas.csv saida.jsonl --provider openai --concorrencia 8
+    python lote.py entregavel bonus.jsonl saida.jsonl --provider gemini
+
+Colunas aceitas (acentos e maiúsculas são ignorados):
+    copy:        id (opcional), copy | copy_original, nicho, publico | publico_alvo
+    entregavel:  id (opcional), topico, tipo, idioma, publico | publico_alvo
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterator, List, Set
+
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from modules.contexto_module import ContextoSessao
+
+# Os módulos de geração devolvem falhas como texto com estes prefixos
+PREFIXOS_ERRO = ("Erro ao processar", "Erro ao gerar")
+
+ALIASES = {
+    "copy_original": "copy",
+    "publico_alvo": "publico",
+}
+
+
+def _normalizar_chave(chave: str) -> str:
+    chave = unicodedata.normalize("NFKD", chave.strip().lower())
+    chave = "".join(c for c in chave if not unicodedata.combining(c)).replace(" ", "_").replace("-", "_")
+    return ALIASES.get(chave, chave)
+
+
+def ler_entradas(caminho: str) -> Iterator[Dict]:
+    """
+    Lê as entradas de um CSV ou JSONL, normalizando os nomes das colunas.
+
+    Linhas sem coluna "id" recebem o número da linha como ID, o que mantém o
+    resume estável enquanto o arquivo de entrada não for reordenado.
+    """
+    with open(caminho, "r", encoding="utf-8-sig", newline="") as f:
+        if caminho.lower().endswith((".jsonl", ".ndjson")):
+            registros = (json.loads(linha) for linha in f if linha.strip())
+        else:
+            registros = csv.DictReader(f)
+
+        for numero, registro in enumerate(registros, start=1):
+            entrada = {_normalizar_chave(k): (v or "").strip() if isinstance(v, str) else v
+                       for k, v in registro.items() if k}
+            entrada["id"] = str(entrada.get("id") or f"linha_{numero}")
+            yield entrada
+
+
+def ids_concluidos(caminho_saida: str) -> Set[str]:
+    """IDs já gerados com sucesso em execuções anteriores."""
+    concluidos = set()
+    if not os.path.exists(caminho_saida):
+        return concluidos
+
+    with open(caminho_saida, "r", encoding="utf-8") as f:
+        for linha in f:
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                continue  # linha truncada por uma interrupção
+            if registro.get("status") == "ok":
+                concluidos.add(registro["id"])
+    return concluidos
+
+
+class ExecutorLote:
+    """
+    Executa um lote de gerações em paralelo, gravando cada resultado ao terminar.
+    """
+
+    def __init__(self, tipo: str, provider: str, concorrencia: int = 4, contexto: ContextoSessao = None,
+                 usar_cache: bool = True):
+        """
+        Args:
+            tipo (str): "copy" ou "entregavel"
+            provider (str): Provedor de IA ("manus", "openai" ou "gemini")
+            concorrencia (int): Gerações simultâneas
+            contexto (ContextoSessao): Credenciais (padrão: variáveis de ambiente)
+            usar_cache (bool): Reaproveitar respostas em cache para entradas repetidas
+        """
+        self.tipo = tipo
+        self.provider = provider
+        self.concorrencia = concorrencia
+        self.contexto = contexto or ContextoSessao.do_ambiente(provider=provider)
+        self._trava_saida = threading.Lock()
+
+        # Uma única instância por lote: o cliente do provedor é compartilhado entre as threads
+        self._tipo_fallback = None
+        if tipo == "copy":
+            from modules.copy_module import CerebroCopy, RespostaFallback
+            self.gerador = CerebroCopy(provider=provider, contexto=self.contexto, usar_cache=usar_cache)
+            # Texto dos templates quando o provedor falha: conta como erro, para o resume tentar de novo
+            self._tipo_fallback = RespostaFallback
+        else:
+            from modules.entregaveis_module import CriadorEntregaveis
+            self.gerador = CriadorEntregaveis(provider=provider, contexto=self.contexto, usar_cache=usar_cache)
+
+    def _gerar(self, entrada: Dict) -> str:
+        if self.tipo == "copy":
+            if not entrada.get("copy"):
+                raise ValueError("coluna 'copy' vazia")
+            return self.gerador.gerar_copy_modelada(entrada["copy"], entrada.get("nicho", ""), entrada.get("publico", ""))
+
+        if not entrada.get("topico"):
+            raise ValueError("coluna 'topico' vazia")
+        return self.gerador.gerar_entregavel(
+            entrada["topico"], entrada.get("tipo") or "E-book",
+            entrada.get("idioma") or "pt", entrada.get("publico", "")
+        )
+
+    def _processar(self, entrada: Dict) -> Dict:
+        inicio = time.perf_counter()
+        registro = {"id": entrada["id"], "tipo": self.tipo, "provider": self.provider, "entrada": entrada}
+        try:
+            resultado = self._gerar(entrada)
+            if not resultado or str(resultado).startswith(PREFIXOS_ERRO):
+                raise RuntimeError(resultado or "resposta vazia")
+            if self._tipo_fallback and isinstance(resultado, self._tipo_fallback):
+                raise RuntimeError(f"Erro ao gerar com {self.provider}: provedor indisponível "
+                                   f"(a resposta veio dos templates offline)")
+            registro.update(status="ok", resultado=resultado)
+        except Exception as e:
+            registro.update(status="erro", erro=str(e))
+        registro["duracao_s"] = round(time.perf_counter() - inicio, 2)
+        registro["concluido_em"] = datetime.now().isoformat()
+        return registro
+
+    def executar(self, entradas: List[Dict], caminho_saida: str) -> Dict:
+        """
+        Processa as entradas pendentes e anexa os resultados ao arquivo de saída.
+
+        Returns:
+            dict: Contagens de ok, erro e pulados (já concluídos antes)
+        """
+        concluidos = ids_concluidos(caminho_saida)
+        pendentes = [e for e in entradas if e["id"] not in concluidos]
+        resumo = {"ok": 0, "erro": 0, "pulados": len(entradas) - len(pendentes)}
+
+        print(f"📦 {len(entradas)} entradas · {resumo['pulados']} já concluídas · {len(pendentes)} pendentes")
+        if not pendentes:
+            return resumo
+
+        os.makedirs(os.path.dirname(os.path.abspath(caminho_saida)), exist_ok=True)
+        with open(caminho_saida, "a", encoding="utf-8") as saida, \
+                ThreadPoolExecutor(max_workers=self.concorrencia) as executor:
+            futuros = [executor.submit(self._processar, entrada) for entrada in pendentes]
+            for i, futuro in enumerate(as_completed(futuros), start=1):
+                registro = futuro.result()
+                with self._trava_saida:
+                    saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                    saida.flush()
+                resumo[registro["status"]] += 1
+
+                simbolo = "✅" if registro["status"] == "ok" else "❌"
+                detalhe = f"{registro['duracao_s']}s" if registro["status"] == "ok" else registro["erro"][:80]
+                print(f"{simbolo} [{i}/{len(pendentes)}] {registro['id']} · {detalhe}")
+
+        return resumo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Geração em lote de copies e entregáveis.")
+    parser.add_argument("tipo", choices=["copy", "entregavel"], help="O que gerar")
+    parser.add_argument("entrada", help="Arquivo CSV ou JSONL de entradas")
+    parser.add_argument("saida", help="Arquivo JSONL de resultados (reaproveitado para resume)")
+    parser.add_argument("--provider", default="openai", choices=["manus", "openai", "gemini", "auto"])
+    parser.add_argument("--concorrencia", type=int, default=4, help="Gerações simultâneas (padrão: 4)")
+    parser.add_argument("--sem-cache", action="store_true", help="Sempre chamar o provedor, sem reaproveitar respostas")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    entradas = list(ler_entradas(args.entrada))
+    executor = ExecutorLote(args.tipo, args.provider, concorrencia=args.concorrencia, usar_cache=not args.sem_cache)
+
+    inicio = time.perf_counter()
+    resumo = executor.executar(entradas, args.saida)
+    print(f"🏁 Concluído em {time.perf_counter() - inicio:.1f}s · "
+          f"{resumo['ok']} ok · {resumo['erro']} erros · {resumo['pulados']} pulados")
+
+    return 1 if resumo["erro"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,620 @@
+"""
+Módulo de Armazenamento de Ofertas (armazem_module.py)
+
+Guarda o histórico de ofertas garimpadas em SQLite e mantém tabelas de
+agregados materializados (contagens por plataforma/categoria, estatísticas e
+histograma de gravidade, distribuição de comissões). Cada execução do garimpo
+registra um snapshot e atualiza os agregados de forma incremental, então o
+dashboard lê números prontos em vez de varrer todas as ofertas.
+
+Os agregados descrevem o catálogo atual, não a soma dos snapshots: cada
+oferta é identificada pela chave natural (plataforma + URL, ou título sem
+URL) em `ofertas_atuais`, e um novo garimpo só mexe nos agregados das
+ofertas novas ou que mudaram de categoria, gravidade ou comissão.
+"""
+
+import os
+import re
+import json
+import math
+import sqlite3
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CAMINHO_ARMAZEM = os.path.join("data", "ofertas.db")
+
+# Versão da chave natural do catálogo (PRAGMA user_version); ao mudar, o catálogo é refeito
+VERSAO_CATALOGO = 2
+
+# Último trecho de URLs que são a vitrine da plataforma, e não um produto
+PAGINAS_GENERICAS = {"marketplace", "search", "busca", "produtos", "products", "vitrine", "explore"}
+
+# Faixas de comissão (limite superior exclusivo) por unidade
+FAIXAS_COMISSAO = {
+    "$": [10, 25, 50, 100, 200],
+    "%": [20, 30, 40, 50, 75],
+}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    criado_em TEXT NOT NULL,
+    origem TEXT,
+    total_ofertas INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS ofertas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    plataforma TEXT,
+    titulo TEXT,
+    categoria TEXT,
+    gravidade TEXT,
+    gravidade_num REAL,
+    comissao TEXT,
+    comissao_num REAL,
+    comissao_unidade TEXT,
+    preco TEXT,
+    url TEXT,
+    data_garimpo TEXT,
+    dados TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_ofertas_snapshot ON ofertas(snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_ofertas_plataforma ON ofertas(plataforma, id);
+CREATE INDEX IF NOT EXISTS idx_ofertas_categoria ON ofertas(categoria, id);
+CREATE INDEX IF NOT EXISTS idx_ofertas_gravidade ON ofertas(gravidade_num, id);
+CREATE INDEX IF NOT EXISTS idx_ofertas_comissao ON ofertas(comissao_num, id);
+CREATE INDEX IF NOT EXISTS idx_ofertas_titulo ON ofertas(titulo, id);
+CREATE INDEX IF NOT EXISTS idx_ofertas_data ON ofertas(data_garimpo, id);
+
+CREATE TABLE IF NOT EXISTS ofertas_atuais (
+    plataforma TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    oferta_id INTEGER NOT NULL REFERENCES ofertas(id),
+    categoria TEXT NOT NULL,
+    gravidade_num REAL,
+    comissao_num REAL,
+    comissao_unidade TEXT,
+    PRIMARY KEY (plataforma, chave)
+);
+
+CREATE TABLE IF NOT EXISTS agg_plataforma_categoria (
+    plataforma TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    ofertas INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (plataforma, categoria)
+);
+
+CREATE TABLE IF NOT EXISTS agg_gravidade (
+    plataforma TEXT PRIMARY KEY,
+    n INTEGER NOT NULL DEFAULT 0,
+    soma REAL NOT NULL DEFAULT 0,
+    soma_quadrados REAL NOT NULL DEFAULT 0,
+    minimo REAL,
+    maximo REAL
+);
+
+CREATE TABLE IF NOT EXISTS agg_gravidade_hist (
+    plataforma TEXT NOT NULL,
+    faixa INTEGER NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (plataforma, faixa)
+);
+
+CREATE TABLE IF NOT EXISTS agg_comissao (
+    plataforma TEXT NOT NULL,
+    unidade TEXT NOT NULL,
+    faixa TEXT NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    soma REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (plataforma, unidade, faixa)
+);
+"""
+
+
+# Colunas que o explorador pode exibir, filtrar e ordenar
+COLUNAS_EXPLORADOR = [
+    "id", "snapshot_id", "plataforma", "titulo", "categoria", "gravidade", "gravidade_num",
+    "comissao", "comissao_num", "preco", "url", "data_garimpo",
+]
+COLUNAS_ORDENAVEIS = ["id", "plataforma", "titulo", "categoria", "gravidade_num", "comissao_num", "data_garimpo"]
+COLUNAS_NUMERICAS = {"id", "snapshot_id", "gravidade_num", "comissao_num"}
+
+
+def _extrair_numero(valor) -> Optional[float]:
+    """Extrai o primeiro número de textos como '$31.50', '40%' ou 'R$ 497,00'."""
+    if valor is None:
+        return None
+    match = re.search(r"\d+(?:[.,]\d+)?", str(valor))
+    if not match:
+        return None
+    return float(match.group(0).replace(",", "."))
+
+
+def _normalizar(valor) -> str:
+    texto = " ".join(str(valor or "").split()).lower()
+    return "" if texto in ("n/a", "nan", "none") else texto
+
+
+def _url_de_produto(url) -> str:
+    """A URL normalizada, se apontar para um produto (e não para a vitrine da plataforma)."""
+    url = _normalizar(url)
+    partes = urlsplit(url)
+    segmentos = [s for s in partes.path.split("/") if s]
+    if not partes.netloc or (not segmentos and not partes.query):
+        return ""
+    if segmentos and segmentos[-1] in PAGINAS_GENERICAS and not partes.query:
+        return ""
+    return url.rstrip("/")
+
+
+def _chave_natural(url, titulo, categoria, oferta_id: int) -> str:
+    """
+    Identidade da oferta na plataforma entre garimpos.
+
+    A URL só vale quando aponta para o produto: os garimpos costumam trazer a
+    URL da vitrine, igual para todas as ofertas. Senão, título e categoria
+    normalizados; sem título, a própria linha.
+    """
+    url = _url_de_produto(url)
+    if url:
+        return url
+    titulo = _normalizar(titulo)
+    if titulo:
+        return f"{titulo}|{_normalizar(categoria)}"
+    return f"#{oferta_id}"
+
+
+def _faixa_comissao(valor: float, unidade: str) -> str:
+    """Retorna o rótulo da faixa de comissão, ex.: '$25-50' ou '%50-75'."""
+    anterior = 0
+    for limite in FAIXAS_COMISSAO[unidade]:
+        if valor < limite:
+            return f"{unidade}{anterior}-{limite}"
+        anterior = limite
+    return f"{unidade}{anterior}+"
+
+
+class ArmazemOfertas:
+    """
+    Histórico de ofertas em SQLite com agregados materializados.
+    """
+
+    def __init__(self, caminho: str = CAMINHO_ARMAZEM):
+        """
+        Inicializa o armazém, criando o banco e as tabelas se necessário.
+
+        Args:
+            caminho (str): Caminho do arquivo SQLite
+        """
+        self.caminho = caminho
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with self._conexao() as conn:
+            catalogo_existia = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ofertas_atuais'"
+            ).fetchone()
+            conn.executescript(ESQUEMA)
+            versao = conn.execute("PRAGMA user_version").fetchone()[0]
+            if not catalogo_existia or versao < VERSAO_CATALOGO:
+                self._reconstruir_agregados(conn)
+                conn.execute(f"PRAGMA user_version = {VERSAO_CATALOGO}")
+
+    def _reconstruir_agregados(self, conn):
+        """
+        Refaz o catálogo atual e os agregados a partir das ofertas gravadas.
+
+        Usado uma vez em bancos criados antes do catálogo (cujos agregados
+        somavam as mesmas ofertas a cada snapshot) ou antes da chave natural
+        atual (VERSAO_CATALOGO).
+        """
+        total = conn.execute("SELECT COUNT(*) FROM ofertas").fetchone()[0]
+        if not total:
+            return
+        for tabela in ("ofertas_atuais", "agg_plataforma_categoria", "agg_gravidade", "agg_gravidade_hist",
+                       "agg_comissao"):
+            conn.execute(f"DELETE FROM {tabela}")
+        linhas = conn.execute(
+            "SELECT id, plataforma, titulo, url, categoria, gravidade_num, comissao_num, comissao_unidade "
+            "FROM ofertas ORDER BY id"
+        ).fetchall()
+        for linha in linhas:
+            self._atualizar_catalogo(conn, linha["id"], linha["plataforma"], linha["categoria"],
+                                     _chave_natural(linha["url"], linha["titulo"], linha["categoria"], linha["id"]),
+                                     linha["gravidade_num"], linha["comissao_num"], linha["comissao_unidade"])
+        logger.info(f"🗄️ Agregados reconstruídos a partir de {total} ofertas gravadas")
+
+    @contextmanager
+    def _conexao(self):
+        """Abre uma conexão curta (segura entre threads do Streamlit)."""
+        conn = sqlite3.connect(self.caminho, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def registrar_snapshot(self, ofertas: List[Dict], origem: str = "garimpo") -> Optional[int]:
+        """
+        Registra um lote de ofertas e atualiza os agregados incrementalmente.
+
+        Todas as ofertas entram no histórico do snapshot; os agregados só
+        mudam para as que são novas no catálogo ou mudaram desde o último garimpo.
+
+        Args:
+            ofertas (list): Registros do garimpo
+            origem (str): Descrição da origem do lote
+
+        Returns:
+            int: ID do snapshot criado (None se não houver ofertas)
+        """
+        if not ofertas:
+            return None
+
+        with self._conexao() as conn:
+            cursor = conn.execute(
+                "INSERT INTO snapshots (criado_em, origem, total_ofertas) VALUES (?, ?, ?)",
+                (datetime.now().isoformat(), origem, len(ofertas)),
+            )
+            snapshot_id = cursor.lastrowid
+
+            situacoes = [self._registrar_oferta(conn, snapshot_id, oferta) for oferta in ofertas]
+
+        logger.info(
+            f"🗄️ Snapshot {snapshot_id} registrado com {len(ofertas)} ofertas "
+            f"({situacoes.count('nova')} novas, {situacoes.count('alterada')} alteradas)"
+        )
+        return snapshot_id
+
+    def _registrar_oferta(self, conn, snapshot_id: int, oferta: Dict) -> str:
+        plataforma = str(oferta.get("plataforma") or "N/A")
+        categoria = str(oferta.get("categoria") or "N/A")
+        comissao = oferta.get("comissao_inicial") or oferta.get("comissao")
+        if comissao in (None, "N/A"):
+            comissao = None
+
+        gravidade_num = _extrair_numero(oferta.get("gravidade"))
+        comissao_num = _extrair_numero(comissao)
+        unidade = "%" if comissao and "%" in str(comissao) else "$"
+
+        cursor = conn.execute(
+            """
+            INSERT INTO ofertas (snapshot_id, plataforma, titulo, categoria, gravidade, gravidade_num,
+                                 comissao, comissao_num, comissao_unidade, preco, url, data_garimpo, dados)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                snapshot_id, plataforma, oferta.get("titulo"), categoria,
+                oferta.get("gravidade"), gravidade_num,
+                comissao, comissao_num, unidade if comissao_num is not None else None,
+                oferta.get("preco") or oferta.get("preco_inicial"), oferta.get("url"),
+                oferta.get("data_garimpo"), json.dumps(oferta, ensure_ascii=False, default=str),
+            ),
+        )
+        oferta_id = cursor.lastrowid
+        return self._atualizar_catalogo(
+            conn, oferta_id, plataforma, categoria, _chave_natural(oferta.get("url"), oferta.get("titulo"), categoria, oferta_id),
+            gravidade_num, comissao_num, unidade if comissao_num is not None else None,
+        )
+
+    def _atualizar_catalogo(self, conn, oferta_id: int, plataforma: str, categoria: str, chave: str,
+                            gravidade_num: Optional[float], comissao_num: Optional[float],
+                            unidade: Optional[str]) -> str:
+        """
+        Atualiza a versão atual da oferta e, só se ela é nova ou mudou, os agregados.
+
+        Returns:
+            str: "nova", "alterada" ou "repetida"
+        """
+        valores = (categoria, gravidade_num, comissao_num, unidade)
+        atual = conn.execute(
+            "SELECT categoria, gravidade_num, comissao_num, comissao_unidade FROM ofertas_atuais "
+            "WHERE plataforma = ? AND chave = ?",
+            (plataforma, chave),
+        ).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO ofertas_atuais VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (plataforma, chave, oferta_id, *valores),
+        )
+        if atual is not None and tuple(atual) == valores:
+            return "repetida"
+
+        if atual is not None:
+            self._somar_agregados(conn, plataforma, *tuple(atual), sinal=-1)
+        self._somar_agregados(conn, plataforma, *valores, sinal=1)
+        if atual is not None and atual["gravidade_num"] is not None:
+            # Mínimo e máximo não se desfazem por subtração: relidos do catálogo da plataforma
+            conn.execute(
+                """
+                UPDATE agg_gravidade SET
+                    minimo = (SELECT MIN(gravidade_num) FROM ofertas_atuais WHERE plataforma = ?),
+                    maximo = (SELECT MAX(gravidade_num) FROM ofertas_atuais WHERE plataforma = ?)
+                WHERE plataforma = ?
+                """,
+                (plataforma, plataforma, plataforma),
+            )
+        return "nova" if atual is None else "alterada"
+
+    @staticmethod
+    def _somar_agregados(conn, plataforma: str, categoria: str, gravidade_num: Optional[float],
+                         comissao_num: Optional[float], unidade: Optional[str], sinal: int):
+        """Soma (sinal=1) ou retira (sinal=-1) a contribuição de uma oferta dos agregados."""
+        conn.execute(
+            """
+            INSERT INTO agg_plataforma_categoria (plataforma, categoria, ofertas) VALUES (?, ?, ?)
+            ON CONFLICT(plataforma, categoria) DO UPDATE SET ofertas = ofertas + excluded.ofertas
+            """,
+            (plataforma, categoria, sinal),
+        )
+
+        if gravidade_num is not None:
+            conn.execute(
+                """
+                INSERT INTO agg_gravidade (plataforma, n, soma, soma_quadrados, minimo, maximo)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(plataforma) DO UPDATE SET
+                    n = n + excluded.n,
+                    soma = soma + excluded.soma,
+                    soma_quadrados = soma_quadrados + excluded.soma_quadrados,
+                    minimo = MIN(minimo, excluded.minimo),
+                    maximo = MAX(maximo, excluded.maximo)
+                """,
+                (plataforma, sinal, sinal * gravidade_num, sinal * gravidade_num ** 2, gravidade_num, gravidade_num),
+            )
+            conn.execute(
+                """
+                INSERT INTO agg_gravidade_hist (plataforma, faixa, n) VALUES (?, ?, ?)
+                ON CONFLICT(plataforma, faixa) DO UPDATE SET n = n + excluded.n
+                """,
+                (plataforma, int(math.floor(gravidade_num)), sinal),
+            )
+
+        if comissao_num is not None:
+            conn.execute(
+                """
+                INSERT INTO agg_comissao (plataforma, unidade, faixa, n, soma) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(plataforma, unidade, faixa) DO UPDATE SET
+                    n = n + excluded.n, soma = soma + excluded.soma
+                """,
+                (plataforma, unidade, _faixa_comissao(comissao_num, unidade), sinal, sinal * comissao_num),
+            )
+
+    def importar_csv(self, caminho_csv: str) -> Optional[int]:
+        """
+        Importa um CSV de garimpo antigo como snapshot.
+
+        Returns:
+            int: ID do snapshot criado
+        """
+        import pandas as pd
+
+        df = pd.read_csv(caminho_csv)
+        ofertas = df.where(df.notna(), None).to_dict("records")
+        return self.registrar_snapshot(ofertas, origem=os.path.basename(caminho_csv))
+
+    # ------------------------------------------------------------------
+    # Leitura dos agregados
+    # ------------------------------------------------------------------
+    def ultimo_snapshot(self) -> Optional[Dict]:
+        """Retorna o snapshot mais recente (ou None se o armazém estiver vazio)."""
+        with self._conexao() as conn:
+            linha = conn.execute("SELECT * FROM snapshots ORDER BY id DESC LIMIT 1").fetchone()
+        return dict(linha) if linha else None
+
+    def ofertas_do_snapshot(self, snapshot_id: int) -> List[Dict]:
+        """Retorna os registros originais das ofertas de um snapshot."""
+        with self._conexao() as conn:
+            linhas = conn.execute(
+                "SELECT dados FROM ofertas WHERE snapshot_id = ? ORDER BY id", (snapshot_id,)
+            ).fetchall()
+        return [json.loads(linha["dados"]) for linha in linhas]
+
+    def _clausula_filtros(self, filtros: Optional[Dict]):
+        """Monta o WHERE parametrizado a partir dos filtros do explorador."""
+        filtros = filtros or {}
+        condicoes, parametros = [], []
+
+        for coluna in ("plataforma", "categoria"):
+            valores = filtros.get(coluna)
+            if valores:
+                condicoes.append(f"{coluna} IN ({', '.join('?' * len(valores))})")
+                parametros.extend(valores)
+        if filtros.get("snapshot_id") is not None:
+            condicoes.append("snapshot_id = ?")
+            parametros.append(filtros["snapshot_id"])
+        if filtros.get("busca"):
+            condicoes.append("titulo LIKE ?")
+            parametros.append(f"%{filtros['busca']}%")
+        if filtros.get("gravidade_min") is not None:
+            condicoes.append("gravidade_num >= ?")
+            parametros.append(filtros["gravidade_min"])
+
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        return where, parametros
+
+    def contar_ofertas(self, filtros: Optional[Dict] = None) -> int:
+        """Quantidade de ofertas que atendem aos filtros."""
+        where, parametros = self._clausula_filtros(filtros)
+        with self._conexao() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM ofertas {where}", parametros).fetchone()[0]
+
+    def consultar_ofertas(self, filtros: Optional[Dict] = None, ordenar_por: str = "id",
+                          descendente: bool = True, limite: int = 50, offset: int = 0,
+                          colunas: Optional[List[str]] = None, apos: Optional[tuple] = None) -> Dict:
+        """
+        Retorna apenas uma página de ofertas, filtrada e ordenada no banco.
+
+        Args:
+            filtros (dict): plataforma (list), categoria (list), snapshot_id, busca, gravidade_min
+            ordenar_por (str): Coluna de ordenação (ver COLUNAS_ORDENAVEIS)
+            descendente (bool): Ordem decrescente
+            limite (int): Tamanho da página
+            offset (int): Deslocamento (paginação LIMIT/OFFSET; ignorado se `apos` for informado)
+            colunas (list): Colunas a retornar (padrão: todas de COLUNAS_EXPLORADOR)
+            apos (tuple): Cursor (valor_ordenacao, id) da última linha da página anterior,
+                para paginação por chave (keyset), que não degrada em páginas profundas;
+                valor None indica que a página anterior já estava nas linhas sem valor
+
+        Returns:
+            dict: {"linhas": [...], "proximo_cursor": (valor, id) ou None}
+        """
+        if ordenar_por not in COLUNAS_ORDENAVEIS:
+            raise ValueError(f"Coluna de ordenação inválida: {ordenar_por}")
+        colunas = [c for c in (colunas or COLUNAS_EXPLORADOR) if c in COLUNAS_EXPLORADOR]
+
+        where, parametros = self._clausula_filtros(filtros)
+        direcao = "DESC" if descendente else "ASC"
+        comparador = "<" if descendente else ">"
+        selecao = ", ".join(dict.fromkeys(colunas + [ordenar_por, "id"]))
+
+        def pagina(condicao: str, parametros_condicao: list, ordem: str, limite: int, offset: int) -> list:
+            # Ordena pela coluna crua (e não por uma expressão) para usar o índice (coluna, id)
+            filtro = where
+            if condicao:
+                filtro = f"{where} AND {condicao}" if where else f"WHERE {condicao}"
+            sql = f"SELECT {selecao} FROM ofertas {filtro} ORDER BY {ordem} LIMIT ? OFFSET ?"
+            return conn.execute(sql, parametros + parametros_condicao + [limite, offset]).fetchall()
+
+        with self._conexao() as conn:
+            if ordenar_por == "id":
+                condicao, parametros_condicao = ("", []) if apos is None else (f"id {comparador} ?", [apos[1]])
+                linhas = pagina(condicao, parametros_condicao, f"id {direcao}", limite, 0 if apos else offset)
+            else:
+                # Nulos vão para o fim nas duas direções: primeiro as linhas com valor,
+                # depois as nulas por id. O cursor (None, id) indica a parte dos nulos.
+                ordem = f"{ordenar_por} {direcao}, id {direcao}"
+                linhas = []
+                if apos is None or apos[0] is not None:
+                    if apos is None:
+                        condicao, parametros_condicao = f"{ordenar_por} IS NOT NULL", []
+                    else:
+                        condicao = f"{ordenar_por} IS NOT NULL AND ({ordenar_por}, id) {comparador} (?, ?)"
+                        parametros_condicao = [apos[0], apos[1]]
+                    linhas = pagina(condicao, parametros_condicao, ordem, limite, 0 if apos else offset)
+                if len(linhas) < limite:
+                    condicao, parametros_condicao, offset_nulos = f"{ordenar_por} IS NULL", [], 0
+                    if apos is not None and apos[0] is None:
+                        condicao += f" AND id {comparador} ?"
+                        parametros_condicao = [apos[1]]
+                    elif apos is None and offset and not linhas:
+                        # Página por OFFSET que começa depois do fim das linhas com valor
+                        com_valor = conn.execute(
+                            f"SELECT COUNT(*) FROM ofertas {where} {'AND' if where else 'WHERE'} "
+                            f"{ordenar_por} IS NOT NULL", parametros
+                        ).fetchone()[0]
+                        offset_nulos = max(offset - com_valor, 0)
+                    linhas += pagina(condicao, parametros_condicao, ordem, limite - len(linhas), offset_nulos)
+
+        proximo_cursor = None
+        if len(linhas) == limite:
+            proximo_cursor = (linhas[-1][ordenar_por], linhas[-1]["id"])
+
+        return {
+            "linhas": [{c: linha[c] for c in colunas} for linha in linhas],
+            "proximo_cursor": proximo_cursor,
+        }
+
+    def valores_distintos(self) -> Dict[str, List[str]]:
+        """Plataformas e categorias conhecidas (lidas dos agregados, sem varrer ofertas)."""
+        contagens = self.contagens()
+        return {
+            "plataforma": list(contagens["plataformas"]),
+            "categoria": list(contagens["categorias"]),
+        }
+
+    def contagens(self) -> Dict:
+        """Contagens por plataforma e por categoria."""
+        with self._conexao() as conn:
+            linhas = conn.execute(
+                "SELECT plataforma, categoria, ofertas FROM agg_plataforma_categoria WHERE ofertas > 0"
+            ).fetchall()
+
+        plataformas: Dict[str, int] = {}
+        categorias: Dict[str, int] = {}
+        for linha in linhas:
+            plataformas[linha["plataforma"]] = plataformas.get(linha["plataforma"], 0) + linha["ofertas"]
+            categorias[linha["categoria"]] = categorias.get(linha["categoria"], 0) + linha["ofertas"]
+
+        ordenar = lambda d: dict(sorted(d.items(), key=lambda item: item[1], reverse=True))
+        return {
+            "total_ofertas": sum(plataformas.values()),
+            "plataformas": ordenar(plataformas),
+            "categorias": ordenar(categorias),
+        }
+
+    def estatisticas_gravidade(self, percentis=(50, 90, 95)) -> Dict:
+        """
+        Média, desvio padrão, mínimo, máximo e percentis da gravidade.
+
+        Os percentis são interpolados no histograma de faixas unitárias e
+        limitados ao intervalo observado [mínimo, máximo].
+        """
+        with self._conexao() as conn:
+            resumo = conn.execute(
+                "SELECT SUM(n) AS n, SUM(soma) AS soma, SUM(soma_quadrados) AS sq, "
+                "MIN(minimo) AS minimo, MAX(maximo) AS maximo FROM agg_gravidade WHERE n > 0"
+            ).fetchone()
+            hist = conn.execute(
+                "SELECT faixa, SUM(n) AS n FROM agg_gravidade_hist GROUP BY faixa HAVING SUM(n) > 0 ORDER BY faixa"
+            ).fetchall()
+
+        n = resumo["n"] or 0
+        if not n:
+            return {}
+
+        media = resumo["soma"] / n
+        variancia = max(resumo["sq"] / n - media ** 2, 0.0)
+        estatisticas = {
+            "n": n,
+            "media": round(media, 2),
+            "desvio_padrao": round(math.sqrt(variancia), 2),
+            "minimo": resumo["minimo"],
+            "maximo": resumo["maximo"],
+        }
+
+        for p in percentis:
+            alvo = n * p / 100.0
+            acumulado = 0
+            for linha in hist:
+                if acumulado + linha["n"] >= alvo:
+                    fracao = (alvo - acumulado) / linha["n"]
+                    valor = min(max(linha["faixa"] + fracao, resumo["minimo"]), resumo["maximo"])
+                    estatisticas[f"p{p}"] = round(valor, 2)
+                    break
+                acumulado += linha["n"]
+
+        return estatisticas
+
+    def distribuicao_comissoes(self) -> List[Dict]:
+        """Distribuição de comissões por plataforma, unidade ($ ou %) e faixa."""
+        with self._conexao() as conn:
+            linhas = conn.execute(
+                "SELECT plataforma, unidade, faixa, n, soma / n AS media FROM agg_comissao "
+                "WHERE n > 0 ORDER BY plataforma, unidade, faixa"
+            ).fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def agregados(self) -> Dict:
+        """Todos os agregados materializados em um único dicionário."""
+        contagens = self.contagens()
+        return {
+            "total_ofertas": contagens["total_ofertas"],
+            "plataformas": contagens["plataformas"],
+            "categorias_populares": dict(list(contagens["categorias"].items())[:5]),
+            "gravidade": self.estatisticas_gravidade(),
+            "comissoes": self.distribuicao_comissoes(),
+        }
@@ -0,0 +1,72 @@
+"""
+Módulo de Cache de Recursos (cache_module.py)
+
+Cache de recursos caros de criar (clientes de LLM, caminho do driver do
+Chrome) compartilhado por todo o processo. O Streamlit reexecuta o app.py a
+cada interação; com este cache os módulos reaproveitam o mesmo cliente e seu
+pool de conexões entre as reexecuções em vez de recriá-los a cada chamada.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_recursos: Dict[str, Any] = {}
+_trava = threading.Lock()
+
+
+def chave_segura(*partes) -> str:
+    """
+    Monta uma chave de cache sem expor segredos (ex.: API keys) em texto puro.
+
+    Returns:
+        str: Hash curto das partes, para compor chaves como "llm:openai:<hash>"
+    """
+    texto = "|".join(str(p) for p in partes)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
+
+
+def obter_recurso(chave: str, fabrica: Callable[[], Any]) -> Any:
+    """
+    Retorna o recurso em cache ou cria com a fábrica na primeira chamada.
+
+    Args:
+        chave (str): Identificador do recurso (ex.: "llm:openai:<hash>")
+        fabrica (callable): Função sem argumentos que cria o recurso
+
+    Returns:
+        O recurso em cache
+    """
+    recurso = _recursos.get(chave)
+    if recurso is not None:
+        return recurso
+
+    with _trava:
+        recurso = _recursos.get(chave)
+        if recurso is None:
+            recurso = fabrica()
+            _recursos[chave] = recurso
+            logger.info(f"♻️ Recurso criado e armazenado em cache: {chave.split(':')[0]}")
+    return recurso
+
+
+def invalidar_recursos(prefixo: Optional[str] = None) -> int:
+    """
+    Remove recursos do cache.
+
+    Args:
+        prefixo (str): Remove apenas chaves com este prefixo (None remove tudo)
+
+    Returns:
+        int: Quantidade de recursos removidos
+    """
+    with _trava:
+        chaves = [c for c in _recursos if prefixo is None or c.startswith(prefixo)]
+        for chave in chaves:
+            _recursos.pop(chave, None)
+    return len(chaves)
@@ -0,0 +1,236 @@
+"""
+Módulo de Cache de Respostas (cache_respostas_module.py)
+
+Guarda as respostas dos provedores de IA para que a mesma copy ou o mesmo
+entregável, pedido de novo, volte na hora e sem custo. A chave é o hash do
+prompt normalizado + provedor + modelo + temperatura.
+
+São duas camadas:
+- memória: LRU por processo, com capacidade fixa;
+- disco: SQLite em data/cache_respostas.db, compartilhado entre processos
+  (Streamlit, API, CLI de lote), com TTL e limite de entradas.
+
+A remoção no disco apaga primeiro as entradas expiradas e depois as menos
+acessadas recentemente, quando o total passa do limite.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from modules.cache_module import obter_recurso
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CAMINHO_CACHE = os.path.join("data", "cache_respostas.db")
+TTL_PADRAO_S = int(os.getenv("CACHE_RESPOSTAS_TTL", str(7 * 24 * 3600)))
+MAX_ENTRADAS_DISCO = int(os.getenv("CACHE_RESPOSTAS_MAX", "5000"))
+CAPACIDADE_MEMORIA = 256
+
+# A limpeza do disco roda a cada N gravações, não em todas
+INTERVALO_LIMPEZA = 50
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS respostas (
+    chave TEXT PRIMARY KEY,
+    provider TEXT,
+    modelo TEXT,
+    resposta TEXT NOT NULL,
+    criado_em REAL NOT NULL,
+    expira_em REAL NOT NULL,
+    acessado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_respostas_acessado ON respostas(acessado_em);
+CREATE INDEX IF NOT EXISTS idx_respostas_expira ON respostas(expira_em);
+"""
+
+
+def normalizar_prompt(prompt: str) -> str:
+    """Remove diferenças irrelevantes (espaços, indentação, quebras extras)."""
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def chave_resposta(prompt: str, provider: str, modelo: str, temperature: float) -> str:
+    """
+    Chave do cache para uma geração.
+
+    Returns:
+        str: sha256 do prompt normalizado com provedor, modelo e temperatura
+    """
+    texto = "|".join([provider, modelo, f"{float(temperature):.2f}", normalizar_prompt(prompt)])
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+class CacheRespostas:
+    """
+    Cache de respostas em duas camadas (LRU em memória + SQLite com TTL).
+    """
+
+    def __init__(self, caminho: str = CAMINHO_CACHE, capacidade_memoria: int = CAPACIDADE_MEMORIA,
+                 ttl_s: int = TTL_PADRAO_S, max_entradas: int = MAX_ENTRADAS_DISCO):
+        """
+        Args:
+            caminho (str): Arquivo SQLite da camada em disco
+            capacidade_memoria (int): Entradas mantidas na LRU em memória
+            ttl_s (int): Validade padrão de cada resposta, em segundos
+            max_entradas (int): Limite de entradas no disco
+        """
+        self.caminho = caminho
+        self.capacidade_memoria = capacidade_memoria
+        self.ttl_s = ttl_s
+        self.max_entradas = max_entradas
+        self._memoria: "OrderedDict[str, tuple]" = OrderedDict()
+        self._trava = threading.Lock()
+        self._gravacoes_desde_limpeza = 0
+        self._metricas = {"hits_memoria": 0, "hits_disco": 0, "misses": 0, "gravacoes": 0, "removidas": 0}
+
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with self._conexao() as conn:
+            conn.executescript(ESQUEMA)
+
+    @contextmanager
+    def _conexao(self):
+        conn = sqlite3.connect(self.caminho, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _guardar_memoria(self, chave: str, resposta: str, expira_em: float):
+        with self._trava:
+            self._memoria[chave] = (resposta, expira_em)
+            self._memoria.move_to_end(chave)
+            while len(self._memoria) > self.capacidade_memoria:
+                self._memoria.popitem(last=False)
+
+    def _contar(self, metrica: str, quantidade: int = 1):
+        with self._trava:
+            self._metricas[metrica] += quantidade
+
+    def obter(self, chave: str) -> Optional[str]:
+        """
+        Resposta em cache para a chave, ou None se ausente/expirada.
+        """
+        agora = time.time()
+        with self._trava:
+            item = self._memoria.get(chave)
+            if item and item[1] > agora:
+                self._memoria.move_to_end(chave)
+                self._metricas["hits_memoria"] += 1
+                return item[0]
+            if item:
+                del self._memoria[chave]
+
+        with self._conexao() as conn:
+            linha = conn.execute(
+                "SELECT resposta, expira_em FROM respostas WHERE chave = ? AND expira_em > ?", (chave, agora)
+            ).fetchone()
+            if linha:
+                conn.execute("UPDATE respostas SET acessado_em = ? WHERE chave = ?", (agora, chave))
+
+        if not linha:
+            self._contar("misses")
+            return None
+
+        self._contar("hits_disco")
+        self._guardar_memoria(chave, linha[0], linha[1])
+        return linha[0]
+
+    def gravar(self, chave: str, resposta: str, provider: str = None, modelo: str = None, ttl_s: Optional[int] = None):
+        """
+        Grava a resposta nas duas camadas.
+
+        Args:
+            chave (str): Chave gerada por chave_resposta()
+            resposta (str): Texto da resposta
+            provider (str): Provedor (informativo)
+            modelo (str): Modelo (informativo)
+            ttl_s (int): Validade desta entrada (padrão: ttl_s do cache)
+        """
+        agora = time.time()
+        expira_em = agora + (ttl_s if ttl_s is not None else self.ttl_s)
+        self._guardar_memoria(chave, resposta, expira_em)
+
+        with self._conexao() as conn:
+            conn.execute(
+                """
+                INSERT INTO respostas (chave, provider, modelo, resposta, criado_em, expira_em, acessado_em)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(chave) DO UPDATE SET
+                    resposta = excluded.resposta, criado_em = excluded.criado_em,
+                    expira_em = excluded.expira_em, acessado_em = excluded.acessado_em
+                """,
+                (chave, provider, modelo, resposta, agora, expira_em, agora),
+            )
+        self._contar("gravacoes")
+
+        with self._trava:
+            self._gravacoes_desde_limpeza += 1
+            limpar = self._gravacoes_desde_limpeza >= INTERVALO_LIMPEZA
+            if limpar:
+                self._gravacoes_desde_limpeza = 0
+        if limpar:
+            self.limpar()
+
+    def limpar(self) -> int:
+        """
+        Remove do disco as entradas expiradas e, acima do limite, as menos acessadas.
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        with self._conexao() as conn:
+            removidas = conn.execute("DELETE FROM respostas WHERE expira_em <= ?", (time.time(),)).rowcount
+            excedente = conn.execute("SELECT COUNT(*) FROM respostas").fetchone()[0] - self.max_entradas
+            if excedente > 0:
+                removidas += conn.execute(
+                    "DELETE FROM respostas WHERE chave IN "
+                    "(SELECT chave FROM respostas ORDER BY acessado_em LIMIT ?)",
+                    (excedente,),
+                ).rowcount
+
+        if removidas:
+            self._contar("removidas", removidas)
+            logger.info(f"🧹 Cache de respostas: {removidas} entradas removidas")
+        return removidas
+
+    def invalidar(self):
+        """Esvazia as duas camadas."""
+        with self._trava:
+            self._memoria.clear()
+        with self._conexao() as conn:
+            conn.execute("DELETE FROM respostas")
+
+    def metricas(self) -> Dict:
+        """
+        Contadores de acertos/erros deste processo e tamanho das camadas.
+
+        Returns:
+            dict: hits_memoria, hits_disco, misses, gravacoes, removidas,
+                taxa_acerto, entradas_memoria, entradas_disco
+        """
+        with self._trava:
+            metricas = dict(self._metricas)
+            metricas["entradas_memoria"] = len(self._memoria)
+        with self._conexao() as conn:
+            metricas["entradas_disco"] = conn.execute("SELECT COUNT(*) FROM respostas").fetchone()[0]
+
+        consultas = metricas["hits_memoria"] + metricas["hits_disco"] + metricas["misses"]
+        metricas["taxa_acerto"] = round((metricas["hits_memoria"] + metricas["hits_disco"]) / consultas, 3) if consultas else 0.0
+        return metricas
+
+
+def obter_cache_respostas() -> CacheRespostas:
+    """Cache de respostas único do processo."""
+    return obter_recurso("cache_respostas", CacheRespostas)
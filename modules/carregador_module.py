@@ -0,0 +1,117 @@
+"""
+Módulo de Carregamento Sob Demanda (carregador_module.py)
+
+Registro de módulos de backend carregados apenas quando a página que os usa
+é aberta pela primeira vez. O garimpo puxa selenium, webdriver_manager e
+pandas; os módulos de IA puxam os SDKs dos provedores. A página inicial não
+precisa de nada disso, então importar tudo no topo do app.py só atrasa a
+primeira renderização.
+
+Cada importação é cronometrada e os pacotes carregados por ela ficam
+registrados, como um `python -X importtime` resumido, para exibição no app.
+"""
+
+import sys
+import time
+import logging
+import importlib
+import threading
+from typing import Any, Dict, List
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class RegistroModulos:
+    """
+    Registro de módulos de backend com importação preguiçosa e instrumentada.
+    """
+
+    def __init__(self):
+        self._caminhos: Dict[str, str] = {}
+        self._carregados: Dict[str, Any] = {}
+        self._metricas: List[Dict] = []
+        self._trava = threading.Lock()
+
+    def registrar(self, nome: str, caminho_modulo: str):
+        """
+        Registra um módulo sem importá-lo.
+
+        Args:
+            nome (str): Nome curto usado pelas páginas (ex.: "garimpo")
+            caminho_modulo (str): Caminho de importação (ex.: "modules.garimpo_module_v2")
+        """
+        self._caminhos[nome] = caminho_modulo
+
+    def carregar(self, nome: str):
+        """
+        Importa o módulo na primeira chamada e o reaproveita nas seguintes.
+
+        Returns:
+            module: O módulo importado
+
+        Raises:
+            ImportError: Se o módulo ou alguma dependência não puder ser importado
+        """
+        modulo = self._carregados.get(nome)
+        if modulo is not None:
+            return modulo
+
+        with self._trava:
+            modulo = self._carregados.get(nome)
+            if modulo is not None:
+                return modulo
+
+            caminho = self._caminhos[nome]
+            antes = set(sys.modules)
+            inicio = time.perf_counter()
+            modulo = importlib.import_module(caminho)
+            duracao_ms = (time.perf_counter() - inicio) * 1000
+
+            novos = set(sys.modules) - antes
+            pacotes = sorted({m.split(".")[0] for m in novos} - {caminho.split(".")[0]})
+            self._metricas.append({
+                "modulo": nome,
+                "caminho": caminho,
+                "tempo_ms": round(duracao_ms, 1),
+                "novos_modulos": len(novos),
+                "pacotes": ", ".join(pacotes[:8]) + ("..." if len(pacotes) > 8 else ""),
+            })
+            self._carregados[nome] = modulo
+            logger.info(f"📦 Módulo '{nome}' carregado em {duracao_ms:.0f} ms ({len(novos)} módulos novos)")
+            return modulo
+
+    def obter(self, nome: str, *atributos: str):
+        """
+        Carrega o módulo e retorna um ou mais atributos dele.
+
+        Returns:
+            O atributo (ou tupla de atributos, se mais de um for pedido)
+        """
+        modulo = self.carregar(nome)
+        valores = tuple(getattr(modulo, atributo) for atributo in atributos)
+        return valores[0] if len(valores) == 1 else valores
+
+    def carregado(self, nome: str) -> bool:
+        """Indica se o módulo já foi importado."""
+        return nome in self._carregados
+
+    def metricas_importacao(self) -> List[Dict]:
+        """Tempo de importação de cada módulo já carregado, na ordem de carga."""
+        return list(self._metricas)
+
+
+# Registro único do processo (os módulos importados também são globais)
+registro_modulos = RegistroModulos()
+registro_modulos.registrar("garimpo", "modules.garimpo_module_v2")
+registro_modulos.registrar("copy", "modules.copy_module")
+registro_modulos.registrar("entregaveis", "modules.entregaveis_module")
+registro_modulos.registrar("armazem", "modules.armazem_module")
+registro_modulos.registrar("jobs", "modules.jobs_module")
+registro_modulos.registrar("cache_respostas", "modules.cache_respostas_module")
+registro_modulos.registrar("limites", "modules.limites_module")
+registro_modulos.registrar("roteador", "modules.roteador_module")
+registro_modulos.registrar("coalescencia", "modules.coalescencia_module")
+registro_modulos.registrar("prompts", "modules.prompts_module")
+registro_modulos.registrar("historico", "modules.historico_module")
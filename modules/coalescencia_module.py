@@ -0,0 +1,354 @@
+"""
+Módulo de Coalescência de Pedidos (coalescencia_module.py)
+
+Quando várias sessões do Streamlit, workers de lote ou chamadas da API
+pedem o mesmo prompt ao mesmo tempo, só uma chamada vai ao provedor e as
+demais esperam a mesma resposta ("single-flight"). A chave é a mesma do
+cache de respostas (chave_resposta), então só pedidos com cache ligado são
+coalescidos: quem desliga o cache quer uma resposta nova.
+
+São dois níveis:
+- no processo: todos os pedidos passam pelo loop do motor de geração, então
+  as duplicatas aguardam o mesmo asyncio.Future do primeiro pedido, venham
+  de qualquer thread;
+- entre processos: uma tabela de travas em SQLite (data/voos.db) indica qual
+  processo está gerando cada chave. Os outros consultam o cache de respostas
+  até a resposta aparecer ou a trava sumir (falha do dono) ou expirar
+  (processo morto), e aí tentam de novo.
+
+Só respostas bem-sucedidas são compartilhadas entre credenciais diferentes:
+se o pedido líder falhar, quem esperava com outra chave de API (que pode ser
+válida) tenta de novo por conta própria em vez de herdar o erro do líder.
+
+Streams (a geração de copy e entregáveis na interface) passam por
+transmitir(): no processo, um único stream do provedor é lido numa thread e
+cada sessão recebe todos os trechos desde o início; ele é fechado quando o
+último leitor desiste. Entre processos vale a mesma trava: quem chega depois
+espera a resposta completa no cache e a recebe de uma vez.
+"""
+
+import os
+import time
+import uuid
+import sqlite3
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from modules.cache_module import obter_recurso
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CAMINHO_VOOS = os.path.join("data", "voos.db")
+
+# Validade da trava: maior que o timeout de uma chamada ao provedor, para não
+# haver dois donos; passado esse tempo o dono é considerado morto
+VALIDADE_TRAVA_S = 300.0
+INTERVALO_CONSULTA_S = 0.25
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS voos (
+    chave TEXT PRIMARY KEY,
+    dono TEXT NOT NULL,
+    iniciado_em REAL NOT NULL,
+    expira_em REAL NOT NULL
+);
+"""
+
+
+class _Transmissao:
+    """Um stream do provedor em andamento, lido por uma ou mais sessões."""
+
+    def __init__(self, credencial: Optional[str]):
+        self.credencial = credencial
+        self.trechos: List[str] = []
+        self.concluida = False
+        self.erro: Optional[Exception] = None
+        self.leitores = 0
+        self.abandonada = threading.Event()
+        self.condicao = threading.Condition()
+
+    def publicar(self, trecho: str):
+        with self.condicao:
+            self.trechos.append(trecho)
+            self.condicao.notify_all()
+
+    def encerrar(self, erro: Optional[Exception] = None):
+        with self.condicao:
+            self.erro = erro
+            self.concluida = True
+            self.condicao.notify_all()
+
+
+class CoordenadorVoos:
+    """
+    Pedidos idênticos em andamento, no processo e entre processos.
+    """
+
+    def __init__(self, caminho: str = CAMINHO_VOOS, validade_trava_s: float = VALIDADE_TRAVA_S):
+        """
+        Args:
+            caminho (str): Arquivo SQLite da tabela de travas
+            validade_trava_s (float): Tempo até uma trava abandonada poder ser tomada
+        """
+        self.caminho = caminho
+        self.validade_trava_s = validade_trava_s
+        self._dono = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._em_voo: Dict[str, Tuple[asyncio.Future, Optional[str]]] = {}
+        self._transmissoes: Dict[str, _Transmissao] = {}
+        self._trava = threading.Lock()
+        self._trava_transmissoes = threading.Lock()
+        self._metricas = {"lideradas": 0, "coalescidas_processo": 0, "coalescidas_externas": 0}
+
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with self._conexao() as conn:
+            conn.executescript(ESQUEMA)
+            # Travas deste ou de outros processos que morreram sem liberar
+            conn.execute("DELETE FROM voos WHERE expira_em <= ?", (time.time(),))
+
+    @contextmanager
+    def _conexao(self):
+        conn = sqlite3.connect(self.caminho, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _contar(self, metrica: str):
+        with self._trava:
+            self._metricas[metrica] += 1
+
+    def _adquirir(self, chave: str) -> bool:
+        """Tenta virar o dono da chave entre os processos."""
+        agora = time.time()
+        with self._conexao() as conn:
+            conn.execute("DELETE FROM voos WHERE chave = ? AND expira_em <= ?", (chave, agora))
+            return conn.execute(
+                "INSERT OR IGNORE INTO voos VALUES (?, ?, ?, ?)",
+                (chave, self._dono, agora, agora + self.validade_trava_s),
+            ).rowcount == 1
+
+    def _liberar(self, chave: str):
+        with self._conexao() as conn:
+            conn.execute("DELETE FROM voos WHERE chave = ? AND dono = ?", (chave, self._dono))
+
+    def _em_voo_externo(self, chave: str) -> bool:
+        with self._conexao() as conn:
+            return conn.execute(
+                "SELECT 1 FROM voos WHERE chave = ? AND expira_em > ?", (chave, time.time())
+            ).fetchone() is not None
+
+    async def executar(self, chave: str, gerar: Callable[[], Awaitable[str]],
+                       consultar: Callable[[], Optional[str]], credencial: Optional[str] = None) -> str:
+        """
+        Executa gerar() uma vez por chave, mesmo com pedidos simultâneos.
+
+        Deve ser chamado no loop do motor de geração.
+
+        Args:
+            chave (str): Impressão digital do pedido (chave do cache de respostas)
+            gerar (callable): Corrotina que chama o provedor e grava a resposta no cache
+            consultar (callable): Leitura síncrona do cache de respostas para a chave
+            credencial (str): Impressão digital das chaves de API do pedido; o erro
+                do líder só é repassado a quem usa a mesma credencial
+
+        Returns:
+            str: A resposta, gerada aqui ou pelo pedido que já estava em andamento
+        """
+        while True:
+            voo = self._em_voo.get(chave)
+            if voo is None:
+                break
+            futuro, credencial_lider = voo
+            self._contar("coalescidas_processo")
+            try:
+                # shield: cancelar quem espera não cancela o pedido dos outros
+                return await asyncio.shield(futuro)
+            except asyncio.CancelledError:
+                if not futuro.cancelled():
+                    raise
+                # O pedido original foi cancelado; quem esperava tenta de novo
+            except Exception:
+                if credencial_lider == credencial:
+                    raise
+                # Falhou com a credencial do líder (ex.: chave inválida); a nossa pode funcionar
+                logger.info("🛬 Pedido idêntico falhou com outra credencial; tentando com a desta sessão")
+
+        futuro = asyncio.get_running_loop().create_future()
+        self._em_voo[chave] = (futuro, credencial)
+        try:
+            resposta = await self._liderar(chave, gerar, consultar)
+        except asyncio.CancelledError:
+            futuro.cancel()
+            raise
+        except Exception as e:
+            futuro.set_exception(e)
+            futuro.exception()  # evita o aviso de exceção não lida quando ninguém esperava
+            raise
+        finally:
+            del self._em_voo[chave]
+        futuro.set_result(resposta)
+        return resposta
+
+    async def _liderar(self, chave: str, gerar: Callable[[], Awaitable[str]],
+                       consultar: Callable[[], Optional[str]]) -> str:
+        esperou = False
+        while True:
+            if await asyncio.to_thread(self._adquirir, chave):
+                # Outro processo pode ter terminado entre a consulta ao cache e a trava
+                resposta = await asyncio.to_thread(consultar) if esperou else None
+                if resposta is not None:
+                    await asyncio.to_thread(self._liberar, chave)
+                    return resposta
+                self._contar("lideradas")
+                try:
+                    return await gerar()
+                finally:
+                    await asyncio.to_thread(self._liberar, chave)
+
+            if not esperou:
+                esperou = True
+                self._contar("coalescidas_externas")
+                logger.info("🛬 Pedido idêntico em andamento em outro processo; aguardando a resposta")
+            while await asyncio.to_thread(self._em_voo_externo, chave):
+                await asyncio.sleep(INTERVALO_CONSULTA_S)
+                resposta = await asyncio.to_thread(consultar)
+                if resposta is not None:
+                    return resposta
+            resposta = await asyncio.to_thread(consultar)
+            if resposta is not None:
+                return resposta
+            # O dono falhou ou morreu sem resposta: tenta assumir
+
+    def transmitir(self, chave: str, abrir: Callable[[], Iterable[str]], gravar: Callable[[str], None],
+                   consultar: Callable[[], Optional[str]], credencial: Optional[str] = None) -> Iterator[str]:
+        """
+        Stream de abrir() compartilhado por todos os pedidos simultâneos da chave.
+
+        Cada leitor recebe todos os trechos desde o início, no seu ritmo. O
+        stream do provedor é fechado (sem gravar no cache) quando o último
+        leitor para de consumir.
+
+        Args:
+            chave (str): Impressão digital do pedido (chave do cache de respostas)
+            abrir (callable): Abre o stream do provedor
+            gravar (callable): Grava a resposta completa no cache de respostas
+            consultar (callable): Leitura do cache de respostas para a chave
+            credencial (str): Impressão digital das chaves de API do pedido; o erro
+                do stream só é repassado a quem usa a mesma credencial
+
+        Yields:
+            str: Trechos da resposta
+        """
+        while True:
+            with self._trava_transmissoes:
+                transmissao = self._transmissoes.get(chave)
+                # Uma transmissão sem leitores está fechando o stream e não recebe mais trechos
+                lider = transmissao is None or transmissao.abandonada.is_set()
+                if lider:
+                    transmissao = self._transmissoes[chave] = _Transmissao(credencial)
+                transmissao.leitores += 1
+            if lider:
+                threading.Thread(target=self._produzir, args=(chave, transmissao, abrir, gravar, consultar),
+                                 name="transmissao", daemon=True).start()
+            else:
+                self._contar("coalescidas_processo")
+
+            entregues = 0
+            try:
+                while True:
+                    with transmissao.condicao:
+                        while entregues == len(transmissao.trechos) and not transmissao.concluida:
+                            transmissao.condicao.wait()
+                        novos = transmissao.trechos[entregues:]
+                        concluida = transmissao.concluida
+                    for trecho in novos:
+                        yield trecho
+                    entregues += len(novos)
+                    if concluida and entregues == len(transmissao.trechos):
+                        break
+            finally:
+                with self._trava_transmissoes:
+                    transmissao.leitores -= 1
+                    if transmissao.leitores == 0:
+                        transmissao.abandonada.set()
+
+            if transmissao.erro is None:
+                return
+            if lider or entregues or transmissao.credencial == credencial:
+                raise transmissao.erro
+            # Falhou com a credencial do líder antes de qualquer trecho; a nossa pode funcionar
+            logger.info("🛬 Stream idêntico falhou com outra credencial; tentando com a desta sessão")
+
+    def _produzir(self, chave: str, transmissao: _Transmissao, abrir: Callable[[], Iterable[str]],
+                  gravar: Callable[[str], None], consultar: Callable[[], Optional[str]]):
+        """Lê o stream do provedor (ou a resposta de outro processo) para os leitores da transmissão."""
+        erro = None
+        try:
+            esperou = False
+            while not self._adquirir(chave):
+                if not esperou:
+                    esperou = True
+                    self._contar("coalescidas_externas")
+                    logger.info("🛬 Stream idêntico em andamento em outro processo; aguardando a resposta")
+                while self._em_voo_externo(chave) and not transmissao.abandonada.is_set():
+                    time.sleep(INTERVALO_CONSULTA_S)
+                    resposta = consultar()
+                    if resposta is not None:
+                        transmissao.publicar(resposta)
+                        return
+                if transmissao.abandonada.is_set():
+                    return
+                # O dono falhou ou morreu sem resposta: tenta assumir
+
+            try:
+                # Um stream igual pode ter terminado entre a consulta do leitor e a trava
+                resposta = consultar()
+                if resposta is not None:
+                    transmissao.publicar(resposta)
+                    return
+                self._contar("lideradas")
+                iterador = iter(abrir())
+                try:
+                    for trecho in iterador:
+                        if transmissao.abandonada.is_set():
+                            return
+                        transmissao.publicar(trecho)
+                finally:
+                    fechar = getattr(iterador, "close", None)
+                    if fechar:
+                        fechar()
+                if transmissao.trechos:
+                    gravar("".join(transmissao.trechos))
+            finally:
+                self._liberar(chave)
+        except Exception as e:
+            erro = e
+        finally:
+            # Sai do mapa antes de acordar os leitores: pedidos novos abrem outra transmissão
+            with self._trava_transmissoes:
+                if self._transmissoes.get(chave) is transmissao:
+                    del self._transmissoes[chave]
+            transmissao.encerrar(erro)
+
+    def metricas(self) -> Dict:
+        """
+        Returns:
+            dict: lideradas (chamadas feitas), coalescidas_processo,
+                coalescidas_externas e em_voo (chaves em andamento neste processo)
+        """
+        with self._trava:
+            metricas = dict(self._metricas)
+        metricas["em_voo"] = len(self._em_voo) + len(self._transmissoes)
+        return metricas
+
+
+def obter_coordenador_voos() -> CoordenadorVoos:
+    """Coordenador de pedidos em andamento único do processo."""
+    return obter_recurso("coordenador_voos", CoordenadorVoos)
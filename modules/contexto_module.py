@@ -0,0 +1,95 @@
+"""
+Módulo de Contexto de Sessão (contexto_module.py)
+
+Credenciais, provedor e configurações de uma sessão de usuário, passados
+explicitamente para CerebroCopy, CriadorEntregaveis e GarimpadorOfertas.
+
+Antes as chaves eram gravadas em os.environ, que é global ao processo: duas
+sessões do Streamlit sobrescreviam as credenciais uma da outra. Com um
+contexto por sessão, um único processo atende vários usuários ao mesmo tempo.
+As variáveis de ambiente (.env) continuam valendo como valores padrão.
+"""
+
+import os
+from typing import Dict, Optional
+
+# Campos sensíveis: nunca aparecem em repr() nem em para_dict()
+CAMPOS_SECRETOS = (
+    "openai_api_key", "google_api_key",
+    "clickbank_username", "clickbank_password",
+    "hotmart_email", "hotmart_password",
+)
+
+# Variável de ambiente usada como padrão para cada campo
+VARIAVEIS_AMBIENTE = {
+    "openai_api_key": "OPENAI_API_KEY",
+    "google_api_key": "GOOGLE_API_KEY",
+    "clickbank_username": "CLICKBANK_USERNAME",
+    "clickbank_password": "CLICKBANK_PASSWORD",
+    "hotmart_email": "HOTMART_EMAIL",
+    "hotmart_password": "HOTMART_PASSWORD",
+}
+
+
+class ContextoSessao:
+    """
+    Credenciais e configurações de uma sessão, sem estado global.
+    """
+
+    def __init__(self, openai_api_key: Optional[str] = None, google_api_key: Optional[str] = None,
+                 clickbank_username: Optional[str] = None, clickbank_password: Optional[str] = None,
+                 hotmart_email: Optional[str] = None, hotmart_password: Optional[str] = None,
+                 provider: str = "manus", temperature: float = 0.7, hedge: bool = False):
+        """
+        Inicializa o contexto.
+
+        Args:
+            openai_api_key (str): Chave da OpenAI
+            google_api_key (str): Chave do Google Gemini
+            clickbank_username (str): Usuário do ClickBank
+            clickbank_password (str): Senha do ClickBank
+            hotmart_email (str): Email do Hotmart
+            hotmart_password (str): Senha do Hotmart
+            provider (str): Provedor de IA padrão ("manus", "openai", "gemini" ou "auto")
+            temperature (float): Temperatura padrão para geração
+            hedge (bool): No provedor "auto", disparar um pedido de reserva quando o primeiro demorar
+        """
+        self.openai_api_key = openai_api_key
+        self.google_api_key = google_api_key
+        self.clickbank_username = clickbank_username
+        self.clickbank_password = clickbank_password
+        self.hotmart_email = hotmart_email
+        self.hotmart_password = hotmart_password
+        self.provider = provider
+        self.temperature = temperature
+        self.hedge = hedge
+
+    @classmethod
+    def do_ambiente(cls, **valores) -> "ContextoSessao":
+        """
+        Cria um contexto com os padrões das variáveis de ambiente (.env).
+
+        Valores informados (não vazios) têm prioridade sobre o ambiente.
+        """
+        padroes = {campo: os.getenv(variavel) for campo, variavel in VARIAVEIS_AMBIENTE.items()}
+        padroes.update({campo: valor for campo, valor in valores.items() if valor not in (None, "")})
+        return cls(**padroes)
+
+    def com(self, **alteracoes) -> "ContextoSessao":
+        """Retorna uma cópia do contexto com os campos alterados (ignora valores vazios)."""
+        valores = {**vars(self)}
+        valores.update({campo: valor for campo, valor in alteracoes.items() if valor not in (None, "")})
+        return ContextoSessao(**valores)
+
+    def chave_api(self, provider: str) -> Optional[str]:
+        """Chave de API do provedor informado (None para "manus" ou se ausente)."""
+        return {"openai": self.openai_api_key, "gemini": self.google_api_key}.get(provider)
+
+    def para_dict(self) -> Dict:
+        """Configurações não sensíveis, com os segredos indicados apenas como presentes/ausentes."""
+        dados = {campo: valor for campo, valor in vars(self).items() if campo not in CAMPOS_SECRETOS}
+        dados.update({f"tem_{campo}": bool(getattr(self, campo)) for campo in CAMPOS_SECRETOS})
+        return dados
+
+    def __repr__(self):
+        return f"ContextoSessao({self.para_dict()})"
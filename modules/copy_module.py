@@ -4,107 +4,434 @@ Módulo 2: O Cérebro de Copy (copy_module.py)
 Este módulo utiliza IA para criar e otimizar copies de alta conversão,
 baseado nos princípios dos mestres do copywriting como Alex Hormozi,
 Russell Brunson, Jon Benson e Dan S. Kennedy.
+
+A copy gerada tem seções fixas (hooks, corpo, CTA e análise). Cada copy
+gerada por um provedor de IA (não pelo fallback dos templates) é separada
+nessas seções (CopyEstruturada) e as seções ficam no cache de respostas,
+então é possível pedir só novos hooks ou só uma nova CTA com um prompt
+curto, reaproveitando o resto da copy.
 """
 
 import os
+import re
+import hashlib
 import logging
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
+from modules.cache_module import chave_segura
+from modules.coalescencia_module import obter_coordenador_voos
+from modules.contexto_module import ContextoSessao
+from modules.llm_module import obter_cliente_llm
+from modules.cache_respostas_module import obter_cache_respostas, chave_resposta
+from modules.motor_geracao_module import PedidoGeracao, obter_motor
+from modules.roteador_module import PROVEDOR_AUTO, gerar_stream_auto, provedores_disponiveis
+from modules.limites_module import estimar_tokens
+from modules.templates_module import obter_motor_templates
+from modules.prompts_module import dividir_prompt, montar_prompt
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Copies acima deste tamanho (tokens estimados) são otimizadas em trechos paralelos
+LIMITE_TOKENS_TRECHO = int(os.getenv("COPY_LIMITE_TOKENS_TRECHO", "1200"))
+
+# Início de seção em VSLs e cartas de vendas: títulos markdown, separadores,
+# marcações de cena/tempo e linhas curtas em maiúsculas ("O PROBLEMA:")
+PADRAO_SECAO = re.compile(
+    r"^\s*(#{1,6}\s|-{3,}|\*{3,}|\[(CENA|CORTE|TEMPO|\d{1,2}:\d{2})|\(\d{1,2}:\d{2}|[A-ZÀ-Ú0-9][A-ZÀ-Ú0-9 ,!?:\-]{2,60}$)"
+)
+
+# Instruções fixas do prompt de modelagem: sem interpolação, para o cache de prompt do provedor
+PREFIXO_PROMPT_COPY = """
+Você é um copywriter de elite que modela copies de alta conversão. Seu trabalho é pegar a copy do usuário (enviada depois destas instruções, com o nicho e o público-alvo, se houver) e otimizá-la com base nos seguintes princípios dos mestres:
+
+**Alex Hormozi (Ofertas Irresistíveis):**
+- Crie escassez genuína e urgência ética
+- Empilhe valor com bônus estratégicos
+- Use garantias que eliminam o risco
+- Foque no valor percebido vs. preço
+
+**Russell Brunson (Funis e Storytelling):**
+- Aplique a jornada do herói na narrativa
+- Use histórias que criam conexão emocional
+- Implemente a estrutura Problema-Agitação-Solução
+- Crie curiosidade que mantém a atenção
+
+**Jon Benson (Video Copywriting):**
+- Torne a copy mais fluida e conversacional
+- Use transições suaves entre seções
+- Aplique o conceito de "edutainment"
+- Mantenha o ritmo envolvente
+
+**Dan S. Kennedy (Headlines e Persuasão):**
+- Crie headlines magnéticas que param o scroll
+- Use bullets que geram curiosidade intensa
+- Aplique gatilhos psicológicos poderosos
+- Foque em benefícios específicos e tangíveis
+
+**Eugene Schwartz (Níveis de Consciência):**
+- Identifique o nível de consciência da audiência
+- Adapte a linguagem ao estágio do prospect
+- Use a fórmula AIDA de forma sofisticada
+
+Gere a resposta EXATAMENTE com o seguinte formato, sem textos adicionais:
+
+## 🎯 HOOKS OTIMIZADOS
+
+1. **Hook de Curiosidade:** [Hook focado em despertar curiosidade]
+2. **Hook de Benefício:** [Hook focado no principal benefício]
+3. **Hook de Urgência:** [Hook focado em urgência/escassez]
+4. **Hook de Prova Social:** [Hook focado em resultados/depoimentos]
+5. **Hook de Transformação:** [Hook focado na transformação prometida]
+
+## 📝 CORPO OTIMIZADO
+
+[Corpo da copy completamente reescrito e otimizado, aplicando todos os princípios mencionados. Deve ter pelo menos 300 palavras e incluir storytelling, quebra de objeções, empilhamento de valor e transições suaves.]
+
+## 🚀 NOVA CHAMADA PARA AÇÃO
+
+[Chamada para ação poderosa e específica, com urgência e clareza sobre o próximo passo]
+
+## 📊 ANÁLISE DA OTIMIZAÇÃO
+
+**Principais melhorias aplicadas:**
+- [Lista das principais otimizações realizadas]
+- [Princípios específicos utilizados]
+- [Gatilhos psicológicos implementados]
+"""
+
+
+# Fronteiras de corte de um bloco grande, da preferida à última opção
+NIVEIS_CORTE = (r"(?<=[.!?…])\s+", r"\s*\n\s*", r"\s+")
+
+
+def _dividir_bloco_grande(bloco: str, limite_tokens: int, nivel: int = 0) -> List[str]:
+    """
+    Divide um bloco maior que o limite nas fronteiras de frase.
+
+    Uma frase que sozinha passa do limite (roteiro sem pontuação, uma batida
+    por linha) é dividida entre linhas e, se ainda assim não couber, entre
+    palavras; os separadores originais são mantidos dentro de cada parte.
+    """
+    if nivel == len(NIVEIS_CORTE):
+        # Uma "palavra" maior que o limite: só resta cortar por caracteres
+        passo = max(1, int(limite_tokens * 3.5))
+        return [bloco[i:i + passo] for i in range(0, len(bloco), passo)]
+
+    pecas = re.split(f"({NIVEIS_CORTE[nivel]})", bloco)
+    partes, atual = [], ""
+    for i in range(0, len(pecas), 2):
+        texto, separador = pecas[i], pecas[i - 1] if i else ""
+        if estimar_tokens(texto) > limite_tokens:
+            if atual:
+                partes.append(atual)
+                atual = ""
+            partes.extend(_dividir_bloco_grande(texto, limite_tokens, nivel + 1))
+        elif atual and estimar_tokens(atual + separador + texto) > limite_tokens:
+            partes.append(atual)
+            atual = texto
+        else:
+            atual = atual + separador + texto if atual else texto
+    if atual:
+        partes.append(atual)
+    return [parte for parte in partes if parte.strip()]
+
+
+def dividir_copy(copy_original: str, limite_tokens: int = LIMITE_TOKENS_TRECHO) -> List[str]:
+    """
+    Divide uma copy longa em trechos de até `limite_tokens` tokens estimados.
+    
+    Os cortes caem em fronteiras de seção (títulos, marcações de cena, linhas
+    em maiúsculas) sempre que o trecho atual já passou da metade do limite;
+    senão, em fronteiras de parágrafo. Só um parágrafo maior que o limite
+    inteiro é cortado no meio, entre frases (ou entre linhas e palavras,
+    se não houver pontuação).
+    
+    Returns:
+        list: Trechos na ordem original (um só se a copy couber no limite)
+    """
+    if estimar_tokens(copy_original) <= limite_tokens:
+        return [copy_original]
+    
+    blocos = []
+    for bloco in re.split(r"\n\s*\n", copy_original.strip()):
+        if estimar_tokens(bloco) > limite_tokens:
+            blocos.extend(_dividir_bloco_grande(bloco, limite_tokens))
+        elif bloco.strip():
+            blocos.append(bloco)
+    
+    trechos, atual = [], []
+    for bloco in blocos:
+        tamanho_atual = estimar_tokens("\n\n".join(atual))
+        inicia_secao = bool(PADRAO_SECAO.match(bloco.strip().splitlines()[0]))
+        if atual and (tamanho_atual + estimar_tokens(bloco) > limite_tokens
+                      or (inicia_secao and tamanho_atual > limite_tokens / 2)):
+            trechos.append("\n\n".join(atual))
+            atual = []
+        atual.append(bloco)
+    if atual:
+        trechos.append("\n\n".join(atual))
+    return trechos
+
+
+# Seções da copy, na ordem do documento, com o título usado ao remontá-la
+SECOES_COPY = {
+    "hooks": "## 🎯 HOOKS OTIMIZADOS",
+    "corpo": "## 📝 CORPO OTIMIZADO",
+    "cta": "## 🚀 NOVA CHAMADA PARA AÇÃO",
+    "analise": "## 📊 ANÁLISE DA OTIMIZAÇÃO",
+}
+SECOES_REGENERAVEIS = ("hooks", "cta")
+
+# Palavras-chave dos títulos de seção (os da Manus AI são diferentes dos do prompt)
+PADROES_TITULO_SECAO = {
+    "hooks": re.compile(r"HOOK", re.IGNORECASE),
+    "corpo": re.compile(r"CORPO", re.IGNORECASE),
+    "cta": re.compile(r"CHAMADA|\bCTA\b", re.IGNORECASE),
+    "analise": re.compile(r"AN[ÁA]LISE|ELEMENTOS APLICADOS", re.IGNORECASE),
+}
+
+
+class RespostaFallback(str):
+    """
+    Texto dos templates offline entregue no lugar de um provedor que falhou.
+    
+    Continua sendo uma str para quem só exibe o resultado; o cache de seções
+    (e o histórico) verificam o tipo para não gravá-lo em nome do provedor.
+    """
+
+
+class CopyEstruturada:
+    """
+    Copy separada nas seções do formato de resposta (ver SECOES_COPY).
+    """
+    
+    def __init__(self, hooks: str = "", corpo: str = "", cta: str = "", analise: str = ""):
+        self.hooks = hooks
+        self.corpo = corpo
+        self.cta = cta
+        self.analise = analise
+    
+    @classmethod
+    def de_markdown(cls, texto: str) -> "CopyEstruturada":
+        """
+        Separa a resposta do provedor nos títulos de nível 2 ("## ...").
+        
+        Títulos sem seção conhecida continuam dentro da seção anterior; se
+        nenhum título for reconhecido, o texto inteiro vira o corpo.
+        """
+        secoes: Dict[str, List[str]] = {}
+        atual = None
+        for linha in texto.strip().splitlines():
+            if linha.startswith("## "):
+                nome = next((n for n, padrao in PADROES_TITULO_SECAO.items() if padrao.search(linha)), None)
+                if nome and nome not in secoes:
+                    atual = nome
+                    secoes[atual] = []
+                    continue
+            if atual:
+                secoes[atual].append(linha)
+        
+        if not secoes:
+            return cls(corpo=texto.strip())
+        # Separadores "---" entre seções pertencem à formatação, não ao conteúdo
+        return cls(**{
+            nome: re.sub(r"(\n\s*-{3,}\s*)+$", "", "\n".join(linhas).strip()).strip()
+            for nome, linhas in secoes.items()
+        })
+    
+    def secao(self, nome: str) -> str:
+        return getattr(self, nome)
+    
+    def com_secao(self, nome: str, texto: str) -> "CopyEstruturada":
+        """Cópia com uma seção substituída."""
+        return CopyEstruturada(**{**self.para_dict(), nome: texto})
+    
+    def para_dict(self) -> Dict[str, str]:
+        return {nome: self.secao(nome) for nome in SECOES_COPY}
+    
+    def para_markdown(self) -> str:
+        """Remonta a copy com os títulos padrão, omitindo seções vazias."""
+        return "\n\n".join(
+            f"{titulo}\n\n{self.secao(nome)}" for nome, titulo in SECOES_COPY.items() if self.secao(nome)
+        )
+    
+    def __repr__(self):
+        return f"CopyEstruturada({', '.join(f'{n}={len(self.secao(n))}' for n in SECOES_COPY)})"
+
+
 class CerebroCopy:
     """
     Classe principal para geração e otimização de copies usando IA.
     """
     
-    def __init__(self, provider="manus", temperature=0.7):
+    def __init__(self, provider="manus", temperature=0.7, contexto=None, usar_cache=True):
         """
         Inicializa o cérebro de copy.
         
         Args:
-            provider (str): Provedor de IA ("manus", "openai" ou "gemini")
+            provider (str): Provedor de IA ("manus", "openai", "gemini" ou "auto")
             temperature (float): Temperatura para geração (0.0 a 1.0)
+            contexto (ContextoSessao): Credenciais da sessão (padrão: variáveis de ambiente)
+            usar_cache (bool): Reaproveitar respostas em cache para prompts idênticos
         """
+        self.contexto = contexto or ContextoSessao.do_ambiente()
         self.provider = provider
         self.temperature = temperature
+        self.usar_cache = usar_cache
         self.llm = None
-        if provider != "manus":
+        # Os templates offline também servem de fallback, então são compilados já aqui
+        self.templates = obter_motor_templates()
+        if provider not in ("manus", PROVEDOR_AUTO):
             self._configurar_llm()
     
     def _configurar_llm(self):
         """
-        Configura o modelo de linguagem baseado no provedor escolhido.
+        Obtém o cliente compartilhado do provedor escolhido (ver llm_module).
         """
         try:
-            if self.provider == "openai":
-                from openai import OpenAI
-                api_key = os.getenv("OPENAI_API_KEY")
-                if not api_key:
-                    raise ValueError("OPENAI_API_KEY não encontrada nas variáveis de ambiente")
-                
-                # Usar API oficial do OpenAI
-                self.llm = OpenAI(
-                    api_key=api_key,
-                    base_url="https://api.openai.com/v1"  # API oficial
-                )
-                logger.info("OpenAI configurado com sucesso")
-                
-            elif self.provider == "gemini":
-                import google.generativeai as genai
-                api_key = os.getenv("GOOGLE_API_KEY")
-                if not api_key:
-                    raise ValueError("GOOGLE_API_KEY não encontrada nas variáveis de ambiente")
-                genai.configure(api_key=api_key)
-                self.llm = genai.GenerativeModel('gemini-1.5-flash')  # Modelo mais recente
-                logger.info("Gemini configurado com sucesso")
-                
+            self.llm = obter_cliente_llm(self.provider, self.contexto)
+            logger.info(f"{self.provider} configurado com sucesso ({self.llm.modelo})")
         except Exception as e:
             logger.error(f"Erro ao configurar LLM: {e}")
             raise
     
+    def _chave_cache(self, prompt: str) -> Optional[str]:
+        """Chave do cache de respostas para o prompt (None se o cache estiver desligado)."""
+        if not self.usar_cache:
+            return None
+        modelo = self.llm.modelo if self.llm else PROVEDOR_AUTO
+        return chave_resposta(prompt, self.provider, modelo, self.temperature)
+    
+    def _pedido(self, prompt: str) -> PedidoGeracao:
+        """Pedido ao motor de geração com as opções desta instância."""
+        return PedidoGeracao(prompt, self.provider, self.contexto, self.temperature, usar_cache=self.usar_cache)
+    
+    # ------------------------------------------------------------------
+    # Cache por seção
+    # ------------------------------------------------------------------
+    def _chave_secao(self, copy_original: str, nicho: str, publico_alvo: str, secao: str) -> str:
+        """
+        Chave de uma seção da copy no cache de respostas.
+        
+        Deriva da mesma chave da copy completa (prompt + provedor + modelo +
+        temperatura), mas vale mesmo com o cache de respostas desligado.
+        """
+        modelo = self.llm.modelo if self.llm else PROVEDOR_AUTO
+        base = chave_resposta(self._montar_prompt(copy_original, nicho, publico_alvo), self.provider, modelo, self.temperature)
+        return hashlib.sha256(f"{base}:secao:{secao}".encode("utf-8")).hexdigest()
+    
+    def _guardar_secoes(self, copy_original: str, nicho: str, publico_alvo: str, estruturada: CopyEstruturada):
+        """Grava as seções não vazias da copy no cache de respostas."""
+        cache = obter_cache_respostas()
+        modelo = self.llm.modelo if self.llm else PROVEDOR_AUTO
+        for nome, texto in estruturada.para_dict().items():
+            if texto:
+                cache.gravar(self._chave_secao(copy_original, nicho, publico_alvo, nome), texto, self.provider, modelo)
+    
+    def secoes_em_cache(self, copy_original: str, nicho: str = "", publico_alvo: str = "") -> Optional[CopyEstruturada]:
+        """
+        Última versão da copy montada a partir do cache de seções.
+        
+        Returns:
+            CopyEstruturada: Seções em cache, ou None se o corpo não estiver lá
+        """
+        cache = obter_cache_respostas()
+        secoes = {nome: cache.obter(self._chave_secao(copy_original, nicho, publico_alvo, nome)) or ""
+                  for nome in SECOES_COPY}
+        return CopyEstruturada(**secoes) if secoes["corpo"] else None
+    
     def _gerar_resposta(self, prompt: str) -> str:
         """
         Gera resposta usando o provedor configurado.
             
         Returns:
-            str: Resposta gerada
+            str: Resposta gerada (RespostaFallback se o provedor falhou e os templates responderam)
         """
         try:
             if self.provider == "manus":
                 # Usar IA nativa do Manus
                 return self._gerar_com_manus_ai(prompt)
-                
-            elif self.provider == "openai":
-                response = self.llm.chat.completions.create(
-                    model="gpt-3.5-turbo",  # Modelo mais estável
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=self.temperature,
-                    max_tokens=2000
-                )
-                return response.choices[0].message.content
-                
-            elif self.provider == "gemini":
-                response = self.llm.generate_content(prompt)
-                return response.text
+            
+            # Motor de geração: cache de respostas + limite de requisições simultâneas
+            return obter_motor().gerar(self._pedido(prompt))
                 
         except Exception as e:
             logger.error(f"Erro ao gerar resposta com {self.provider}: {e}")
             # Fallback para Manus AI se outros falharem
             if self.provider != "manus":
                 logger.info("Tentando fallback para Manus AI...")
-                return self._gerar_com_manus_ai(prompt)
+                return RespostaFallback(self._gerar_com_manus_ai(prompt))
             raise
     
+    def _gerar_resposta_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Gera a resposta em streaming, produzindo os trechos assim que chegam.
+        
+        Se o provedor falhar antes do primeiro trecho, cai para a Manus AI como
+        em _gerar_resposta (um único trecho RespostaFallback); depois disso o
+        erro é propagado, para não misturar duas respostas diferentes.
+        
+        Yields:
+            str: Trechos de texto da resposta
+        """
+        if self.provider == "manus":
+            yield self._gerar_com_manus_ai(prompt)
+            return
+        
+        chave = self._chave_cache(prompt)
+        if chave:
+            resposta = obter_cache_respostas().obter(chave)
+            if resposta is not None:
+                yield resposta
+                return
+        
+        partes = []
+        try:
+            if chave:
+                # Sessões pedindo o mesmo prompt ao mesmo tempo leem um único stream do provedor
+                modelo = self.llm.modelo if self.llm else PROVEDOR_AUTO
+                trechos = obter_coordenador_voos().transmitir(
+                    chave,
+                    lambda: self._abrir_stream(prompt),
+                    lambda resposta: obter_cache_respostas().gravar(chave, resposta, self.provider, modelo),
+                    lambda: obter_cache_respostas().obter(chave),
+                    credencial=self._credencial(),
+                )
+            else:
+                trechos = self._abrir_stream(prompt)
+            for trecho in trechos:
+                partes.append(trecho)
+                yield trecho
+                
+        except Exception as e:
+            logger.error(f"Erro no streaming com {self.provider}: {e}")
+            if partes:
+                raise
+            logger.info("Tentando fallback para Manus AI...")
+            yield RespostaFallback(self._gerar_com_manus_ai(prompt))
+    
+    def _abrir_stream(self, prompt: str) -> Iterator[str]:
+        """Stream do provedor configurado, sem cache."""
+        if self.provider == PROVEDOR_AUTO:
+            return gerar_stream_auto(prompt, self.contexto, self.temperature)
+        return self.llm.gerar_stream(prompt, self.temperature)
+    
+    def _credencial(self) -> str:
+        """Impressão digital das chaves de API usadas no stream (ver coalescencia_module)."""
+        if self.llm:
+            return self.llm.chave_limite
+        return chave_segura(*(self.contexto.chave_api(p) for p in provedores_disponiveis(self.contexto)))
+    
     def _gerar_com_manus_ai(self, prompt: str) -> str:
         """
         Gera resposta usando a IA nativa do Manus.
         """
         try:
-            # Simular resposta da IA nativa (será substituído pela implementação real)
-            logger.info("Usando Manus AI nativo...")
+            logger.info("Usando Manus AI nativo (templates offline)...")
             
             # Análise do prompt para gerar resposta contextual
             if "copy" in prompt.lower() and "otimiz" in prompt.lower():
@@ -116,208 +443,48 @@ class CerebroCopy:
             logger.error(f"Erro na Manus AI: {e}")
             return "Erro ao processar com Manus AI. Tente novamente ou use outro provedor."
     
-    def _gerar_copy_otimizada_nativa(self, prompt: str) -> str:
+    @staticmethod
+    def _entrada_do_prompt(prompt: str) -> Dict[str, str]:
         """
-        Gera copy otimizada usando conhecimento dos 10 bestsellers de Direct Response.
-        """
-        # Extrair copy original do prompt
-        copy_original = ""
-        if "copy original:" in prompt.lower():
-            copy_original = prompt.split("copy original:")[-1].strip()
-        elif "copy:" in prompt.lower():
-            copy_original = prompt.split("copy:")[-1].strip()
+        Copy original, nicho e público-alvo de volta a partir de um prompt já montado.
         
-        return f"""
-# 🎯 COPY OTIMIZADA - MANUS AI
-*Aplicando os 10 Bestsellers de Direct Response*
-
----
-
-## 🔥 5 HOOKS MATADORES
-
-### Hook #1 - Alex Hormozi (Oferta Irresistível)
-**"ATENÇÃO: Esta é a única oferta que você verá este ano que vale 10x mais do que custa... mas só até [DATA ESPECÍFICA]"**
-
-*Baseado em: $100M Offers - Cria valor percebido massivo com escassez real*
-
-### Hook #2 - Russell Brunson (Expert Story)
-**"A descoberta acidental que transformou um [SITUAÇÃO INICIAL] em [RESULTADO ESPECÍFICO] em apenas [TEMPO]... (e por que isso funciona para qualquer pessoa)"**
-
-*Baseado em: Expert Secrets - Ponte da epifania que cria autoridade*
-
-### Hook #3 - Gary Halbert (Conexão Emocional)
-**"Se você está cansado de [DOR ESPECÍFICA] e quer finalmente [DESEJO PROFUNDO], esta pode ser a mensagem mais importante que você lerá este ano..."**
-
-*Baseado em: The Boron Letters - Identificação emocional profunda*
-
-### Hook #4 - Dan Kennedy (Curiosidade Magnética)
-**"O 'segredo sujo' que [AUTORIDADE/INDÚSTRIA] não quer que você descubra sobre [TÓPICO]... (revelado na página 2)"**
-
-*Baseado em: Ultimate Sales Letter - Headlines que param o scroll*
-
-### Hook #5 - Jeff Walker (Antecipação)
-**"Em 72 horas, vou revelar o método exato que [RESULTADO ESPECÍFICO]... mas primeiro, você precisa ver isso:"**
-
-*Baseado em: Launch - Criação de antecipação e urgência temporal*
-
----
-
-## ✍️ CORPO SUPER PERSUASIVO
-
-### ABERTURA (Brunson + Halbert)
-Você já se perguntou por que algumas pessoas conseguem [RESULTADO DESEJADO] enquanto outras ficam presas no mesmo lugar, tentando as mesmas estratégias que nunca funcionam?
-
-**Eu descobri a resposta.**
-
-E não é o que você pensa.
-
-### AGITAÇÃO DA DOR (Hormozi + Kennedy)
-A verdade é que você provavelmente já tentou:
-❌ [SOLUÇÃO COMUM 1] - e só perdeu tempo
-❌ [SOLUÇÃO COMUM 2] - e gastou dinheiro à toa  
-❌ [SOLUÇÃO COMUM 3] - e ficou mais frustrado ainda
-
-**E sabe por que nada funcionou?**
-
-Porque você estava usando métodos criados para pessoas que já tinham [VANTAGEM/RECURSO], não para alguém na sua situação.
-
-### REVELAÇÃO DA SOLUÇÃO (Brunson + Benson)
-Mas tudo mudou quando descobri o **Método [NOME PROPRIETÁRIO]**.
-
-Esta não é mais uma "estratégia milagrosa". É um sistema científico, testado com mais de [NÚMERO] pessoas reais, que funciona mesmo quando:
-
-✅ Você nunca teve experiência anterior
-✅ Tem pouco tempo disponível (apenas 15-30 min/dia)
-✅ Não tem grandes investimentos para fazer
-✅ Já tentou outras coisas sem sucesso
-
-### PROVA SOCIAL ESTRATÉGICA (Kennedy + Hopkins)
-**Resultados Reais de Pessoas Reais:**
-
-*"Em 30 dias consegui [RESULTADO ESPECÍFICO]. Nunca pensei que fosse possível!" - [Nome], [Cidade]*
-
-*"Funcionou mesmo tendo [OBJEÇÃO COMUM]. Estou impressionado!" - [Nome], [Profissão]*
-
-*"Já recuperei o investimento em [TEMPO] e continua gerando [BENEFÍCIO]" - [Nome], [Idade]*
-
-### OFERTA IRRESISTÍVEL (Hormozi + Walker)
-**Aqui está exatamente o que você recebe hoje:**
-
-🎯 **COMPONENTE PRINCIPAL**: [Nome do Produto] (Valor: R$ [X])
-- [Benefício específico 1]
-- [Benefício específico 2]  
-- [Benefício específico 3]
-
-🎁 **BÔNUS EXCLUSIVO #1**: [Nome] (Valor: R$ [Y])
-*[Descrição do valor que agrega]*
-
-🎁 **BÔNUS EXCLUSIVO #2**: [Nome] (Valor: R$ [Z])
-*[Descrição do valor que agrega]*
-
-🎁 **BÔNUS EXCLUSIVO #3**: [Nome] (Valor: R$ [W])
-*[Descrição do valor que agrega]*
-
-**VALOR TOTAL: R$ [SOMA TOTAL]**
-
-### GARANTIA PODEROSA (Hormozi + Kennedy)
-**🛡️ GARANTIA BLINDADA DE 30 DIAS:**
-
-Teste por 30 dias completos. Se não conseguir [RESULTADO ESPECÍFICO] ou não ficar 100% satisfeito, devolvemos todo seu dinheiro + R$ 50 pelo seu tempo.
-
-*Sem perguntas. Sem complicações. Sem letras miúdas.*
-
-### ESCASSEZ REAL (Hormozi + Halbert)
-**⚠️ IMPORTANTE - LEIA ISTO:**
-
-Esta oferta especial expira em [DATA ESPECÍFICA] às 23:59h.
-
-Não é marketing. É real.
-
-Depois desta data, o preço volta para R$ [PREÇO NORMAL] e os bônus não estarão mais disponíveis.
-
-**Por quê?** Porque só posso dar suporte personalizado para [NÚMERO] pessoas por vez.
-
----
-
-## 🚀 CTA MATADOR
-
-### BOTÃO PRINCIPAL:
-**"QUERO GARANTIR MINHA VAGA AGORA!"**
-
-### TEXTO DE APOIO:
-👆 **Clique aqui e transforme sua vida nos próximos 30 dias**
-
-⚡ **Últimas [NÚMERO] vagas disponíveis**
-🔒 **Pagamento 100% seguro**
-📱 **Acesso imediato após confirmação**
-
-### CTA SECUNDÁRIO (Recuperação):
-*"Ainda tem dúvidas? Clique aqui e veja mais depoimentos reais"*
-
-### URGÊNCIA FINAL:
-**⏰ Esta página sai do ar em:**
-[CONTADOR REGRESSIVO]
-
-**Não deixe para depois. Sua transformação começa hoje.**
-
----
-
-## 📊 ELEMENTOS APLICADOS DOS MESTRES:
-
-✅ **Alex Hormozi**: Oferta irresistível + escassez real + garantia poderosa
-✅ **Russell Brunson**: Expert story + framework proprietário + funil de valor
-✅ **Dan Kennedy**: Headlines magnéticas + bullets curiosos + múltiplos CTAs
-✅ **Gary Halbert**: Conexão emocional + urgência psicológica + copy conversacional
-✅ **Jon Benson**: Fluidez de VSL + transições suaves + ritmo envolvente
-✅ **Jeff Walker**: Antecipação + sequência de lançamento + deadlines reais
-✅ **Claude Hopkins**: Abordagem científica + resultados mensuráveis + ofertas específicas
-
----
+        A copy vai do cabeçalho até o fim do prompt (ela é sempre a última parte),
+        então linhas "---" ou "Nicho:" dentro da própria copy não a cortam.
+        """
+        _, sufixo = dividir_prompt(prompt)
+        cabecalho, separador, copy_original = sufixo.partition("Copy para modelagem:")
+        if not separador:
+            trecho = re.search(r"Trecho \d+/\d+:", prompt)
+            cabecalho, copy_original = (prompt[:trecho.start()], prompt[trecho.end():]) if trecho else (prompt, prompt)
+        nicho = re.search(r"^\s*Nicho:\s*(.+)$", cabecalho, flags=re.MULTILINE)
+        publico_alvo = re.search(r"^\s*Público-alvo:\s*(.+)$", cabecalho, flags=re.MULTILINE)
+        return {
+            "copy_original": copy_original.strip(),
+            "nicho": nicho.group(1).strip() if nicho else "",
+            "publico_alvo": publico_alvo.group(1).strip() if publico_alvo else "",
+        }
 
-*Copy otimizada pela Manus AI - Integrando os 10 bestsellers de Direct Response*
+    def _gerar_copy_otimizada_nativa(self, prompt: str) -> str:
         """
+        Gera copy otimizada com o template offline dos 10 bestsellers de Direct Response.
+        """
+        return self.templates.renderizar("copy", **self._entrada_do_prompt(prompt))
     
     def _gerar_resposta_generica_nativa(self, prompt: str) -> str:
         """
-        Gera resposta genérica usando conhecimento nativo.
+        Gera resposta genérica com o template offline.
         """
-        return f"""
-# Resposta Manus AI
-
-Baseado na sua solicitação, aqui está uma resposta otimizada:
-
-## Análise do Contexto:
-Identifiquei que você está buscando uma solução para copywriting de alta conversão.
-
-## Recomendações:
-
-### 1. **Estrutura Persuasiva:**
-- Hook impactante (primeiros 3 segundos)
-- Identificação do problema (dor específica)
-- Agitação da dor (consequências)
-- Apresentação da solução (seu produto)
-- Prova social (depoimentos/resultados)
-- Oferta irresistível (valor + bônus)
-- Escassez/urgência (tempo limitado)
-- Call-to-action claro (ação específica)
-
-### 2. **Elementos de Conversão:**
-- Headlines magnéticas
-- Bullets de benefícios
-- Garantias que eliminam risco
-- Bônus estratégicos
-- Depoimentos autênticos
-
-### 3. **Gatilhos Mentais:**
-- Reciprocidade
-- Escassez
-- Autoridade
-- Prova social
-- Compromisso/coerência
-
----
-*Resposta gerada pela Manus AI - Seu assistente de copywriting*
+        return self.templates.renderizar("generica", **self._entrada_do_prompt(prompt))
+    
+    def _montar_prompt(self, copy_original: str, nicho: str = "", publico_alvo: str = "") -> str:
         """
+        Monta o prompt de modelagem de copy.
+        
+        As instruções fixas vêm primeiro (PREFIXO_PROMPT_COPY) e a copy com o
+        contexto por último, para o provedor reaproveitar o prefixo em cache.
+        """
+        contexto = self._contexto_publico(nicho, publico_alvo).strip()
+        return montar_prompt(PREFIXO_PROMPT_COPY, f"{contexto}\n\nCopy para modelagem:\n{copy_original}")
     
     def gerar_copy_modelada(self, copy_original: str, nicho: str = "", publico_alvo: str = "") -> str:
         """
@@ -331,50 +498,58 @@ Identifiquei que você está buscando uma solução para copywriting de alta con
         Returns:
             str: Copy otimizada formatada
         """
-        contexto_adicional = ""
+        try:
+            trechos = dividir_copy(copy_original) if self.provider != "manus" else [copy_original]
+            if len(trechos) > 1:
+                resposta = self._gerar_copy_longa(trechos, nicho, publico_alvo)
+            else:
+                resposta = self._gerar_resposta(self._montar_prompt(copy_original, nicho, publico_alvo))
+            # O texto dos templates (fallback) não vai para o cache de seções do provedor
+            if self.provider != "manus" and not isinstance(resposta, RespostaFallback):
+                self._guardar_secoes(copy_original, nicho, publico_alvo, CopyEstruturada.de_markdown(resposta))
+            return resposta
+        except Exception as e:
+            logger.error(f"Erro ao gerar copy modelada: {e}")
+            return f"Erro ao processar copy: {str(e)}"
+    
+    def _contexto_publico(self, nicho: str, publico_alvo: str) -> str:
+        contexto = ""
         if nicho:
-            contexto_adicional += f"\nNicho: {nicho}"
+            contexto += f"\nNicho: {nicho}"
         if publico_alvo:
-            contexto_adicional += f"\nPúblico-alvo: {publico_alvo}"
-        
-        template = f"""
-        Você é um copywriter de elite que modela copies de alta conversão. Seu trabalho é pegar a copy do usuário e otimizá-la com base nos seguintes princípios dos mestres:
-
-        **Alex Hormozi (Ofertas Irresistíveis):**
-        - Crie escassez genuína e urgência ética
-        - Empilhe valor com bônus estratégicos
-        - Use garantias que eliminam o risco
-        - Foque no valor percebido vs. preço
-
-        **Russell Brunson (Funis e Storytelling):**
-        - Aplique a jornada do herói na narrativa
-        - Use histórias que criam conexão emocional
-        - Implemente a estrutura Problema-Agitação-Solução
-        - Crie curiosidade que mantém a atenção
-
-        **Jon Benson (Video Copywriting):**
-        - Torne a copy mais fluida e conversacional
-        - Use transições suaves entre seções
-        - Aplique o conceito de "edutainment"
-        - Mantenha o ritmo envolvente
-
-        **Dan S. Kennedy (Headlines e Persuasão):**
-        - Crie headlines magnéticas que param o scroll
-        - Use bullets que geram curiosidade intensa
-        - Aplique gatilhos psicológicos poderosos
-        - Foque em benefícios específicos e tangíveis
+            contexto += f"\nPúblico-alvo: {publico_alvo}"
+        return contexto
+    
+    def _prompt_trecho(self, trecho: str, indice: int, total: int, nicho: str, publico_alvo: str) -> str:
+        """Prompt da etapa map: otimiza um trecho mantendo a posição dele na copy."""
+        return f"""
+        Você é um copywriter de elite (Hormozi, Brunson, Benson, Kennedy, Schwartz).
+        Esta é a parte {indice} de {total} de uma copy longa (VSL ou carta de vendas).{self._contexto_publico(nicho, publico_alvo)}
 
-        **Eugene Schwartz (Níveis de Consciência):**
-        - Identifique o nível de consciência da audiência
-        - Adapte a linguagem ao estágio do prospect
-        - Use a fórmula AIDA de forma sofisticada
+        Reescreva APENAS este trecho aplicando storytelling, quebra de objeções, gatilhos
+        psicológicos e transições suaves. Mantenha a ordem das ideias, as marcações de seção
+        e de cena, e o mesmo idioma. Não crie hooks, chamada para ação final nem comentários:
+        as outras partes estão sendo reescritas em paralelo e serão unidas depois.
 
-        {contexto_adicional}
+        Trecho {indice}/{total}:
+        {trecho}
+        """
+    
+    def _prompt_unificacao(self, corpo: str, nicho: str, publico_alvo: str) -> str:
+        """Prompt da etapa reduce: hooks, CTA e análise coerentes com o corpo já otimizado."""
+        # O corpo inteiro pode ser longo; os hooks e a CTA precisam da abertura e do fechamento
+        limite = LIMITE_TOKENS_TRECHO * 2
+        if estimar_tokens(corpo) > limite:
+            metade = int(limite * 3.5 / 2)
+            corpo = f"{corpo[:metade]}\n\n[...]\n\n{corpo[-metade:]}"
+        return f"""
+        Você é um copywriter de elite. Abaixo está o corpo de uma copy longa já otimizado.{self._contexto_publico(nicho, publico_alvo)}
 
-        Copy para modelagem:
-        {copy_original}
+        Corpo otimizado:
+        {corpo}
 
         ---
+        Crie hooks e uma chamada para ação coerentes com a promessa, o tom e a oferta desse corpo.
         Gere a resposta EXATAMENTE com o seguinte formato, sem textos adicionais:
 
         ## 🎯 HOOKS OTIMIZADOS
@@ -385,10 +560,6 @@ Identifiquei que você está buscando uma solução para copywriting de alta con
         4. **Hook de Prova Social:** [Hook focado em resultados/depoimentos]
         5. **Hook de Transformação:** [Hook focado na transformação prometida]
 
-        ## 📝 CORPO OTIMIZADO
-
-        [Corpo da copy completamente reescrito e otimizado, aplicando todos os princípios mencionados. Deve ter pelo menos 300 palavras e incluir storytelling, quebra de objeções, empilhamento de valor e transições suaves.]
-
         ## 🚀 NOVA CHAMADA PARA AÇÃO
 
         [Chamada para ação poderosa e específica, com urgência e clareza sobre o próximo passo]
@@ -397,28 +568,256 @@ Identifiquei que você está buscando uma solução para copywriting de alta con
 
         **Principais melhorias aplicadas:**
         - [Lista das principais otimizações realizadas]
-        - [Princípios específicos utilizados]
-        - [Gatilhos psicológicos implementados]
         """
+    
+    def _gerar_copy_longa(self, trechos: List[str], nicho: str, publico_alvo: str) -> str:
+        """
+        Map-reduce para copies longas: otimiza os trechos em paralelo e une o resultado.
         
-        try:
-            resposta = self._gerar_resposta(template)
-            return resposta
-        except Exception as e:
-            logger.error(f"Erro ao gerar copy modelada: {e}")
-            return f"Erro ao processar copy: {str(e)}"
+        A etapa reduce gera só hooks, CTA e análise (resposta curta) a partir do
+        corpo já otimizado; o corpo entra no documento final como veio da etapa
+        map. O tempo total fica perto do trecho mais lento mais essa etapa curta.
+        """
+        logger.info(f"Copy longa: {len(trechos)} trechos otimizados em paralelo")
+        pedidos = [
+            self._pedido(self._prompt_trecho(trecho, i, len(trechos), nicho, publico_alvo))
+            for i, trecho in enumerate(trechos, start=1)
+        ]
+        resultados = obter_motor().gerar_lote(pedidos)
+        
+        falhas = sum(1 for r in resultados if isinstance(r, Exception) or not r)
+        if falhas == len(trechos):
+            raise resultados[0] if isinstance(resultados[0], Exception) else RuntimeError("Resposta vazia")
+        if falhas:
+            logger.warning(f"{falhas} trecho(s) mantidos no texto original após falha na otimização")
+        corpo = "\n\n".join(
+            trecho if isinstance(resultado, Exception) or not resultado else resultado.strip()
+            for trecho, resultado in zip(trechos, resultados)
+        )
+        
+        moldura = self._gerar_resposta(self._prompt_unificacao(corpo, nicho, publico_alvo))
+        secao_corpo = f"## 📝 CORPO OTIMIZADO\n\n{corpo}\n\n"
+        if "## 🚀" in moldura:
+            copy = moldura.replace("## 🚀", secao_corpo + "## 🚀", 1)
+        else:
+            copy = f"{moldura.rstrip()}\n\n{secao_corpo}"
+        # Hooks e CTA dos templates: a copy montada também é fallback
+        return RespostaFallback(copy) if isinstance(moldura, RespostaFallback) else copy
+    
+    def gerar_copy_modelada_stream(self, copy_original: str, nicho: str = "", publico_alvo: str = "") -> Iterator[str]:
+        """
+        Versão em streaming de gerar_copy_modelada: produz a copy aos pedaços.
+        
+        Yields:
+            str: Trechos da copy otimizada, na ordem em que o provedor os gera
+        """
+        if self.provider != "manus" and len(dividir_copy(copy_original)) > 1:
+            # O corpo da copy longa só fica pronto quando todos os trechos terminam
+            yield self.gerar_copy_modelada(copy_original, nicho, publico_alvo)
+            return
+        partes = []
+        for trecho in self._gerar_resposta_stream(self._montar_prompt(copy_original, nicho, publico_alvo)):
+            partes.append(trecho)
+            yield trecho
+        if self.provider != "manus" and partes and not any(isinstance(p, RespostaFallback) for p in partes):
+            self._guardar_secoes(copy_original, nicho, publico_alvo, CopyEstruturada.de_markdown("".join(partes)))
+    
+    def _prompt_secao(self, atual: CopyEstruturada, secao: str, nicho: str, publico_alvo: str) -> str:
+        """
+        Prompt curto para refazer uma seção: só o corpo já otimizado e a versão atual da seção.
+        
+        A versão atual entra como algo a evitar, então cada pedido de
+        regeneração tem um prompt diferente e uma resposta nova.
+        """
+        # Hooks dependem da abertura do corpo; a CTA, do fechamento
+        limite = int(LIMITE_TOKENS_TRECHO * 3.5)
+        corpo = atual.corpo[:limite] if secao == "hooks" else atual.corpo[-limite:]
+        formato = {
+            "hooks": """1. **Hook de Curiosidade:** [Hook focado em despertar curiosidade]
+        2. **Hook de Benefício:** [Hook focado no principal benefício]
+        3. **Hook de Urgência:** [Hook focado em urgência/escassez]
+        4. **Hook de Prova Social:** [Hook focado em resultados/depoimentos]
+        5. **Hook de Transformação:** [Hook focado na transformação prometida]""",
+            "cta": "[Chamada para ação poderosa e específica, com urgência e clareza sobre o próximo passo]",
+        }[secao]
+        pedido = "5 hooks novos" if secao == "hooks" else "uma chamada para ação nova"
+        return f"""
+        Você é um copywriter de elite. Abaixo está o corpo de uma copy já otimizada.{self._contexto_publico(nicho, publico_alvo)}
+        
+        Corpo:
+        {corpo}
+        
+        Versão atual (NÃO repita, crie ângulos diferentes):
+        {atual.secao(secao)}
+        
+        ---
+        Crie {pedido}, coerentes com a promessa, o tom e a oferta desse corpo.
+        Responda EXATAMENTE neste formato, sem títulos nem textos adicionais:
+        
+        {formato}
+        """
+    
+    def regenerar_secao(self, copy_original: str, secao: str, nicho: str = "", publico_alvo: str = "",
+                        atual: Optional[CopyEstruturada] = None) -> CopyEstruturada:
+        """
+        Refaz só os hooks ou só a CTA de uma copy já gerada.
+        
+        As demais seções vêm de `atual` ou do cache de seções; se não estiverem
+        lá, a copy completa é gerada antes (normalmente vindo do cache de respostas).
+        
+        Args:
+            copy_original (str): Copy original usada na geração
+            secao (str): "hooks" ou "cta"
+            nicho (str): Nicho do produto/serviço
+            publico_alvo (str): Descrição do público-alvo
+            atual (CopyEstruturada): Versão atual da copy (padrão: cache de seções)
+            
+        Returns:
+            CopyEstruturada: Copy com a seção nova (também gravada no cache de seções)
+            
+        Raises:
+            ValueError: Se a seção não for regenerável ou o provedor for a Manus AI
+        """
+        if secao not in SECOES_REGENERAVEIS:
+            raise ValueError(f"Seção não regenerável: {secao} (use {', '.join(SECOES_REGENERAVEIS)})")
+        if self.provider == "manus":
+            raise ValueError("A regeneração por seção precisa de um provedor de IA (openai, gemini ou auto)")
+        
+        atual = atual or self.secoes_em_cache(copy_original, nicho, publico_alvo)
+        if atual is None:
+            logger.info("Seções fora do cache: gerando a copy completa antes")
+            texto = self.gerar_copy_modelada(copy_original, nicho, publico_alvo)
+            if texto.startswith("Erro ao processar copy"):
+                raise RuntimeError(texto)
+            if isinstance(texto, RespostaFallback):
+                raise RuntimeError(f"Erro ao gerar a copy com {self.provider}: provedor indisponível")
+            atual = CopyEstruturada.de_markdown(texto)
+        
+        # Pedido sem cache de respostas: a intenção é justamente obter uma versão nova
+        pedido = self._pedido(self._prompt_secao(atual, secao, nicho, publico_alvo))
+        pedido.usar_cache = False
+        # Alguns modelos repetem o título da seção mesmo quando pedido o contrário
+        texto = re.sub(r"^\s*#{1,6}[^\n]*\n", "", obter_motor().gerar(pedido).strip()).strip()
+        nova = atual.com_secao(secao, texto)
+        self._guardar_secoes(copy_original, nicho, publico_alvo, nova)
+        return nova
+    
+    def gerar_variacoes(self, copy_original: str, nicho: str = "", publico_alvo: str = "", n: int = 3) -> List[Dict]:
+        """
+        Gera N variações da copy modelada e as ordena pelo ranqueador local.
+        
+        Uma chamada só quando o provedor devolve N respostas por requisição
+        (OpenAI); senão, N chamadas simultâneas. Variações não passam pelo
+        cache de respostas, já que a ideia é obter versões diferentes.
+        
+        Args:
+            copy_original (str): Copy original para ser modelada
+            nicho (str): Nicho do produto/serviço
+            publico_alvo (str): Descrição do público-alvo
+            n (int): Número de variações
+            
+        Returns:
+            list: Dicts com texto, pontuacao, criterios e placeholders, da melhor para a pior
+            
+        Raises:
+            ValueError: Se o provedor for a Manus AI (as respostas seriam idênticas)
+        """
+        from modules.ranqueador_module import ranquear_copies
+        
+        if self.provider == "manus":
+            raise ValueError("Variações precisam de um provedor de IA (openai, gemini ou auto)")
+        pedido = self._pedido(self._montar_prompt(copy_original, nicho, publico_alvo))
+        candidatos = obter_motor().gerar_varios(pedido, n)
+        return ranquear_copies(candidatos)
+    
+    def gerar_copies_modeladas(self, entradas: List[Dict], concorrencia: Optional[int] = None) -> List[str]:
+        """
+        Modela várias copies em paralelo pelo motor de geração.
+        
+        Copies longas (mais de um trecho em dividir_copy) passam pelo mesmo
+        map-reduce de gerar_copy_modelada, em paralelo com o lote das curtas.
+        
+        Args:
+            entradas (list): Dicts com copy_original e, opcionalmente, nicho e publico_alvo
+            concorrencia (int): Limite de gerações simultâneas deste lote
+            
+        Returns:
+            list: Copies otimizadas, na ordem das entradas (falhas caem para a Manus AI)
+        """
+        prompts = [
+            self._montar_prompt(e["copy_original"], e.get("nicho", ""), e.get("publico_alvo", ""))
+            for e in entradas
+        ]
+        if self.provider == "manus":
+            return [self._gerar_com_manus_ai(prompt) for prompt in prompts]
+        
+        longas = {i for i, e in enumerate(entradas) if len(dividir_copy(e["copy_original"])) > 1}
+        curtas = [i for i in range(len(entradas)) if i not in longas]
+        copies: List[Optional[str]] = [None] * len(entradas)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(len(longas), concorrencia or len(longas)))) as executor:
+            futuros = {
+                i: executor.submit(self.gerar_copy_modelada, entradas[i]["copy_original"],
+                                   entradas[i].get("nicho", ""), entradas[i].get("publico_alvo", ""))
+                for i in longas
+            }
+            if curtas:
+                resultados = obter_motor().gerar_lote([self._pedido(prompts[i]) for i in curtas], concorrencia)
+                for i, resultado in zip(curtas, resultados):
+                    copies[i] = (RespostaFallback(self._gerar_com_manus_ai(prompts[i]))
+                                 if isinstance(resultado, Exception) else resultado)
+            for i, futuro in futuros.items():
+                copies[i] = futuro.result()
+        return copies
 
 # Função de conveniência para uso externo (compatibilidade com interface)
-def gerar_copy_modelada(copy_original: str, nicho: str = "", publico_alvo: str = "", provider: str = "openai") -> str:
+def gerar_copy_modelada(copy_original: str, nicho: str = "", publico_alvo: str = "", provider: str = "openai",
+                        contexto: Optional[ContextoSessao] = None, usar_cache: bool = True) -> str:
     """
     Função simplificada para gerar copy modelada.
     """
     try:
-        cerebro = CerebroCopy(provider=provider)
+        cerebro = CerebroCopy(provider=provider, contexto=contexto, usar_cache=usar_cache)
         return cerebro.gerar_copy_modelada(copy_original, nicho, publico_alvo)
     except Exception as e:
         return f"Erro ao gerar copy: {str(e)}"
 
+def gerar_copy_modelada_stream(copy_original: str, nicho: str = "", publico_alvo: str = "", provider: str = "openai",
+                               contexto: Optional[ContextoSessao] = None, usar_cache: bool = True) -> Iterator[str]:
+    """
+    Função simplificada para gerar copy modelada em streaming.
+    """
+    cerebro = CerebroCopy(provider=provider, contexto=contexto, usar_cache=usar_cache)
+    yield from cerebro.gerar_copy_modelada_stream(copy_original, nicho, publico_alvo)
+
+def regenerar_secao_copy(copy_original: str, secao: str, nicho: str = "", publico_alvo: str = "",
+                         provider: str = "openai", contexto: Optional[ContextoSessao] = None,
+                         usar_cache: bool = True) -> str:
+    """
+    Função simplificada para refazer só os hooks ou só a CTA de uma copy.
+    
+    Returns:
+        str: Copy completa em Markdown, com a seção nova
+    """
+    cerebro = CerebroCopy(provider=provider, contexto=contexto, usar_cache=usar_cache)
+    return cerebro.regenerar_secao(copy_original, secao, nicho, publico_alvo).para_markdown()
+
+def gerar_variacoes_copy(copy_original: str, nicho: str = "", publico_alvo: str = "", n: int = 3,
+                         provider: str = "openai", contexto: Optional[ContextoSessao] = None) -> List[Dict]:
+    """
+    Função simplificada para gerar N variações ranqueadas de uma copy.
+    """
+    cerebro = CerebroCopy(provider=provider, contexto=contexto)
+    return cerebro.gerar_variacoes(copy_original, nicho, publico_alvo, n)
+
+def gerar_copies_modeladas(entradas: List[Dict], provider: str = "openai", contexto: Optional[ContextoSessao] = None,
+                           usar_cache: bool = True, concorrencia: Optional[int] = None) -> List[str]:
+    """
+    Função simplificada para modelar várias copies em paralelo.
+    """
+    cerebro = CerebroCopy(provider=provider, contexto=contexto, usar_cache=usar_cache)
+    return cerebro.gerar_copies_modeladas(entradas, concorrencia)
+
 # Exemplo de uso
 if __name__ == "__main__":
     # Teste básico
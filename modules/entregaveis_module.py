@@ -3,66 +3,243 @@ Módulo 3: Criação de Entregáveis (entregaveis_module.py)
 
 Este módulo utiliza IA para criar estruturas de produtos digitais de alto valor,
 como e-books, checklists, workbooks e sequências de e-mail para nutrição de leads.
+
+Tipos longos (E-book, Workbook, Guia Prático) são gerados em duas etapas: uma
+chamada curta monta o sumário e os capítulos são escritos em paralelo pelo
+motor de geração, todos com o mesmo guia de estilo, e depois montados em um
+documento só. Cada capítulo pronto fica salvo em um rascunho (SQLite) da
+execução; uma geração cancelada ou com falha retoma de onde parou quando é
+chamada de novo com o mesmo identificador de rascunho (o job original, no
+botão Retomar). Rascunhos abandonados expiram em VALIDADE_RASCUNHO_S.
 """
 
 import os
+import re
+import json
+import time
+import uuid
+import sqlite3
 import logging
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
 from datetime import datetime
 
+from modules.cache_module import obter_recurso, chave_segura
+from modules.coalescencia_module import obter_coordenador_voos
+from modules.contexto_module import ContextoSessao
+from modules.llm_module import obter_cliente_llm
+from modules.cache_respostas_module import obter_cache_respostas, chave_resposta
+from modules.motor_geracao_module import GeracaoCancelada, PedidoGeracao, obter_motor
+from modules.roteador_module import PROVEDOR_AUTO, gerar_stream_auto, provedores_disponiveis
+from modules.traducao_module import IDIOMAS
+from modules.prompts_module import montar_prompt
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tipos gerados capítulo a capítulo, com o número de capítulos pedido no sumário
+CAPITULOS_POR_TIPO = {
+    "E-book": 10,
+    "Workbook": 8,
+    "Guia Prático": 8,
+}
+
+CAMINHO_RASCUNHOS = os.path.join("data", "rascunhos_entregaveis.db")
+INDICE_ESTRUTURA = -1  # linha do rascunho que guarda o sumário
+VALIDADE_RASCUNHO_S = 7 * 24 * 3600  # rascunhos sem atividade há mais tempo são apagados
+
+ESQUEMA_RASCUNHOS = """
+CREATE TABLE IF NOT EXISTS rascunhos (
+    chave TEXT NOT NULL,
+    indice INTEGER NOT NULL,
+    conteudo TEXT NOT NULL,
+    atualizado_em REAL NOT NULL,
+    PRIMARY KEY (chave, indice)
+);
+CREATE INDEX IF NOT EXISTS idx_rascunhos_atualizado ON rascunhos(atualizado_em);
+"""
+
+# Diretrizes fixas do prompt de entregável: sem interpolação, para o cache de prompt do provedor
+PREFIXO_PROMPT_ENTREGAVEL = """
+Você é um especialista em criação de produtos digitais de alto valor e marketing de resposta direta.
+Sua tarefa é criar um esboço detalhado e estruturado do entregável descrito depois destas instruções.
+
+**Diretrizes para criação:**
+
+1. **Valor Imediato:** O conteúdo deve fornecer valor prático e acionável
+2. **Estrutura Lógica:** Organize o conteúdo de forma progressiva e didática
+3. **Aplicabilidade:** Foque em resultados tangíveis e implementáveis
+4. **Engajamento:** Use linguagem envolvente e motivacional
+5. **Completude:** Cubra o tópico de forma abrangente mas focada
+
+**Formato específico por tipo:**
+
+**Se for E-book:**
+- Crie capítulos bem estruturados
+- Inclua introdução, desenvolvimento e conclusão
+- Adicione exercícios práticos e exemplos
+
+**Se for Checklist:**
+- Liste itens acionáveis e específicos
+- Organize por ordem de prioridade ou sequência lógica
+- Inclua critérios de verificação
+
+**Se for Workbook:**
+- Combine teoria com exercícios práticos
+- Inclua espaços para anotações e reflexões
+- Adicione templates e ferramentas
+
+**Se for Script de VSL:**
+- Estruture com hook, problema, solução e CTA
+- Inclua marcações de tempo e pausas
+- Adicione instruções visuais
+
+**Se for Gabarito:**
+- Forneça respostas detalhadas e explicações
+- Inclua critérios de avaliação
+- Adicione dicas de melhoria
+
+Gere a resposta com o seguinte formato:
+
+# 📚 [TIPO EM MAIÚSCULAS]: [TÍTULO ATRATIVO]
+
+## 🎯 Objetivo
+[Descrição clara do que o usuário vai alcançar]
+
+## 👥 Para Quem É
+[Perfil do público-alvo ideal]
+
+## 📋 Estrutura Completa
+
+[Estrutura detalhada com capítulos/seções/itens organizados logicamente]
+
+## 🚀 Benefícios Principais
+- [Benefício 1]
+- [Benefício 2]
+- [Benefício 3]
+
+## 💡 Dicas de Implementação
+[Orientações práticas para usar o entregável]
+
+## 📈 Como Usar Como Bônus
+[Estratégias para posicionar este entregável como bônus de alto valor]
+"""
+
+
+class RascunhosEntregaveis:
+    """
+    Sumário e capítulos já gerados de entregáveis longos ainda não concluídos.
+    """
+
+    def __init__(self, caminho: str = CAMINHO_RASCUNHOS, validade_s: float = VALIDADE_RASCUNHO_S):
+        """
+        Args:
+            caminho (str): Arquivo SQLite dos rascunhos
+            validade_s (float): Tempo sem atividade até um rascunho ser apagado
+        """
+        self.caminho = caminho
+        self.validade_s = validade_s
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with self._conexao() as conn:
+            conn.executescript(ESQUEMA_RASCUNHOS)
+        self.limpar_expirados()
+
+    @contextmanager
+    def _conexao(self):
+        conn = sqlite3.connect(self.caminho, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def limpar_expirados(self) -> int:
+        """Apaga os rascunhos sem atividade há mais de validade_s; retorna as partes apagadas."""
+        with self._conexao() as conn:
+            # Um rascunho expira inteiro: a parte mais recente conta para todas
+            apagadas = conn.execute(
+                "DELETE FROM rascunhos WHERE chave IN (SELECT chave FROM rascunhos GROUP BY chave "
+                "HAVING MAX(atualizado_em) < ?)",
+                (time.time() - self.validade_s,),
+            ).rowcount
+        if apagadas:
+            logger.info(f"🧹 {apagadas} parte(s) de rascunhos expirados apagadas")
+        return apagadas
+
+    def obter(self, chave: str) -> Dict[int, str]:
+        """Partes salvas do rascunho (índice -> conteúdo); vazio se não houver."""
+        self.limpar_expirados()
+        with self._conexao() as conn:
+            linhas = conn.execute("SELECT indice, conteudo FROM rascunhos WHERE chave = ?", (chave,)).fetchall()
+        return dict(linhas)
+
+    def gravar(self, chave: str, indice: int, conteudo: str):
+        """Salva (ou substitui) uma parte do rascunho."""
+        with self._conexao() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO rascunhos (chave, indice, conteudo, atualizado_em) VALUES (?, ?, ?, ?)",
+                (chave, indice, conteudo, time.time()),
+            )
+
+    def descartar(self, chave: str):
+        """Apaga o rascunho de um entregável concluído."""
+        with self._conexao() as conn:
+            conn.execute("DELETE FROM rascunhos WHERE chave = ?", (chave,))
+
+
+def obter_rascunhos() -> RascunhosEntregaveis:
+    """Rascunhos de entregáveis únicos do processo."""
+    return obter_recurso("rascunhos_entregaveis", RascunhosEntregaveis)
+
+
 class CriadorEntregaveis:
     """
     Classe principal para criação de entregáveis digitais usando IA.
     """
     
-    def __init__(self, provider="openai", temperature=0.7):
+    def __init__(self, provider="openai", temperature=0.7, contexto=None, usar_cache=True):
         """
         Inicializa o criador de entregáveis.
         
         Args:
-            provider (str): Provedor de IA ("openai" ou "gemini")
+            provider (str): Provedor de IA ("openai", "gemini" ou "auto")
             temperature (float): Temperatura para geração (0.0 a 1.0)
+            contexto (ContextoSessao): Credenciais da sessão (padrão: variáveis de ambiente)
+            usar_cache (bool): Reaproveitar respostas em cache para prompts idênticos
         """
+        self.contexto = contexto or ContextoSessao.do_ambiente()
         self.provider = provider
         self.temperature = temperature
+        self.usar_cache = usar_cache
         self.llm = None
-        self._configurar_llm()
+        if provider != PROVEDOR_AUTO:
+            self._configurar_llm()
     
     def _configurar_llm(self):
         """
-        Configura o modelo de linguagem baseado no provedor escolhido.
+        Obtém o cliente compartilhado do provedor escolhido (ver llm_module).
         """
         try:
-            if self.provider == "openai":
-                from openai import OpenAI
-                api_key = os.getenv("OPENAI_API_KEY")
-                if not api_key:
-                    raise ValueError("OPENAI_API_KEY não encontrada nas variáveis de ambiente")
-                
-                # Usar API oficial do OpenAI
-                self.llm = OpenAI(
-                    api_key=api_key,
-                    base_url="https://api.openai.com/v1"  # API oficial
-                )
-                logger.info("OpenAI configurado com sucesso")
-                
-            elif self.provider == "gemini":
-                import google.generativeai as genai
-                api_key = os.getenv("GOOGLE_API_KEY")
-                if not api_key:
-                    raise ValueError("GOOGLE_API_KEY não encontrada nas variáveis de ambiente")
-                genai.configure(api_key=api_key)
-                self.llm = genai.GenerativeModel('gemini-1.5-flash')  # Modelo mais recente
-                logger.info("Gemini configurado com sucesso")
-                
+            self.llm = obter_cliente_llm(self.provider, self.contexto)
+            logger.info(f"{self.provider} configurado com sucesso ({self.llm.modelo})")
         except Exception as e:
             logger.error(f"Erro ao configurar LLM: {e}")
             raise
     
+    def _chave_cache(self, prompt: str) -> Optional[str]:
+        """Chave do cache de respostas para o prompt (None se o cache estiver desligado)."""
+        if not self.usar_cache:
+            return None
+        modelo = self.llm.modelo if self.llm else PROVEDOR_AUTO
+        return chave_resposta(prompt, self.provider, modelo, self.temperature)
+    
+    def _pedido(self, prompt: str) -> PedidoGeracao:
+        """Pedido ao motor de geração com as opções desta instância."""
+        return PedidoGeracao(prompt, self.provider, self.contexto, self.temperature, usar_cache=self.usar_cache)
+    
     def _gerar_resposta(self, prompt: str) -> str:
         """
         Gera resposta usando o modelo configurado.
@@ -74,138 +251,396 @@ class CriadorEntregaveis:
             str: Resposta gerada
         """
         try:
-            if self.provider == "openai":
-                response = self.llm.chat.completions.create(
-                    model="gpt-3.5-turbo",  # Modelo mais estável
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=self.temperature,
-                    max_tokens=2000
-                )
-                return response.choices[0].message.content
-                
-            elif self.provider == "gemini":
-                response = self.llm.generate_content(prompt)
-                return response.text
+            # Motor de geração: cache de respostas + limite de requisições simultâneas
+            return obter_motor().gerar(self._pedido(prompt))
                 
         except Exception as e:
             logger.error(f"Erro ao gerar resposta: {e}")
             raise
     
-    def gerar_entregavel(self, topico: str, tipo: str, idioma: str = "pt", publico_alvo: str = "") -> str:
+    def _gerar_resposta_stream(self, prompt: str) -> Iterator[str]:
         """
-        Gera a estrutura completa de um entregável digital.
+        Gera a resposta em streaming, produzindo os trechos assim que chegam.
         
         Args:
-            topico (str): Tópico principal do entregável
-            tipo (str): Tipo de entregável (E-book, Checklist, etc.)
-            idioma (str): Idioma do conteúdo
-            publico_alvo (str): Descrição do público-alvo
+            prompt (str): Prompt para o modelo
             
-        Returns:
-            str: Estrutura completa do entregável
+        Yields:
+            str: Trechos de texto da resposta
         """
-        idioma_map = {
-            "pt": "Português",
-            "en": "Inglês",
-            "es": "Espanhol",
-            "it": "Italiano",
-            "de": "Alemão",
-            "fr": "Francês"
-        }
+        chave = self._chave_cache(prompt)
+        if chave:
+            resposta = obter_cache_respostas().obter(chave)
+            if resposta is not None:
+                yield resposta
+                return
         
-        idioma_nome = idioma_map.get(idioma, "Português")
-        contexto_publico = f"\nPúblico-alvo: {publico_alvo}" if publico_alvo else ""
+        partes = []
+        try:
+            if chave:
+                # Sessões pedindo o mesmo prompt ao mesmo tempo leem um único stream do provedor
+                modelo = self.llm.modelo if self.llm else PROVEDOR_AUTO
+                trechos = obter_coordenador_voos().transmitir(
+                    chave,
+                    lambda: self._abrir_stream(prompt),
+                    lambda resposta: obter_cache_respostas().gravar(chave, resposta, self.provider, modelo),
+                    lambda: obter_cache_respostas().obter(chave),
+                    credencial=self._credencial(),
+                )
+            else:
+                trechos = self._abrir_stream(prompt)
+            for trecho in trechos:
+                partes.append(trecho)
+                yield trecho
+                
+        except Exception as e:
+            logger.error(f"Erro no streaming: {e}")
+            raise
+    
+    def _abrir_stream(self, prompt: str) -> Iterator[str]:
+        """Stream do provedor configurado, sem cache."""
+        if self.provider == PROVEDOR_AUTO:
+            return gerar_stream_auto(prompt, self.contexto, self.temperature)
+        return self.llm.gerar_stream(prompt, self.temperature)
+    
+    def _credencial(self) -> str:
+        """Impressão digital das chaves de API usadas no stream (ver coalescencia_module)."""
+        if self.llm:
+            return self.llm.chave_limite
+        return chave_segura(*(self.contexto.chave_api(p) for p in provedores_disponiveis(self.contexto)))
+    
+    def _montar_prompt(self, topico: str, tipo: str, idioma: str = "pt", publico_alvo: str = "") -> str:
+        """
+        Monta o prompt de criação do entregável.
         
-        template = f"""
-        Você é um especialista em criação de produtos digitais de alto valor e marketing de resposta direta. 
+        As diretrizes fixas vêm primeiro (PREFIXO_PROMPT_ENTREGAVEL) e tipo,
+        tópico, idioma e público por último, para o provedor reaproveitar o
+        prefixo em cache.
+        """
+        contexto_publico = f"\n        - Público-alvo: {publico_alvo}" if publico_alvo else ""
+        return montar_prompt(PREFIXO_PROMPT_ENTREGAVEL, f"""
         Crie um esboço detalhado e estruturado para um {tipo} sobre o tópico "{topico}".
         
         **Especificações:**
-        - Idioma: {idioma_nome}
+        - Idioma: {IDIOMAS.get(idioma, "Português")}
         - Tipo: {tipo}
         - Tópico: {topico}{contexto_publico}
+        """)
+    
+    # ------------------------------------------------------------------
+    # Tipos longos: sumário + capítulos em paralelo
+    # ------------------------------------------------------------------
+    def _prompt_estrutura(self, topico: str, tipo: str, idioma: str, publico_alvo: str) -> str:
+        """Prompt da primeira etapa: só o sumário, em JSON, para os capítulos partirem dele."""
+        contexto_publico = f"\n        - Público-alvo: {publico_alvo}" if publico_alvo else ""
+        return montar_prompt("""
+        Você é um especialista em criação de produtos digitais de alto valor e marketing de resposta direta.
+        Planeje o entregável descrito depois destas instruções.
         
-        **Diretrizes para criação:**
+        Organize o conteúdo de forma progressiva e didática, do fundamento à aplicação. Cada
+        capítulo será escrito por um redator diferente a partir deste plano, então os resumos
+        devem deixar claro o que cada um cobre (sem sobreposição).
         
-        1. **Valor Imediato:** O conteúdo deve fornecer valor prático e acionável
-        2. **Estrutura Lógica:** Organize o conteúdo de forma progressiva e didática
-        3. **Aplicabilidade:** Foque em resultados tangíveis e implementáveis
-        4. **Engajamento:** Use linguagem envolvente e motivacional
-        5. **Completude:** Cubra o tópico de forma abrangente mas focada
+        Responda APENAS com um JSON válido, sem texto antes ou depois, neste formato:
+        {
+          "titulo": "título atrativo",
+          "objetivo": "o que o leitor vai alcançar",
+          "para_quem": "perfil do público-alvo ideal",
+          "tom": "tom de voz e estilo de escrita a manter em todos os capítulos",
+          "capitulos": [
+            {"titulo": "título do capítulo", "resumo": "o que o capítulo cobre, em 1-2 frases"}
+          ],
+          "beneficios": ["benefício 1", "benefício 2", "benefício 3"]
+        }
+        """, f"""
+        Planeje um {tipo} sobre o tópico "{topico}", em {CAPITULOS_POR_TIPO.get(tipo, 8)} capítulos.
         
-        **Formato específico por tipo:**
+        **Especificações:**
+        - Idioma: {IDIOMAS.get(idioma, "Português")}
+        - Tipo: {tipo}
+        - Tópico: {topico}{contexto_publico}
+        """)
+    
+    @staticmethod
+    def _interpretar_estrutura(resposta: str, topico: str) -> Dict:
+        """
+        Lê o sumário gerado; se o JSON vier quebrado, aproveita as linhas numeradas como capítulos.
         
-        **Se for E-book:**
-        - Crie capítulos bem estruturados
-        - Inclua introdução, desenvolvimento e conclusão
-        - Adicione exercícios práticos e exemplos
+        Raises:
+            ValueError: Se não houver nenhum capítulo na resposta
+        """
+        estrutura = {}
+        inicio, fim = resposta.find("{"), resposta.rfind("}")
+        if inicio != -1 and fim > inicio:
+            try:
+                estrutura = json.loads(resposta[inicio:fim + 1])
+            except json.JSONDecodeError:
+                estrutura = {}
         
-        **Se for Checklist:**
-        - Liste itens acionáveis e específicos
-        - Organize por ordem de prioridade ou sequência lógica
-        - Inclua critérios de verificação
+        capitulos = [
+            c if isinstance(c, dict) else {"titulo": str(c), "resumo": ""}
+            for c in estrutura.get("capitulos") or []
+        ]
+        if not capitulos:
+            titulos = re.findall(r"^\s*\d+[.)]\s+(.+)$", resposta, flags=re.MULTILINE)
+            capitulos = [{"titulo": t.strip(" *#"), "resumo": ""} for t in titulos]
+        if not capitulos:
+            raise ValueError("O sumário gerado não tem capítulos")
         
-        **Se for Workbook:**
-        - Combine teoria com exercícios práticos
-        - Inclua espaços para anotações e reflexões
-        - Adicione templates e ferramentas
+        return {
+            "titulo": estrutura.get("titulo") or topico,
+            "objetivo": estrutura.get("objetivo", ""),
+            "para_quem": estrutura.get("para_quem", ""),
+            "tom": estrutura.get("tom", ""),
+            "capitulos": capitulos,
+            "beneficios": estrutura.get("beneficios") or [],
+        }
+    
+    def _prompt_capitulo(self, estrutura: Dict, indice: int, tipo: str, idioma: str, publico_alvo: str) -> str:
+        """
+        Prompt da segunda etapa: um capítulo, com o plano inteiro como guia de estilo comum.
         
-        **Se for Script de VSL:**
-        - Estruture com hook, problema, solução e CTA
-        - Inclua marcações de tempo e pausas
-        - Adicione instruções visuais
+        O guia e o sumário são idênticos em todos os capítulos do documento e
+        vão no prefixo; só o capítulo a escrever muda, no sufixo. Assim os
+        capítulos disparados em paralelo reaproveitam o prefixo em cache.
+        """
+        capitulos = estrutura["capitulos"]
+        sumario = "\n".join(f"        {i}. {c['titulo']}" for i, c in enumerate(capitulos, start=1))
+        capitulo = capitulos[indice]
+        extras = {
+            "Workbook": "Termine com exercícios práticos e espaços para anotações (linhas em branco marcadas com ____).",
+            "Guia Prático": "Use passos numerados e termine com um checklist de aplicação.",
+        }.get(tipo, "Inclua exemplos concretos e termine com um exercício prático curto.")
+        prefixo = f"""
+        Você está escrevendo um capítulo do {tipo} "{estrutura['titulo']}".
+        Os outros capítulos estão sendo escritos em paralelo com este mesmo guia.
         
-        **Se for Gabarito:**
-        - Forneça respostas detalhadas e explicações
-        - Inclua critérios de avaliação
-        - Adicione dicas de melhoria
+        **Guia de estilo (comum a todos os capítulos):**
+        - Idioma: {IDIOMAS.get(idioma, "Português")}
+        - Objetivo do {tipo}: {estrutura['objetivo']}
+        - Público: {estrutura['para_quem'] or publico_alvo}
+        - Tom: {estrutura['tom'] or "didático, envolvente e motivacional"}
+        - Formato: Markdown; subtítulos com ###; parágrafos curtos; valor prático e acionável
         
-        ---
+        **Sumário completo:**
+{sumario}
         
-        Gere a resposta com o seguinte formato:
+        Escreva o conteúdo completo do capítulo indicado a seguir. {extras}
+        Comece direto no conteúdo, sem repetir o título do capítulo, e não cubra assuntos
+        dos outros capítulos (pode apenas fazer a ponte para o próximo).
+        """
+        return montar_prompt(prefixo, f"""
+        **Capítulo a escrever:** {indice + 1} de {len(capitulos)} — {capitulo['titulo']}
+        {capitulo.get('resumo', '')}
+        """)
+    
+    @staticmethod
+    def _montar_documento(estrutura: Dict, tipo: str, capitulos: Dict[int, str]) -> str:
+        """Documento final; capítulos ainda não gerados aparecem como pendentes."""
+        partes = [f"# 📚 {tipo.upper()}: {estrutura['titulo']}"]
+        if estrutura["objetivo"]:
+            partes.append(f"## 🎯 Objetivo\n\n{estrutura['objetivo']}")
+        if estrutura["para_quem"]:
+            partes.append(f"## 👥 Para Quem É\n\n{estrutura['para_quem']}")
+        partes.append("## 📋 Sumário\n\n" + "\n".join(
+            f"{i}. {c['titulo']}" for i, c in enumerate(estrutura["capitulos"], start=1)
+        ))
+        for i, capitulo in enumerate(estrutura["capitulos"]):
+            texto = capitulos.get(i, "_⏳ Em produção..._")
+            partes.append(f"---\n\n## Capítulo {i + 1}: {capitulo['titulo']}\n\n{texto}")
+        if estrutura["beneficios"]:
+            partes.append("---\n\n## 🚀 Benefícios Principais\n\n" + "\n".join(f"- {b}" for b in estrutura["beneficios"]))
+        return "\n\n".join(partes)
+    
+    def gerar_entregavel_longo(self, topico: str, tipo: str, idioma: str = "pt", publico_alvo: str = "",
+                               ao_progredir: Optional[Callable[[float, str, str], None]] = None,
+                               cancelado: Optional[Callable[[], bool]] = None,
+                               rascunho: Optional[str] = None) -> str:
+        """
+        Gera um entregável longo em duas etapas: sumário e capítulos em paralelo.
         
-        # 📚 {tipo.upper()}: [TÍTULO ATRATIVO]
+        O sumário e cada capítulo concluído ficam no rascunho da execução;
+        chamar de novo com os mesmos parâmetros e o mesmo `rascunho` (após
+        cancelamento ou falha) gera só o que falta. Sem `rascunho`, começa do zero.
         
-        ## 🎯 Objetivo
-        [Descrição clara do que o usuário vai alcançar]
+        Args:
+            topico (str): Tópico principal do entregável
+            tipo (str): Tipo de entregável (ver CAPITULOS_POR_TIPO)
+            idioma (str): Idioma do conteúdo
+            publico_alvo (str): Descrição do público-alvo
+            ao_progredir (callable): Chamado com (progresso 0-100, mensagem, documento parcial);
+                roda na thread de callbacks do lote, fora do loop do motor
+            cancelado (callable): Consultada durante a geração dos capítulos; True interrompe
+            rascunho (str): Identificador da execução a retomar (ex.: o ID do job original)
+            
+        Returns:
+            str: Documento completo em Markdown
+            
+        Raises:
+            GeracaoCancelada: Se o cancelamento foi solicitado (o progresso fica salvo)
+            RuntimeError: Se algum capítulo falhar (os demais ficam salvos)
+        """
+        rascunhos = obter_rascunhos()
+        # Cada execução tem seu rascunho: gerações iguais simultâneas não se misturam
+        chave = chave_segura(rascunho or uuid.uuid4().hex, self.provider, self.temperature,
+                             topico, tipo, idioma, publico_alvo)
+        salvo = rascunhos.obter(chave)
         
-        ## 👥 Para Quem É
-        [Perfil do público-alvo ideal]
+        if INDICE_ESTRUTURA in salvo:
+            estrutura = json.loads(salvo.pop(INDICE_ESTRUTURA))
+            logger.info(f"Retomando {tipo} \"{estrutura['titulo']}\": {len(salvo)} capítulo(s) já prontos")
+        else:
+            estrutura = self._interpretar_estrutura(
+                self._gerar_resposta(self._prompt_estrutura(topico, tipo, idioma, publico_alvo)), topico
+            )
+            rascunhos.gravar(chave, INDICE_ESTRUTURA, json.dumps(estrutura, ensure_ascii=False))
         
-        ## 📋 Estrutura Completa
+        total = len(estrutura["capitulos"])
+        capitulos = {i: texto for i, texto in salvo.items() if 0 <= i < total}
+        pendentes = [i for i in range(total) if i not in capitulos]
         
-        [Estrutura detalhada com capítulos/seções/itens organizados logicamente]
+        def progredir():
+            if ao_progredir:
+                ao_progredir(10 + 85 * len(capitulos) / total, f"Capítulos prontos: {len(capitulos)}/{total}",
+                             self._montar_documento(estrutura, tipo, capitulos))
         
-        ## 🚀 Benefícios Principais
-        - [Benefício 1]
-        - [Benefício 2]
-        - [Benefício 3]
+        def ao_concluir(posicao: int, resultado):
+            if isinstance(resultado, str) and resultado.strip():
+                indice = pendentes[posicao]
+                capitulos[indice] = resultado.strip()
+                rascunhos.gravar(chave, indice, capitulos[indice])
+                progredir()
         
-        ## 💡 Dicas de Implementação
-        [Orientações práticas para usar o entregável]
+        progredir()
+        if pendentes:
+            logger.info(f"{tipo}: {len(pendentes)} capítulo(s) gerados em paralelo")
+            pedidos = [self._pedido(self._prompt_capitulo(estrutura, i, tipo, idioma, publico_alvo)) for i in pendentes]
+            resultados = obter_motor().gerar_lote(pedidos, ao_concluir=ao_concluir, cancelado=cancelado)
+            
+            if any(isinstance(r, GeracaoCancelada) for r in resultados):
+                raise GeracaoCancelada(f"{len(capitulos)}/{total} capítulos salvos para retomar")
+            falhas = [r for r in resultados if isinstance(r, Exception) or not (r or "").strip()]
+            if falhas:
+                raise RuntimeError(
+                    f"{len(falhas)} de {total} capítulos falharam ({falhas[0] or 'resposta vazia'}); "
+                    f"os {len(capitulos)} prontos ficam salvos no rascunho para retomar"
+                )
         
-        ## 📈 Como Usar Como Bônus
-        [Estratégias para posicionar este entregável como bônus de alto valor]
+        rascunhos.descartar(chave)
+        return self._montar_documento(estrutura, tipo, capitulos)
+    
+    def gerar_entregavel(self, topico: str, tipo: str, idioma: str = "pt", publico_alvo: str = "") -> str:
         """
+        Gera a estrutura completa de um entregável digital.
         
+        Tipos longos (CAPITULOS_POR_TIPO) passam por gerar_entregavel_longo().
+        
+        Args:
+            topico (str): Tópico principal do entregável
+            tipo (str): Tipo de entregável (E-book, Checklist, etc.)
+            idioma (str): Idioma do conteúdo
+            publico_alvo (str): Descrição do público-alvo
+            
+        Returns:
+            str: Estrutura completa do entregável
+        """
         try:
-            resposta = self._gerar_resposta(template)
+            if tipo in CAPITULOS_POR_TIPO:
+                return self.gerar_entregavel_longo(topico, tipo, idioma, publico_alvo)
+            resposta = self._gerar_resposta(self._montar_prompt(topico, tipo, idioma, publico_alvo))
             return resposta
         except Exception as e:
             logger.error(f"Erro ao gerar entregável: {e}")
             return f"Erro ao processar entregável: {str(e)}"
+    
+    def gerar_entregavel_stream(self, topico: str, tipo: str, idioma: str = "pt", publico_alvo: str = "") -> Iterator[str]:
+        """
+        Versão em streaming de gerar_entregavel: produz a estrutura aos pedaços.
+        
+        Yields:
+            str: Trechos do entregável, na ordem em que o provedor os gera
+        """
+        if tipo in CAPITULOS_POR_TIPO:
+            # O documento só fica pronto quando todos os capítulos terminam
+            yield self.gerar_entregavel_longo(topico, tipo, idioma, publico_alvo)
+            return
+        yield from self._gerar_resposta_stream(self._montar_prompt(topico, tipo, idioma, publico_alvo))
+    
+    def gerar_entregaveis(self, entradas: List[Dict], concorrencia: Optional[int] = None) -> List[str]:
+        """
+        Gera vários entregáveis em paralelo pelo motor de geração.
+        
+        Tipos longos (CAPITULOS_POR_TIPO) passam por gerar_entregavel_longo(),
+        em paralelo com o lote dos demais.
+        
+        Args:
+            entradas (list): Dicts com topico, tipo e, opcionalmente, idioma e publico_alvo
+            concorrencia (int): Limite de gerações simultâneas deste lote
+            
+        Returns:
+            list: Estruturas geradas, na ordem das entradas (falhas viram mensagem de erro)
+        """
+        longos = {i for i, e in enumerate(entradas) if e["tipo"] in CAPITULOS_POR_TIPO}
+        curtos = [i for i in range(len(entradas)) if i not in longos]
+        documentos: List[Optional[str]] = [None] * len(entradas)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(len(longos), concorrencia or len(longos)))) as executor:
+            futuros = {
+                i: executor.submit(self.gerar_entregavel, entradas[i]["topico"], entradas[i]["tipo"],
+                                   entradas[i].get("idioma", "pt"), entradas[i].get("publico_alvo", ""))
+                for i in longos
+            }
+            if curtos:
+                pedidos = [
+                    self._pedido(self._montar_prompt(entradas[i]["topico"], entradas[i]["tipo"],
+                                                     entradas[i].get("idioma", "pt"), entradas[i].get("publico_alvo", "")))
+                    for i in curtos
+                ]
+                for i, resultado in zip(curtos, obter_motor().gerar_lote(pedidos, concorrencia)):
+                    documentos[i] = (f"Erro ao processar entregável: {resultado}"
+                                     if isinstance(resultado, Exception) else resultado)
+            for i, futuro in futuros.items():
+                documentos[i] = futuro.result()
+        return documentos
 
 # Função de conveniência para uso externo (compatibilidade com interface)
-def gerar_entregavel(topico: str, tipo: str, idioma: str = "pt", publico_alvo: str = "", provider: str = "openai") -> str:
+def gerar_entregavel(topico: str, tipo: str, idioma: str = "pt", publico_alvo: str = "", provider: str = "openai",
+                     contexto: Optional[ContextoSessao] = None, usar_cache: bool = True) -> str:
     """
     Função simplificada para gerar entregável.
     """
     try:
-        criador = CriadorEntregaveis(provider=provider)
+        criador = CriadorEntregaveis(provider=provider, contexto=contexto, usar_cache=usar_cache)
         return criador.gerar_entregavel(topico, tipo, idioma, publico_alvo)
     except Exception as e:
         return f"Erro ao gerar entregável: {str(e)}"
 
+def gerar_entregavel_stream(topico: str, tipo: str, idioma: str = "pt", publico_alvo: str = "", provider: str = "openai",
+                            contexto: Optional[ContextoSessao] = None, usar_cache: bool = True) -> Iterator[str]:
+    """
+    Função simplificada para gerar entregável em streaming.
+    """
+    criador = CriadorEntregaveis(provider=provider, contexto=contexto, usar_cache=usar_cache)
+    yield from criador.gerar_entregavel_stream(topico, tipo, idioma, publico_alvo)
+
+def gerar_entregavel_longo(topico: str, tipo: str, idioma: str = "pt", publico_alvo: str = "", provider: str = "openai",
+                           contexto: Optional[ContextoSessao] = None, usar_cache: bool = True,
+                           ao_progredir: Optional[Callable[[float, str, str], None]] = None,
+                           cancelado: Optional[Callable[[], bool]] = None, rascunho: Optional[str] = None) -> str:
+    """
+    Função simplificada para gerar um entregável longo capítulo a capítulo (cancelável e retomável).
+    """
+    criador = CriadorEntregaveis(provider=provider, contexto=contexto, usar_cache=usar_cache)
+    return criador.gerar_entregavel_longo(topico, tipo, idioma, publico_alvo, ao_progredir, cancelado, rascunho)
+
+def gerar_entregaveis(entradas: List[Dict], provider: str = "openai", contexto: Optional[ContextoSessao] = None,
+                      usar_cache: bool = True, concorrencia: Optional[int] = None) -> List[str]:
+    """
+    Função simplificada para gerar vários entregáveis em paralelo.
+    """
+    criador = CriadorEntregaveis(provider=provider, contexto=contexto, usar_cache=usar_cache)
+    return criador.gerar_entregaveis(entradas, concorrencia)
+
 # Exemplo de uso
 if __name__ == "__main__":
     # Teste básico
@@ -18,6 +18,8 @@ import os
 import logging
 from datetime import datetime
 
+from modules.contexto_module import ContextoSessao
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,13 +29,15 @@ class GarimpadorOfertas:
     Classe principal para garimpar ofertas de diferentes plataformas.
     """
     
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, contexto=None):
         """
         Inicializa o garimpador com configurações do navegador.
         
         Args:
             headless (bool): Se True, executa o navegador em modo headless
+            contexto (ContextoSessao): Credenciais da sessão (padrão: variáveis de ambiente)
         """
+        self.contexto = contexto or ContextoSessao.do_ambiente()
         self.headless = headless
         self.driver = None
         self.dados_ofertas = []
@@ -540,7 +544,7 @@ class GarimpadorOfertas:
         finally:
             self._fechar_driver()
 
-def iniciar_garimpo(clickbank_user=None, clickbank_pass=None, hotmart_email=None, hotmart_pass=None):
+def iniciar_garimpo(clickbank_user=None, clickbank_pass=None, hotmart_email=None, hotmart_pass=None, contexto=None):
     """
     Função principal para iniciar o processo de garimpo.
     Interface simplificada para uso externo.
@@ -550,18 +554,17 @@ def iniciar_garimpo(clickbank_user=None, clickbank_pass=None, hotmart_email=None
         clickbank_pass: Senha do ClickBank
         hotmart_email: Email do Hotmart
         hotmart_pass: Senha do Hotmart
+        contexto: ContextoSessao com as demais credenciais (padrão: variáveis de ambiente)
     """
-    # Configurar credenciais nas variáveis de ambiente temporariamente
-    if clickbank_user:
-        os.environ['CLICKBANK_USERNAME'] = clickbank_user
-    if clickbank_pass:
-        os.environ['CLICKBANK_PASSWORD'] = clickbank_pass
-    if hotmart_email:
-        os.environ['HOTMART_EMAIL'] = hotmart_email
-    if hotmart_pass:
-        os.environ['HOTMART_PASSWORD'] = hotmart_pass
+    # Credenciais valem só para esta execução (sem gravar em os.environ)
+    contexto = (contexto or ContextoSessao.do_ambiente()).com(
+        clickbank_username=clickbank_user,
+        clickbank_password=clickbank_pass,
+        hotmart_email=hotmart_email,
+        hotmart_password=hotmart_pass
+    )
     
-    garimpador = GarimpadorOfertas(headless=True)
+    garimpador = GarimpadorOfertas(headless=True, contexto=contexto)
     resultado = garimpador.iniciar_garimpo_completo()
     return resultado
 
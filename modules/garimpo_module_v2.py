@@ -4,6 +4,7 @@ Sistema melhorado para extrair ofertas reais do ClickBank e Hotmart
 """
 
 import os
+import json
 import time
 import logging
 import pandas as pd
@@ -17,15 +18,25 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
+from modules.cache_module import obter_recurso
+from modules.contexto_module import ContextoSessao
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class GarimpadorOfertas:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, contexto=None):
+        """
+        Args:
+            headless (bool): Se True, executa o navegador em modo headless
+            contexto (ContextoSessao): Credenciais da sessão (padrão: variáveis de ambiente)
+        """
+        self.contexto = contexto or ContextoSessao.do_ambiente()
         self.driver = None
         self.dados_ofertas = []
         self.headless = headless
+        self.snapshot_id = None
         
     def _configurar_driver(self):
         """Configura o driver do Selenium."""
@@ -39,7 +50,9 @@ class GarimpadorOfertas:
             chrome_options.add_argument("--window-size=1920,1080")
             chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
             
-            service = Service(ChromeDriverManager().install())
+            # Caminho do chromedriver resolvido uma vez por processo
+            caminho_driver = obter_recurso("driver:chromedriver", lambda: ChromeDriverManager().install())
+            service = Service(caminho_driver)
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.driver.implicitly_wait(10)
             
@@ -220,8 +233,8 @@ class GarimpadorOfertas:
         
         try:
             # Obter credenciais
-            email = os.getenv('HOTMART_EMAIL')
-            password = os.getenv('HOTMART_PASSWORD')
+            email = self.contexto.hotmart_email
+            password = self.contexto.hotmart_password
             
             if not email or not password:
                 logger.warning("⚠️ Credenciais do Hotmart não encontradas")
@@ -384,21 +397,45 @@ class GarimpadorOfertas:
         return ofertas_exemplo
     
     def analisar_dados(self):
-        """Analisa os dados coletados."""
+        """
+        Registra as ofertas coletadas no armazém e retorna os agregados materializados.
+        
+        Os agregados descrevem o catálogo atual de ofertas distintas e são
+        atualizados só para as ofertas novas ou alteradas neste garimpo, sem
+        reprocessar o histórico inteiro (repetir o garimpo não infla os números).
+        """
         if not self.dados_ofertas:
             return {"erro": "Nenhum dado para analisar"}
         
-        df = pd.DataFrame(self.dados_ofertas)
+        from modules.armazem_module import ArmazemOfertas
+        
+        armazem = ArmazemOfertas()
+        self.snapshot_id = armazem.registrar_snapshot(self.dados_ofertas)
         
-        analise = {
-            "total_ofertas": len(df),
-            "plataformas": df['plataforma'].value_counts().to_dict(),
-            "categorias_populares": df.get('categoria', pd.Series()).value_counts().head(5).to_dict(),
-            "resumo": f"Coletadas {len(df)} ofertas de {df['plataforma'].nunique()} plataformas"
-        }
+        analise = armazem.agregados()
+        plataformas_lote = {o.get('plataforma') for o in self.dados_ofertas}
+        analise["snapshot_id"] = self.snapshot_id
+        analise["resumo"] = f"Coletadas {len(self.dados_ofertas)} ofertas de {len(plataformas_lote)} plataformas"
         
         return analise
     
+    def mapear_nichos(self):
+        """Agrupa as ofertas em nichos e anota nicho_id em cada registro."""
+        try:
+            from modules.nichos_module import MapeadorNichos
+            
+            mapeador = MapeadorNichos()
+            df = mapeador.atualizar(self.dados_ofertas)
+            for oferta, nicho_id, rotulo in zip(self.dados_ofertas, df['nicho_id'], df['nicho_rotulo']):
+                oferta['nicho_id'] = int(nicho_id)
+                oferta['nicho_rotulo'] = rotulo
+            
+            # Via JSON para devolver tipos nativos (serializáveis) em vez de numpy
+            return json.loads(mapeador.metricas_nichos(df).to_json(orient='records'))
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao mapear nichos: {e}")
+            return []
+    
     def salvar_dados(self, formato='csv'):
         """Salva os dados coletados."""
         if not self.dados_ofertas:
@@ -419,21 +456,37 @@ class GarimpadorOfertas:
         logger.info(f"📁 Dados salvos em: {filename}")
         return filename
     
-    def executar_garimpo_completo(self):
-        """Executa o garimpo completo."""
+    def executar_garimpo_completo(self, callback_progresso=None):
+        """
+        Executa o garimpo completo.
+        
+        Args:
+            callback_progresso (callable): Opcional, chamado como
+                callback_progresso(percentual, mensagem) a cada etapa. Exceções
+                levantadas por ele (ex.: cancelamento) interrompem o garimpo.
+        """
         logger.info("🚀 === INICIANDO GARIMPO COMPLETO ===")
+        progresso = callback_progresso or (lambda percentual, mensagem=None: None)
         
         try:
+            progresso(5, "Configurando navegador...")
             self._configurar_driver()
             
             # Garimpar ClickBank
+            progresso(15, "Garimpando ClickBank...")
             ofertas_cb = self.garimpar_clickbank_real()
             time.sleep(2)
             
             # Garimpar Hotmart
+            progresso(50, "Garimpando Hotmart...")
             ofertas_hm = self.garimpar_hotmart_real()
             
-            # Analisar dados
+            # Mapear nichos (antes de registrar e salvar, para incluir nicho_id)
+            progresso(80, "Mapeando nichos...")
+            nichos = self.mapear_nichos()
+            
+            # Registrar snapshot e ler agregados
+            progresso(90, "Atualizando agregados...")
             analise = self.analisar_dados()
             
             # Salvar dados
@@ -447,7 +500,9 @@ class GarimpadorOfertas:
                 "analise": analise,
                 "total_ofertas": len(self.dados_ofertas),
                 "clickbank_ofertas": len(ofertas_cb) if ofertas_cb else 0,
-                "hotmart_ofertas": len(ofertas_hm) if ofertas_hm else 0
+                "hotmart_ofertas": len(ofertas_hm) if ofertas_hm else 0,
+                "snapshot_id": self.snapshot_id,
+                "nichos": nichos
             }
             
         except Exception as e:
@@ -461,22 +516,23 @@ class GarimpadorOfertas:
         finally:
             self._fechar_driver()
 
-def iniciar_garimpo(clickbank_user=None, clickbank_pass=None, hotmart_email=None, hotmart_pass=None):
+def iniciar_garimpo(clickbank_user=None, clickbank_pass=None, hotmart_email=None, hotmart_pass=None,
+                    callback_progresso=None, contexto=None):
     """
     Função principal para iniciar o garimpo.
+    
+    As credenciais informadas valem só para esta execução (não são gravadas
+    em os.environ) e têm prioridade sobre as do contexto.
     """
-    # Configurar credenciais se fornecidas
-    if clickbank_user:
-        os.environ['CLICKBANK_USERNAME'] = clickbank_user
-    if clickbank_pass:
-        os.environ['CLICKBANK_PASSWORD'] = clickbank_pass
-    if hotmart_email:
-        os.environ['HOTMART_EMAIL'] = hotmart_email
-    if hotmart_pass:
-        os.environ['HOTMART_PASSWORD'] = hotmart_pass
+    contexto = (contexto or ContextoSessao.do_ambiente()).com(
+        clickbank_username=clickbank_user,
+        clickbank_password=clickbank_pass,
+        hotmart_email=hotmart_email,
+        hotmart_password=hotmart_pass
+    )
     
-    garimpador = GarimpadorOfertas(headless=True)
-    resultado = garimpador.executar_garimpo_completo()
+    garimpador = GarimpadorOfertas(headless=True, contexto=contexto)
+    resultado = garimpador.executar_garimpo_completo(callback_progresso=callback_progresso)
     return resultado
 
 if __name__ == "__main__":
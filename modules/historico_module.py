@@ -0,0 +1,278 @@
+"""
+Módulo de Histórico de Gerações (historico_module.py)
+
+Guarda cada copy e cada entregável gerado, com as entradas, o provedor, o
+modelo, a duração e a contagem de tokens (estimada pelo tamanho do texto,
+ver limites_module.estimar_tokens), para que o usuário reabra um
+resultado antigo na hora em vez de gerar de novo (antes ele só existia no
+botão de download e sumia na próxima reexecução do Streamlit).
+
+O conteúdo é endereçado pelo hash: saídas idênticas (a mesma copy vinda do
+cache de respostas, por exemplo) ocupam um único registro em `conteudos`,
+comprimido com zlib; cada geração em `geracoes` só aponta para ele. As
+buscas por categoria, tipo, nicho e data usam índices e não descomprimem
+nada; o texto só é lido ao abrir uma geração.
+"""
+
+import os
+import json
+import zlib
+import sqlite3
+import hashlib
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from modules.cache_module import obter_recurso
+from modules.limites_module import estimar_tokens
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CAMINHO_HISTORICO = os.path.join("data", "historico.db")
+NIVEL_COMPRESSAO = 6
+
+# Parâmetros dos jobs que não são entradas da geração
+PARAMETROS_IGNORADOS = ("contexto", "usar_cache")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS conteudos (
+    hash TEXT PRIMARY KEY,
+    formato TEXT NOT NULL,
+    dados BLOB NOT NULL,
+    tamanho INTEGER NOT NULL,
+    tamanho_comprimido INTEGER NOT NULL,
+    criado_em TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS geracoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    categoria TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    nicho TEXT NOT NULL DEFAULT '',
+    titulo TEXT NOT NULL DEFAULT '',
+    entradas TEXT NOT NULL,
+    provider TEXT,
+    modelo TEXT,
+    latencia_s REAL,
+    tokens_entrada INTEGER,
+    tokens_saida INTEGER,
+    hash_conteudo TEXT NOT NULL REFERENCES conteudos(hash),
+    criado_em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_geracoes_criado ON geracoes(criado_em);
+CREATE INDEX IF NOT EXISTS idx_geracoes_categoria ON geracoes(categoria, criado_em);
+CREATE INDEX IF NOT EXISTS idx_geracoes_tipo ON geracoes(tipo, criado_em);
+CREATE INDEX IF NOT EXISTS idx_geracoes_nicho ON geracoes(nicho COLLATE NOCASE, criado_em);
+CREATE INDEX IF NOT EXISTS idx_geracoes_conteudo ON geracoes(hash_conteudo);
+"""
+
+COLUNAS_LISTAGEM = ("id", "categoria", "tipo", "nicho", "titulo", "provider", "modelo", "latencia_s",
+                    "tokens_entrada", "tokens_saida", "hash_conteudo", "criado_em")
+
+
+def _serializar(resultado: Any) -> tuple:
+    """(formato, texto) do resultado: texto puro ou JSON (traduções, variações), na ordem original."""
+    if isinstance(resultado, str):
+        return "texto", resultado
+    return "json", json.dumps(resultado, ensure_ascii=False)
+
+
+def _tokens_resultado(resultado: Any) -> int:
+    if isinstance(resultado, str):
+        return estimar_tokens(resultado)
+    if isinstance(resultado, dict):
+        return sum(_tokens_resultado(valor) for valor in resultado.values())
+    if isinstance(resultado, list):
+        return sum(_tokens_resultado(valor) for valor in resultado)
+    return 0
+
+
+class HistoricoGeracoes:
+    """
+    Histórico de gerações em SQLite, com conteúdo deduplicado e comprimido.
+    """
+
+    def __init__(self, caminho: str = CAMINHO_HISTORICO):
+        """
+        Args:
+            caminho (str): Arquivo SQLite do histórico
+        """
+        self.caminho = caminho
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with self._conexao() as conn:
+            conn.executescript(ESQUEMA)
+
+    @contextmanager
+    def _conexao(self):
+        conn = sqlite3.connect(self.caminho, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def gravar(self, categoria: str, tipo: str, entradas: Dict, resultado: Any, provider: str = None,
+               modelo: str = None, latencia_s: float = None, nicho: str = "", titulo: str = "") -> int:
+        """
+        Registra uma geração concluída.
+
+        Args:
+            categoria (str): "copy" ou "entregavel"
+            tipo (str): Subtipo ("copy", "variações", "hooks", "cta", "E-book", "Checklist"...)
+            entradas (dict): Parâmetros da geração (sem credenciais)
+            resultado: Texto gerado, ou dict/list (versões traduzidas, variações)
+            provider (str): Provedor usado
+            modelo (str): Modelo usado
+            latencia_s (float): Duração da geração
+            nicho (str): Nicho (copy) ou tópico (entregável), usado nas buscas
+            titulo (str): Descrição curta para a listagem
+
+        Returns:
+            int: ID da geração
+        """
+        formato, texto = _serializar(resultado)
+        bruto = texto.encode("utf-8")
+        hash_conteudo = hashlib.sha256(f"{formato}:".encode("utf-8") + bruto).hexdigest()
+        agora = datetime.now().isoformat(timespec="seconds")
+        entradas = {chave: valor for chave, valor in entradas.items() if chave not in PARAMETROS_IGNORADOS}
+
+        dados = zlib.compress(bruto, NIVEL_COMPRESSAO)
+        with self._conexao() as conn:
+            # OR IGNORE: dois jobs com a mesma saída podem gravar o conteúdo ao mesmo tempo
+            existe = conn.execute(
+                "INSERT OR IGNORE INTO conteudos VALUES (?, ?, ?, ?, ?, ?)",
+                (hash_conteudo, formato, dados, len(bruto), len(dados), agora),
+            ).rowcount == 0
+            cursor = conn.execute(
+                """
+                INSERT INTO geracoes (categoria, tipo, nicho, titulo, entradas, provider, modelo, latencia_s,
+                                      tokens_entrada, tokens_saida, hash_conteudo, criado_em)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (categoria, tipo, (nicho or "").strip(), (titulo or "").strip()[:120],
+                 json.dumps(entradas, ensure_ascii=False), provider, modelo,
+                 round(latencia_s, 2) if latencia_s is not None else None,
+                 sum(estimar_tokens(v) for v in entradas.values() if isinstance(v, str)),
+                 _tokens_resultado(resultado), hash_conteudo, agora),
+            )
+        logger.info(f"📜 Geração {cursor.lastrowid} registrada no histórico ({categoria}/{tipo}"
+                    f"{', conteúdo repetido' if existe else ''})")
+        return cursor.lastrowid
+
+    def buscar(self, categoria: Optional[str] = None, tipo: Optional[str] = None, nicho: Optional[str] = None,
+               desde: Optional[str] = None, ate: Optional[str] = None, limite: int = 50) -> List[Dict]:
+        """
+        Gerações mais recentes que atendem aos filtros, sem o conteúdo.
+
+        Args:
+            categoria (str): "copy" ou "entregavel"
+            tipo (str): Subtipo exato
+            nicho (str): Nicho/tópico (sem diferenciar maiúsculas)
+            desde (str): Data ISO inicial (inclusive)
+            ate (str): Data ISO final (inclusive; só a data vale o dia inteiro)
+            limite (int): Máximo de linhas
+
+        Returns:
+            list: Dicts com COLUNAS_LISTAGEM e as entradas decodificadas
+        """
+        condicoes, parametros = [], []
+        if categoria:
+            condicoes.append("categoria = ?")
+            parametros.append(categoria)
+        if tipo:
+            condicoes.append("tipo = ?")
+            parametros.append(tipo)
+        if nicho:
+            condicoes.append("nicho = ? COLLATE NOCASE")
+            parametros.append(nicho.strip())
+        if desde:
+            condicoes.append("criado_em >= ?")
+            parametros.append(desde)
+        if ate:
+            condicoes.append("criado_em <= ?")
+            parametros.append(ate if "T" in ate else f"{ate}T23:59:59")
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+        with self._conexao() as conn:
+            linhas = conn.execute(
+                f"SELECT {', '.join(COLUNAS_LISTAGEM)}, entradas FROM geracoes {where} "
+                f"ORDER BY criado_em DESC, id DESC LIMIT ?",
+                (*parametros, limite),
+            ).fetchall()
+        return [{**dict(linha), "entradas": json.loads(linha["entradas"])} for linha in linhas]
+
+    def obter(self, geracao_id: int) -> Optional[Dict]:
+        """
+        Uma geração com o resultado descomprimido.
+
+        Returns:
+            dict: Campos da listagem, entradas e resultado (texto, ou dict/list), ou None
+        """
+        with self._conexao() as conn:
+            linha = conn.execute(
+                f"SELECT {', '.join('g.' + c for c in COLUNAS_LISTAGEM)}, g.entradas, c.formato, c.dados "
+                "FROM geracoes g JOIN conteudos c ON c.hash = g.hash_conteudo WHERE g.id = ?",
+                (geracao_id,),
+            ).fetchone()
+        if not linha:
+            return None
+        geracao = {coluna: linha[coluna] for coluna in COLUNAS_LISTAGEM}
+        texto = zlib.decompress(linha["dados"]).decode("utf-8")
+        geracao["entradas"] = json.loads(linha["entradas"])
+        geracao["resultado"] = json.loads(texto) if linha["formato"] == "json" else texto
+        return geracao
+
+    def remover(self, geracao_id: int):
+        """Apaga a geração e, se nenhuma outra apontar para ele, o conteúdo."""
+        with self._conexao() as conn:
+            linha = conn.execute("SELECT hash_conteudo FROM geracoes WHERE id = ?", (geracao_id,)).fetchone()
+            if not linha:
+                return
+            conn.execute("DELETE FROM geracoes WHERE id = ?", (geracao_id,))
+            conn.execute(
+                "DELETE FROM conteudos WHERE hash = ? AND NOT EXISTS "
+                "(SELECT 1 FROM geracoes WHERE hash_conteudo = ?)",
+                (linha[0], linha[0]),
+            )
+
+    def valores_distintos(self) -> Dict[str, List[str]]:
+        """Opções dos filtros de tipo e nicho."""
+        with self._conexao() as conn:
+            tipos = [l[0] for l in conn.execute("SELECT DISTINCT tipo FROM geracoes ORDER BY tipo")]
+            nichos = [l[0] for l in conn.execute(
+                "SELECT nicho FROM geracoes WHERE nicho != '' "
+                "GROUP BY nicho COLLATE NOCASE ORDER BY nicho COLLATE NOCASE"
+            )]
+        return {"tipo": tipos, "nicho": nichos}
+
+    def metricas(self) -> Dict:
+        """
+        Returns:
+            dict: geracoes, conteudos (únicos), bytes_originais, bytes_comprimidos e
+                taxa_compressao (comprimido / original)
+        """
+        with self._conexao() as conn:
+            geracoes = conn.execute("SELECT COUNT(*) FROM geracoes").fetchone()[0]
+            conteudos, originais, comprimidos = conn.execute(
+                "SELECT COUNT(*), IFNULL(SUM(tamanho), 0), IFNULL(SUM(tamanho_comprimido), 0) FROM conteudos"
+            ).fetchone()
+        return {
+            "geracoes": geracoes,
+            "conteudos": conteudos,
+            "bytes_originais": originais,
+            "bytes_comprimidos": comprimidos,
+            "taxa_compressao": round(comprimidos / originais, 3) if originais else 0.0,
+        }
+
+
+def obter_historico() -> HistoricoGeracoes:
+    """Histórico de gerações único do processo."""
+    return obter_recurso("historico", HistoricoGeracoes)
@@ -0,0 +1,554 @@
+"""
+Módulo de Jobs em Segundo Plano (jobs_module.py)
+
+Executa garimpos e gerações de copy/entregáveis em um pool de workers local,
+fora da execução do script do Streamlit. Cada job fica registrado em uma
+tabela SQLite com status, percentual de progresso, resultado parcial,
+resultado final e pedido de cancelamento. A interface apenas submete o job e
+consulta seu estado, então o usuário pode trocar de página e vários jobs
+podem rodar ao mesmo tempo.
+"""
+
+import os
+import json
+import uuid
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Backends pesados (garimpo, copy, entregáveis) passam pelo registro: a importação
+# acontece no primeiro job e aparece no tempo de importação do app
+from modules.carregador_module import registro_modulos
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CAMINHO_JOBS = os.path.join("data", "jobs.db")
+
+# Estados possíveis de um job
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDO = "concluido"
+ERRO = "erro"
+CANCELADO = "cancelado"
+ESTADOS_FINAIS = (CONCLUIDO, ERRO, CANCELADO)
+
+# Cada processo (app, API) marca os jobs que executa e renova o batimento;
+# só são dados como interrompidos os jobs de donos que morreram ou pararam de bater
+INTERVALO_BATIMENTO_S = 10.0
+VALIDADE_BATIMENTO_S = 60.0
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progresso REAL NOT NULL DEFAULT 0,
+    mensagem TEXT,
+    parametros TEXT,
+    resultado_parcial TEXT,
+    resultado TEXT,
+    erro TEXT,
+    cancelamento_solicitado INTEGER NOT NULL DEFAULT 0,
+    criado_em TEXT NOT NULL,
+    iniciado_em TEXT,
+    concluido_em TEXT,
+    dono TEXT,
+    batimento REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_criado ON jobs(criado_em);
+"""
+
+# Colunas acrescentadas depois da primeira versão da tabela
+COLUNAS_NOVAS = {"dono": "TEXT", "batimento": "REAL"}
+
+
+class JobCancelado(Exception):
+    """Levantada dentro de um job quando o cancelamento foi solicitado."""
+
+
+def _processo_vivo(dono: Optional[str]) -> bool:
+    """Indica se o dono (host:pid:uuid) ainda existe; donos de outro host contam como vivos."""
+    try:
+        host, pid, _ = dono.split(":")
+        if host != socket.gethostname():
+            return True
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (AttributeError, ValueError, PermissionError, OSError):
+        return True
+    return True
+
+
+def _json(valor) -> Optional[str]:
+    if valor is None:
+        return None
+    return json.dumps(valor, ensure_ascii=False, default=str)
+
+
+class ContextoJob:
+    """
+    Canal entre a função do job e a tabela de jobs.
+
+    A função recebe este objeto para reportar progresso e resultados parciais
+    e para verificar se o usuário pediu o cancelamento.
+    """
+
+    def __init__(self, gerenciador: "GerenciadorJobs", job_id: str):
+        self.gerenciador = gerenciador
+        self.job_id = job_id
+
+    def reportar(self, progresso: float, mensagem: Optional[str] = None, parcial: Any = None):
+        """
+        Atualiza o progresso (0 a 100) e, opcionalmente, o resultado parcial.
+
+        Raises:
+            JobCancelado: Se o cancelamento foi solicitado
+        """
+        campos = {"progresso": max(0.0, min(100.0, float(progresso)))}
+        if mensagem is not None:
+            campos["mensagem"] = mensagem
+        if parcial is not None:
+            campos["resultado_parcial"] = _json(parcial)
+        self.gerenciador._atualizar(self.job_id, **campos)
+        self.verificar_cancelamento()
+
+    def cancelado(self) -> bool:
+        """Indica se o cancelamento foi solicitado."""
+        return self.gerenciador._cancelamento_solicitado(self.job_id)
+
+    def verificar_cancelamento(self):
+        """Interrompe o job se o cancelamento foi solicitado."""
+        if self.cancelado():
+            raise JobCancelado(self.job_id)
+
+
+class GerenciadorJobs:
+    """
+    Pool de workers local com tabela persistente de jobs.
+    """
+
+    def __init__(self, caminho: str = CAMINHO_JOBS, max_workers: int = 4):
+        """
+        Inicializa o gerenciador e marca como interrompidos os jobs órfãos:
+        os de processos que terminaram ou cujo batimento venceu. Jobs de
+        outros processos vivos (a API e o app dividem a tabela) são mantidos.
+
+        Args:
+            caminho (str): Caminho do arquivo SQLite da tabela de jobs
+            max_workers (int): Número de jobs executados em paralelo
+        """
+        self.caminho = caminho
+        self.dono = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tipos: Dict[str, Callable] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._trava = threading.Lock()
+
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with self._conexao() as conn:
+            conn.executescript(ESQUEMA)
+            existentes = {linha["name"] for linha in conn.execute("PRAGMA table_info(jobs)")}
+            for coluna, tipo in COLUNAS_NOVAS.items():
+                if coluna not in existentes:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {coluna} {tipo}")
+        self._recolher_orfaos()
+
+        self._batimento = threading.Thread(target=self._bater, name="jobs-batimento", daemon=True)
+        self._batimento.start()
+
+    @contextmanager
+    def _conexao(self):
+        conn = sqlite3.connect(self.caminho, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _bater(self):
+        """Renova o batimento dos jobs deste processo e recolhe os órfãos dos outros."""
+        while True:
+            time.sleep(INTERVALO_BATIMENTO_S)
+            try:
+                with self._trava, self._conexao() as conn:
+                    conn.execute(
+                        "UPDATE jobs SET batimento = ? WHERE dono = ? AND status IN (?, ?)",
+                        (time.time(), self.dono, PENDENTE, EXECUTANDO),
+                    )
+                self._recolher_orfaos()
+            except Exception as e:
+                logger.error(f"Erro ao renovar o batimento dos jobs: {e}")
+
+    def _recolher_orfaos(self):
+        """Marca como erro os jobs em andamento cujo dono morreu ou parou de bater."""
+        limite = time.time() - VALIDADE_BATIMENTO_S
+        with self._trava, self._conexao() as conn:
+            linhas = conn.execute(
+                "SELECT id, dono, batimento FROM jobs WHERE status IN (?, ?) AND (dono IS NULL OR dono != ?)",
+                (PENDENTE, EXECUTANDO, self.dono),
+            ).fetchall()
+            orfaos = [
+                linha["id"] for linha in linhas
+                if linha["batimento"] is None or linha["batimento"] < limite or not _processo_vivo(linha["dono"])
+            ]
+            if orfaos:
+                conn.execute(
+                    f"UPDATE jobs SET status = ?, erro = ?, concluido_em = ? "
+                    f"WHERE id IN ({', '.join('?' * len(orfaos))}) AND status IN (?, ?)",
+                    (ERRO, "Interrompido: o processo que executava o job terminou",
+                     datetime.now().isoformat(), *orfaos, PENDENTE, EXECUTANDO),
+                )
+        if orfaos:
+            logger.warning(f"⚠️ {len(orfaos)} job(s) órfão(s) marcados como interrompidos")
+
+    def _atualizar(self, job_id: str, **campos):
+        atribuicoes = ", ".join(f"{campo} = ?" for campo in campos)
+        with self._trava, self._conexao() as conn:
+            conn.execute(f"UPDATE jobs SET {atribuicoes} WHERE id = ?", (*campos.values(), job_id))
+
+    def _cancelamento_solicitado(self, job_id: str) -> bool:
+        with self._conexao() as conn:
+            linha = conn.execute("SELECT cancelamento_solicitado FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(linha and linha[0])
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def registrar_tipo(self, tipo: str, funcao: Callable):
+        """
+        Registra a função que executa um tipo de job.
+
+        Args:
+            tipo (str): Nome do tipo (ex.: "garimpo")
+            funcao (callable): funcao(job: ContextoJob, **parametros) -> resultado serializável
+        """
+        self._tipos[tipo] = funcao
+
+    def submeter(self, tipo: str, parametros: Optional[Dict] = None, segredos: Optional[Dict] = None) -> str:
+        """
+        Cria o job e o coloca na fila do pool de workers.
+
+        Args:
+            tipo (str): Tipo registrado
+            parametros (dict): Parâmetros persistidos junto com o job
+            segredos (dict): Parâmetros sensíveis (senhas, chaves, ContextoSessao),
+                passados à função mas nunca gravados na tabela
+
+        Returns:
+            str: ID do job
+        """
+        if tipo not in self._tipos:
+            raise ValueError(f"Tipo de job desconhecido: {tipo}")
+
+        job_id = uuid.uuid4().hex
+        parametros = parametros or {}
+        with self._trava, self._conexao() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, tipo, status, parametros, criado_em, dono, batimento) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, tipo, PENDENTE, _json(parametros), datetime.now().isoformat(), self.dono, time.time()),
+            )
+
+        self._executor.submit(self._executar, job_id, tipo, {**parametros, **(segredos or {})})
+        logger.info(f"📥 Job {tipo} submetido: {job_id}")
+        return job_id
+
+    def _executar(self, job_id: str, tipo: str, parametros: Dict):
+        contexto = ContextoJob(self, job_id)
+        if contexto.cancelado():
+            self._atualizar(job_id, status=CANCELADO, concluido_em=datetime.now().isoformat())
+            return
+
+        self._atualizar(job_id, status=EXECUTANDO, iniciado_em=datetime.now().isoformat())
+        try:
+            resultado = self._tipos[tipo](contexto, **parametros)
+            self._atualizar(
+                job_id, status=CONCLUIDO, progresso=100.0, resultado=_json(resultado),
+                concluido_em=datetime.now().isoformat(),
+            )
+            logger.info(f"✅ Job {tipo} concluído: {job_id}")
+        except JobCancelado:
+            self._atualizar(job_id, status=CANCELADO, concluido_em=datetime.now().isoformat())
+            logger.info(f"🛑 Job {tipo} cancelado: {job_id}")
+        except Exception as e:
+            logger.error(f"❌ Erro no job {tipo} ({job_id}): {e}")
+            self._atualizar(job_id, status=ERRO, erro=str(e), concluido_em=datetime.now().isoformat())
+
+    def cancelar(self, job_id: str):
+        """Solicita o cancelamento; o job para no próximo ponto de verificação."""
+        self._atualizar(job_id, cancelamento_solicitado=1)
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """
+        Retorna o estado atual do job.
+
+        Returns:
+            dict: Campos da tabela, com parametros/resultado_parcial/resultado já decodificados
+        """
+        with self._conexao() as conn:
+            linha = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._decodificar(linha) if linha else None
+
+    def listar(self, ids: Optional[List[str]] = None, tipo: Optional[str] = None, limite: int = 20) -> List[Dict]:
+        """Lista os jobs mais recentes, opcionalmente filtrando por IDs e tipo."""
+        condicoes, parametros = [], []
+        if ids is not None:
+            if not ids:
+                return []
+            condicoes.append(f"id IN ({', '.join('?' * len(ids))})")
+            parametros.extend(ids)
+        if tipo:
+            condicoes.append("tipo = ?")
+            parametros.append(tipo)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+        with self._conexao() as conn:
+            linhas = conn.execute(
+                f"SELECT * FROM jobs {where} ORDER BY criado_em DESC LIMIT ?", (*parametros, limite)
+            ).fetchall()
+        return [self._decodificar(linha) for linha in linhas]
+
+    @staticmethod
+    def _decodificar(linha) -> Dict:
+        job = dict(linha)
+        for campo in ("parametros", "resultado_parcial", "resultado"):
+            if job.get(campo):
+                job[campo] = json.loads(job[campo])
+        job["finalizado"] = job["status"] in ESTADOS_FINAIS
+        return job
+
+
+# ----------------------------------------------------------------------
+# Tipos de job padrão
+# ----------------------------------------------------------------------
+def _job_garimpo(job: ContextoJob, contexto=None, plataformas: Optional[List[str]] = None, **credenciais):
+    """
+    Garimpo completo. `plataformas` só descreve o job na tabela (as plataformas
+    garimpadas são as que têm credenciais).
+    """
+    iniciar_garimpo = registro_modulos.obter("garimpo", "iniciar_garimpo")
+
+    job.reportar(0, "Iniciando garimpo...")
+    resultado = iniciar_garimpo(**credenciais, callback_progresso=job.reportar, contexto=contexto)
+
+    # O garimpo captura as próprias exceções; o cancelamento é verificado de novo aqui
+    job.verificar_cancelamento()
+    if not resultado.get("sucesso"):
+        raise RuntimeError(resultado.get("erro", "Erro desconhecido"))
+    return resultado
+
+
+def _consumir_stream(job: ContextoJob, trechos, mensagem: str, intervalo: float = 0.5) -> str:
+    """
+    Acumula os trechos de uma geração em streaming, publicando o texto parcial.
+
+    O texto parcial é gravado no máximo a cada `intervalo` segundos (junto com
+    o tempo até o primeiro trecho), o que também serve de ponto de
+    verificação de cancelamento. Ao final, o resultado parcial guarda apenas
+    as métricas, já que o texto completo vai para o resultado do job.
+
+    Se o trecho veio do fallback dos templates, o texto volta como
+    RespostaFallback, para o histórico não atribuí-lo ao provedor pedido.
+    """
+    RespostaFallback = registro_modulos.obter("copy", "RespostaFallback")
+
+    inicio = time.perf_counter()
+    ttft = None
+    ultimo_envio = 0.0
+    partes = []
+
+    for trecho in trechos:
+        partes.append(trecho)
+        agora = time.perf_counter()
+        if ttft is None:
+            ttft = round(agora - inicio, 2)
+        if agora - ultimo_envio >= intervalo:
+            ultimo_envio = agora
+            texto = "".join(partes)
+            # Sem o total de tokens, o progresso é estimado pelo tamanho (~8000 caracteres)
+            job.reportar(min(95.0, 10 + len(texto) / 90), mensagem, parcial={"texto": texto, "ttft_s": ttft})
+
+    texto = "".join(partes)
+    if not texto.strip():
+        raise RuntimeError("O provedor não retornou conteúdo")
+    if any(isinstance(parte, RespostaFallback) for parte in partes):
+        texto = RespostaFallback(texto)
+    job.reportar(100, mensagem, parcial={"ttft_s": ttft, "duracao_s": round(time.perf_counter() - inicio, 2)})
+    return texto
+
+
+def _job_copy(job: ContextoJob, copy_original: str, nicho: str = "", publico_alvo: str = "",
+              provider: str = "manus", usar_cache: bool = True, secao: Optional[str] = None,
+              variacoes: int = 1, contexto=None):
+    gerar_copy_modelada_stream, gerar_variacoes_copy, regenerar_secao_copy = registro_modulos.obter(
+        "copy", "gerar_copy_modelada_stream", "gerar_variacoes_copy", "regenerar_secao_copy"
+    )
+
+    if variacoes > 1:
+        job.reportar(10, f"Gerando {variacoes} variações...")
+        inicio = time.perf_counter()
+        ranqueadas = gerar_variacoes_copy(copy_original, nicho, publico_alvo, variacoes, provider, contexto=contexto)
+        duracao = time.perf_counter() - inicio
+        job.reportar(100, "Variações ranqueadas", parcial={"duracao_s": round(duracao, 2)})
+        _gravar_historico("copy", "variações", ranqueadas, provider, duracao, nicho, copy_original,
+                          {"copy_original": copy_original, "nicho": nicho, "publico_alvo": publico_alvo,
+                           "variacoes": variacoes})
+        return {"variacoes": ranqueadas}
+
+    if secao:
+        # Só os hooks ou só a CTA: prompt curto, demais seções vindas do cache
+        mensagem = f"Refazendo {'os hooks' if secao == 'hooks' else 'a chamada para ação'}..."
+        job.reportar(10, mensagem)
+        inicio = time.perf_counter()
+        texto = regenerar_secao_copy(copy_original, secao, nicho, publico_alvo, provider,
+                                     contexto=contexto, usar_cache=usar_cache)
+        duracao = time.perf_counter() - inicio
+        job.reportar(100, mensagem, parcial={"duracao_s": round(duracao, 2)})
+        _gravar_historico("copy", secao, texto, provider, duracao, nicho, copy_original,
+                          {"copy_original": copy_original, "nicho": nicho, "publico_alvo": publico_alvo,
+                           "secao": secao})
+        return texto
+
+    job.reportar(5, "Modelando copy...")
+    inicio = time.perf_counter()
+    trechos = gerar_copy_modelada_stream(copy_original, nicho, publico_alvo, provider,
+                                         contexto=contexto, usar_cache=usar_cache)
+    texto = _consumir_stream(job, trechos, "Modelando copy...")
+    _gravar_historico("copy", "copy", texto, provider, time.perf_counter() - inicio, nicho, copy_original,
+                      {"copy_original": copy_original, "nicho": nicho, "publico_alvo": publico_alvo})
+    return texto
+
+
+def _job_entregavel(job: ContextoJob, topico: str, tipo: str, idioma: str = "pt",
+                    publico_alvo: str = "", provider: str = "openai", usar_cache: bool = True,
+                    traducoes: Optional[List[str]] = None, rascunho: Optional[str] = None, contexto=None):
+    CAPITULOS_POR_TIPO, gerar_entregavel_stream = registro_modulos.obter(
+        "entregaveis", "CAPITULOS_POR_TIPO", "gerar_entregavel_stream"
+    )
+
+    job.reportar(5, "Criando entregável...")
+    inicio = time.perf_counter()
+    if tipo in CAPITULOS_POR_TIPO:
+        documento = _job_entregavel_longo(job, topico, tipo, idioma, publico_alvo, provider, usar_cache,
+                                          rascunho, contexto)
+    else:
+        trechos = gerar_entregavel_stream(topico, tipo, idioma, publico_alvo, provider,
+                                          contexto=contexto, usar_cache=usar_cache)
+        documento = _consumir_stream(job, trechos, "Criando entregável...")
+
+    traducoes = [i for i in traducoes or [] if i != idioma]
+    resultado = documento
+    if traducoes:
+        resultado = {"idioma": idioma, "versoes": {idioma: documento, **_traduzir(job, documento, idioma, traducoes,
+                                                                                 provider, usar_cache, contexto)}}
+    _gravar_historico("entregavel", tipo, resultado, provider, time.perf_counter() - inicio, topico, topico,
+                      {"topico": topico, "tipo": tipo, "idioma": idioma, "publico_alvo": publico_alvo,
+                       "traducoes": traducoes})
+    return resultado
+
+
+def _gravar_historico(categoria: str, tipo: str, resultado: Any, provider: str, latencia_s: float,
+                      nicho: str, titulo: str, entradas: Dict):
+    """
+    Registra a geração no histórico; uma falha aqui nunca derruba o job.
+
+    Texto do fallback dos templates fica registrado como da Manus AI (quem
+    de fato respondeu), não do provedor pedido. No provedor "auto" o modelo
+    fica como "auto": o roteador não informa qual provedor respondeu.
+    """
+    from modules.llm_module import MODELOS
+
+    RespostaFallback = registro_modulos.obter("copy", "RespostaFallback")
+    obter_historico = registro_modulos.obter("historico", "obter_historico")
+
+    texto = resultado if isinstance(resultado, str) else ""
+    if not resultado or texto.startswith("Erro ao"):
+        return
+    if isinstance(resultado, RespostaFallback):
+        provider = "manus"
+    modelo = MODELOS.get(provider) or ("templates" if provider == "manus" else provider)
+    try:
+        obter_historico().gravar(categoria, tipo, entradas, resultado, provider=provider, modelo=modelo,
+                                 latencia_s=latencia_s, nicho=nicho, titulo=" ".join(titulo.split()))
+    except Exception as e:
+        logger.error(f"Erro ao registrar geração no histórico: {e}")
+
+
+def _traduzir(job: ContextoJob, documento: str, idioma: str, traducoes: List[str],
+              provider: str, usar_cache: bool, contexto=None) -> Dict[str, str]:
+    """Versões traduzidas a partir da versão mestre já gerada (ver traducao_module)."""
+    from modules.motor_geracao_module import GeracaoCancelada
+    from modules.traducao_module import TradutorEntregaveis
+
+    job.reportar(95, f"Traduzindo para {', '.join(traducoes)}...")
+    tradutor = TradutorEntregaveis(provider=provider, contexto=contexto, usar_cache=usar_cache)
+    try:
+        versoes = tradutor.traduzir(documento, idioma, traducoes, cancelado=job.cancelado)
+    except GeracaoCancelada:
+        raise JobCancelado(job.job_id)
+    parcial = job.gerenciador.status(job.job_id).get("resultado_parcial")
+    parcial = parcial if isinstance(parcial, dict) else {}
+    job.gerenciador._atualizar(job.job_id, resultado_parcial=_json({**parcial, "traducao": tradutor.ultima_execucao}))
+    return versoes
+
+
+def _job_entregavel_longo(job: ContextoJob, topico: str, tipo: str, idioma: str, publico_alvo: str,
+                          provider: str, usar_cache: bool, rascunho: Optional[str] = None, contexto=None):
+    """
+    Entregável longo: sumário + capítulos em paralelo, publicando o documento a cada capítulo.
+
+    O cancelamento é verificado pelo próprio motor de geração; os capítulos
+    prontos ficam no rascunho do job, e um novo job com `rascunho` igual ao ID
+    deste (o botão Retomar) continua dali.
+    """
+    gerar_entregavel_longo = registro_modulos.obter("entregaveis", "gerar_entregavel_longo")
+    from modules.motor_geracao_module import GeracaoCancelada
+
+    def ao_progredir(progresso, mensagem, documento):
+        try:
+            job.reportar(progresso, mensagem, parcial={"texto": documento})
+        except JobCancelado:
+            pass  # o lote em andamento é interrompido pela verificação do motor
+
+    inicio = time.perf_counter()
+    try:
+        documento = gerar_entregavel_longo(topico, tipo, idioma, publico_alvo, provider, contexto=contexto,
+                                           usar_cache=usar_cache, ao_progredir=ao_progredir, cancelado=job.cancelado,
+                                           rascunho=rascunho or job.job_id)
+    except GeracaoCancelada:
+        raise JobCancelado(job.job_id)
+    # O documento já está completo (e o rascunho descartado): um cancelamento tardio não o descarta
+    job.gerenciador._atualizar(job.job_id, progresso=100.0, mensagem="Entregável montado",
+                               resultado_parcial=_json({"duracao_s": round(time.perf_counter() - inicio, 2)}))
+    return documento
+
+
+_gerenciador: Optional[GerenciadorJobs] = None
+_trava_gerenciador = threading.Lock()
+
+
+def obter_gerenciador(max_workers: int = 4) -> GerenciadorJobs:
+    """
+    Gerenciador único do processo, com os tipos padrão já registrados.
+
+    Args:
+        max_workers (int): Tamanho do pool (usado apenas na primeira chamada)
+    """
+    global _gerenciador
+    with _trava_gerenciador:
+        if _gerenciador is None:
+            _gerenciador = GerenciadorJobs(max_workers=max_workers)
+            _gerenciador.registrar_tipo("garimpo", _job_garimpo)
+            _gerenciador.registrar_tipo("copy", _job_copy)
+            _gerenciador.registrar_tipo("entregavel", _job_entregavel)
+    return _gerenciador
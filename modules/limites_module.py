@@ -0,0 +1,237 @@
+"""
+Módulo de Limites de Taxa (limites_module.py)
+
+Mantém as chamadas aos provedores de IA dentro dos limites de requisições
+por minuto (RPM) e tokens por minuto (TPM) de cada combinação provedor +
+chave de API. Cada combinação tem dois baldes de fichas que se reabastecem
+continuamente; uma chamada só sai quando há fichas para a requisição e para
+os tokens estimados (prompt + limite de resposta, que é como os provedores
+contabilizam o TPM). Quem não cabe espera na fila em vez de levar um 429.
+
+Quando um 429 chega mesmo assim, o tempo de retry-after do provedor bloqueia
+a combinação inteira, não só a chamada que falhou, e a chamada é refeita.
+Erros transitórios (5xx, timeout, conexão) também são refeitos, só que com
+recuo exponencial na própria chamada, sem bloquear a chave.
+
+Configuração (variáveis de ambiente, opcionais):
+    OPENAI_RPM / OPENAI_TPM    Padrão: 500 / 200000
+    GEMINI_RPM / GEMINI_TPM    Padrão: 60 / 1000000
+"""
+
+import os
+import math
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LIMITES_PADRAO = {
+    "openai": (int(os.getenv("OPENAI_RPM", "500")), int(os.getenv("OPENAI_TPM", "200000"))),
+    "gemini": (int(os.getenv("GEMINI_RPM", "60")), int(os.getenv("GEMINI_TPM", "1000000"))),
+}
+
+# Espera usada quando o 429 não informa retry-after
+ESPERA_429_PADRAO_S = 5.0
+MAX_TENTATIVAS_429 = 4
+
+# Recuo dos erros transitórios: 0,5s, 1s, 2s... (limitado), com variação aleatória
+RECUO_BASE_S = 0.5
+RECUO_MAXIMO_S = 8.0
+STATUS_TRANSITORIOS = {408, 409, 500, 502, 503, 504}
+ERROS_TRANSITORIOS = {
+    # openai / httpx
+    "APIConnectionError", "APITimeoutError", "InternalServerError", "ConnectError", "ConnectTimeout",
+    "ReadTimeout", "ReadError", "WriteTimeout", "PoolTimeout", "RemoteProtocolError",
+    # google.api_core
+    "ServiceUnavailable", "DeadlineExceeded", "GatewayTimeout", "ServerError", "Aborted",
+}
+
+
+def estimar_tokens(texto: str) -> int:
+    """
+    Estimativa local de tokens, sem tokenizador.
+
+    Em português os tokenizadores dos provedores ficam perto de 3,5
+    caracteres por token; palavras curtas e pontuação puxam para cima, então
+    a estimativa usa o maior entre os dois critérios.
+    """
+    if not texto:
+        return 0
+    return max(math.ceil(len(texto) / 3.5), len(texto.split()))
+
+
+def tempo_retry_after(erro: Exception) -> Optional[float]:
+    """
+    Segundos a esperar se o erro for um limite de taxa (429), ou None.
+
+    Lê retry-after-ms / retry-after dos cabeçalhos quando o SDK os expõe
+    (OpenAI); para o Gemini (ResourceExhausted) usa a espera padrão.
+    """
+    resposta = getattr(erro, "response", None)
+    cabecalhos = getattr(resposta, "headers", None) or {}
+    status = getattr(erro, "status_code", None) or getattr(resposta, "status_code", None) or getattr(erro, "code", None)
+
+    eh_429 = status == 429 or type(erro).__name__ in ("RateLimitError", "ResourceExhausted")
+    if not eh_429:
+        return None
+
+    for cabecalho, escala in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        valor = cabecalhos.get(cabecalho)
+        if valor:
+            try:
+                return max(0.0, float(valor) * escala)
+            except ValueError:
+                pass  # retry-after também pode vir como data HTTP
+    return ESPERA_429_PADRAO_S
+
+
+def tempo_recuo_transitorio(erro: Exception, tentativa: int) -> Optional[float]:
+    """
+    Segundos a esperar antes de refazer a chamada, se o erro for transitório, ou None.
+
+    Transitórios são os que o SDK da OpenAI refaria por conta própria: 5xx,
+    408/409, timeouts e falhas de conexão (e os equivalentes do Gemini).
+    """
+    resposta = getattr(erro, "response", None)
+    status = getattr(erro, "status_code", None) or getattr(resposta, "status_code", None) or getattr(erro, "code", None)
+    transitorio = (
+        isinstance(erro, (TimeoutError, ConnectionError))
+        or type(erro).__name__ in ERROS_TRANSITORIOS
+        or (isinstance(status, int) and status in STATUS_TRANSITORIOS)
+    )
+    if not transitorio:
+        return None
+    return min(RECUO_MAXIMO_S, RECUO_BASE_S * 2 ** tentativa) * random.uniform(0.75, 1.25)
+
+
+class BaldeLimites:
+    """
+    Baldes de requisições e de tokens de uma combinação provedor + chave.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requisicoes = float(rpm)
+        self.tokens = float(tpm)
+        self.atualizado_em = time.monotonic()
+        self.bloqueado_ate = 0.0
+
+    def _reabastecer(self, agora: float):
+        decorrido = agora - self.atualizado_em
+        self.requisicoes = min(self.rpm, self.requisicoes + decorrido * self.rpm / 60)
+        self.tokens = min(self.tpm, self.tokens + decorrido * self.tpm / 60)
+        self.atualizado_em = agora
+
+    def reservar(self, tokens: int) -> float:
+        """
+        Reserva uma requisição e `tokens` tokens, se couberem agora.
+
+        Returns:
+            float: 0 se reservou; senão, segundos até a reserva caber
+        """
+        agora = time.monotonic()
+        if agora < self.bloqueado_ate:
+            return self.bloqueado_ate - agora
+
+        self._reabastecer(agora)
+        tokens = min(tokens, self.tpm)  # um pedido maior que o TPM inteiro ainda precisa sair
+        falta_req = max(0.0, 1 - self.requisicoes) * 60 / self.rpm
+        falta_tok = max(0.0, tokens - self.tokens) * 60 / self.tpm
+        espera = max(falta_req, falta_tok)
+        if espera > 0:
+            return espera
+
+        self.requisicoes -= 1
+        self.tokens -= tokens
+        return 0.0
+
+
+class AgendadorLimites:
+    """
+    Fila de espera por provedor + chave, compartilhada por threads e pelo motor assíncrono.
+    """
+
+    def __init__(self, limites: Optional[Dict[str, Tuple[int, int]]] = None):
+        """
+        Args:
+            limites (dict): provider -> (rpm, tpm) (padrão: LIMITES_PADRAO)
+        """
+        self.limites = limites or LIMITES_PADRAO
+        self._baldes: Dict[Tuple[str, str], BaldeLimites] = {}
+        self._trava = threading.Lock()
+        self._metricas: Dict[str, Dict] = {}
+
+    def _balde(self, provider: str, chave: str) -> BaldeLimites:
+        balde = self._baldes.get((provider, chave))
+        if balde is None:
+            rpm, tpm = self.limites.get(provider, (60, 100000))
+            balde = self._baldes[(provider, chave)] = BaldeLimites(rpm, tpm)
+        return balde
+
+    def _metrica(self, provider: str) -> Dict:
+        return self._metricas.setdefault(provider, {"requisicoes": 0, "tokens": 0, "espera_s": 0.0, "erros_429": 0})
+
+    def _tentar(self, provider: str, chave: str, tokens: int) -> float:
+        with self._trava:
+            espera = self._balde(provider, chave).reservar(tokens)
+            if espera == 0:
+                metrica = self._metrica(provider)
+                metrica["requisicoes"] += 1
+                metrica["tokens"] += tokens
+            return espera
+
+    def _registrar_espera(self, provider: str, segundos: float):
+        with self._trava:
+            self._metrica(provider)["espera_s"] += segundos
+
+    def aguardar(self, provider: str, chave: str, tokens: int):
+        """Bloqueia a thread atual até a chamada caber nos limites."""
+        while True:
+            espera = self._tentar(provider, chave, tokens)
+            if espera == 0:
+                return
+            self._registrar_espera(provider, espera)
+            time.sleep(espera)
+
+    async def aguardar_async(self, provider: str, chave: str, tokens: int):
+        """Versão assíncrona de aguardar(), para o motor de geração."""
+        while True:
+            espera = self._tentar(provider, chave, tokens)
+            if espera == 0:
+                return
+            self._registrar_espera(provider, espera)
+            await asyncio.sleep(espera)
+
+    def penalizar(self, provider: str, chave: str, segundos: float):
+        """Bloqueia a combinação provedor + chave após um 429 (respeitando retry-after)."""
+        with self._trava:
+            balde = self._balde(provider, chave)
+            balde.bloqueado_ate = max(balde.bloqueado_ate, time.monotonic() + segundos)
+            self._metrica(provider)["erros_429"] += 1
+        logger.warning(f"⏳ Limite de taxa do {provider}: aguardando {segundos:.1f}s")
+
+    def metricas(self) -> Dict[str, Dict]:
+        """Requisições, tokens estimados, tempo total de espera e 429s por provedor."""
+        with self._trava:
+            return {provider: {**valores, "espera_s": round(valores["espera_s"], 1)}
+                    for provider, valores in self._metricas.items()}
+
+
+_agendador: Optional[AgendadorLimites] = None
+_trava_agendador = threading.Lock()
+
+
+def obter_agendador() -> AgendadorLimites:
+    """Agendador de limites único do processo."""
+    global _agendador
+    with _trava_agendador:
+        if _agendador is None:
+            _agendador = AgendadorLimites()
+    return _agendador
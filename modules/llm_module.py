@@ -0,0 +1,418 @@
+"""
+Módulo de Clientes LLM (llm_module.py)
+
+Camada única de acesso aos provedores de IA usada pelo CerebroCopy e pelo
+CriadorEntregaveis. Concentra em um só lugar os nomes dos modelos, os
+timeouts, o limite de tokens, o pool de conexões HTTP keep-alive e os
+limites de taxa por chave (limites_module); cada combinação provedor +
+chave de API tem um único cliente de longa duração no processo,
+reaproveitado por todas as sessões, jobs e chamadas das funções de
+conveniência.
+
+Prompts montados com prompts_module.montar_prompt() têm o prefixo estático
+enviado como mensagem de sistema (OpenAI) ou no início do texto (Gemini),
+para aproveitar o cache de prompt do provedor; cada requisição registra os
+tokens em cache e a latência em prompts_module.MetricasPrompt.
+
+Configuração (variáveis de ambiente, todas opcionais):
+    OPENAI_MODEL        Modelo da OpenAI (padrão: gpt-3.5-turbo)
+    GEMINI_MODEL        Modelo do Gemini (padrão: gemini-1.5-flash)
+    LLM_MAX_TOKENS      Limite de tokens da resposta (padrão: 2000)
+    LLM_TIMEOUT         Timeout de leitura por requisição, em segundos (padrão: 60)
+    LLM_POOL_CONEXOES   Conexões keep-alive mantidas por cliente (padrão: 20)
+    OPENAI_BASE_URL     Endpoint compatível com a OpenAI (padrão: API oficial)
+    GEMINI_BASE_URL     Endpoint REST do Gemini (padrão: API oficial, via gRPC)
+
+Os dois endpoints servem para apontar o ecossistema para o simulador local
+(simulador_llm.py) em testes de carga.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterator, List, Optional
+
+from modules.cache_module import obter_recurso, chave_segura
+from modules.contexto_module import ContextoSessao
+from modules.limites_module import (MAX_TENTATIVAS_429, estimar_tokens, obter_agendador, tempo_recuo_transitorio,
+                                   tempo_retry_after)
+from modules.prompts_module import dividir_prompt, obter_metricas_prompt, prompt_unico
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODELOS = {
+    "openai": os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
+    "gemini": os.getenv("GEMINI_MODEL", "gemini-1.5-flash"),
+}
+MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "2000"))
+TIMEOUT_S = float(os.getenv("LLM_TIMEOUT", "60"))
+TIMEOUT_CONEXAO_S = 10.0
+POOL_CONEXOES = int(os.getenv("LLM_POOL_CONEXOES", "20"))
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL")  # None: API oficial
+
+
+class ClienteLLM:
+    """
+    Interface comum dos provedores: geração completa, em streaming e assíncrona.
+
+    Os métodos públicos passam pelo agendador de limites (limites_module)
+    antes de cada chamada e refazem a chamada após um 429 ou um erro
+    transitório (5xx, timeout, conexão); as subclasses
+    implementam apenas _gerar, _gerar_stream e _gerar_async (e
+    _gerar_varios_async, se a API gerar várias respostas em uma chamada).
+    """
+
+    provider = None
+    suporta_n = False  # a API devolve N respostas para o mesmo prompt em uma chamada
+
+    def __init__(self, api_key: str, modelo: Optional[str] = None):
+        """
+        Args:
+            api_key (str): Chave de API do provedor
+            modelo (str): Nome do modelo (padrão: MODELOS[provider])
+        """
+        self.modelo = modelo or MODELOS[self.provider]
+        self.chave_limite = chave_segura(api_key)
+
+    def _tratar_erro(self, erro: Exception, tentativa: int) -> float:
+        """
+        Decide se a chamada que falhou é refeita; senão propaga o erro.
+
+        Um 429 bloqueia a chave pelo retry-after no agendador (a espera
+        acontece no próximo aguardar); um erro transitório devolve o recuo
+        que a própria chamada deve esperar antes de tentar de novo.
+
+        Returns:
+            float: Segundos a esperar antes da próxima tentativa
+        """
+        if tentativa == MAX_TENTATIVAS_429 - 1:
+            raise erro
+        espera = tempo_retry_after(erro)
+        if espera is not None:
+            obter_agendador().penalizar(self.provider, self.chave_limite, espera)
+            return 0.0
+        recuo = tempo_recuo_transitorio(erro, tentativa)
+        if recuo is None:
+            raise erro
+        logger.warning(f"⚠️ {self.provider}: erro transitório ({type(erro).__name__}), nova tentativa em {recuo:.1f}s")
+        return recuo
+
+    def gerar(self, prompt: str, temperature: float = 0.7, max_tokens: int = MAX_TOKENS) -> str:
+        """Gera a resposta completa para o prompt."""
+        tokens = estimar_tokens(prompt) + max_tokens
+        for tentativa in range(MAX_TENTATIVAS_429):
+            obter_agendador().aguardar(self.provider, self.chave_limite, tokens)
+            try:
+                return self._gerar(prompt, temperature, max_tokens)
+            except Exception as e:
+                time.sleep(self._tratar_erro(e, tentativa))
+
+    def gerar_stream(self, prompt: str, temperature: float = 0.7, max_tokens: int = MAX_TOKENS) -> Iterator[str]:
+        """
+        Gera a resposta em trechos, na ordem em que o provedor os envia.
+
+        Um 429 ou erro transitório só é refeito se acontecer antes do primeiro trecho.
+        """
+        tokens = estimar_tokens(prompt) + max_tokens
+        for tentativa in range(MAX_TENTATIVAS_429):
+            obter_agendador().aguardar(self.provider, self.chave_limite, tokens)
+            recebeu_trecho = False
+            try:
+                for trecho in self._gerar_stream(prompt, temperature, max_tokens):
+                    recebeu_trecho = True
+                    yield trecho
+                return
+            except Exception as e:
+                if recebeu_trecho:
+                    raise
+                time.sleep(self._tratar_erro(e, tentativa))
+
+    async def _chamar_async(self, tokens: int, chamada: Callable[[], Awaitable],
+                            limite: Optional[asyncio.Semaphore] = None):
+        """
+        Espera o orçamento de RPM/TPM e só então ocupa uma vaga de `limite` para a requisição.
+
+        A espera pelo limite de taxa (e o recuo entre tentativas) acontece
+        fora da vaga: um provedor contido não segura as vagas do motor que
+        os pedidos a outro provedor usariam.
+        """
+        for tentativa in range(MAX_TENTATIVAS_429):
+            await obter_agendador().aguardar_async(self.provider, self.chave_limite, tokens)
+            try:
+                if limite is None:
+                    return await chamada()
+                async with limite:
+                    return await chamada()
+            except Exception as e:
+                await asyncio.sleep(self._tratar_erro(e, tentativa))
+
+    async def gerar_async(self, prompt: str, temperature: float = 0.7, max_tokens: int = MAX_TOKENS,
+                          limite: Optional[asyncio.Semaphore] = None) -> str:
+        """
+        Versão assíncrona de gerar(), usando o cliente assíncrono do provedor.
+
+        O cliente assíncrono fica preso ao event loop em que foi usado pela
+        primeira vez; por isso só o motor de geração (motor_geracao_module),
+        que tem um loop próprio e permanente, deve chamar este método.
+
+        Args:
+            limite (asyncio.Semaphore): Vagas de requisição do chamador, ocupadas só durante a chamada
+        """
+        tokens = estimar_tokens(prompt) + max_tokens
+        return await self._chamar_async(tokens, lambda: self._gerar_async(prompt, temperature, max_tokens), limite)
+
+    async def gerar_varios_async(self, prompt: str, n: int, temperature: float = 0.7,
+                                 max_tokens: int = MAX_TOKENS, limite: Optional[asyncio.Semaphore] = None) -> List[str]:
+        """
+        N respostas para o mesmo prompt em uma única chamada (só com suporta_n).
+
+        O TPM reservado conta o limite de resposta de cada uma das N respostas.
+        """
+        tokens = estimar_tokens(prompt) + max_tokens * n
+        return await self._chamar_async(
+            tokens, lambda: self._gerar_varios_async(prompt, n, temperature, max_tokens), limite
+        )
+
+    def _registrar_uso(self, tokens_prompt: int, tokens_em_cache: int, inicio: float, ttft_s: Optional[float] = None):
+        """Tokens de entrada (e quantos vieram do cache do provedor) e latência desde inicio."""
+        obter_metricas_prompt().registrar(self.provider, tokens_prompt, tokens_em_cache,
+                                          time.perf_counter() - inicio, ttft_s)
+
+    def _gerar(self, prompt: str, temperature: float, max_tokens: int) -> str:
+        raise NotImplementedError
+
+    def _gerar_stream(self, prompt: str, temperature: float, max_tokens: int) -> Iterator[str]:
+        raise NotImplementedError
+
+    async def _gerar_async(self, prompt: str, temperature: float, max_tokens: int) -> str:
+        raise NotImplementedError
+
+    async def _gerar_varios_async(self, prompt: str, n: int, temperature: float, max_tokens: int) -> List[str]:
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}(modelo={self.modelo!r})"
+
+
+class ClienteOpenAI(ClienteLLM):
+    """
+    Cliente OpenAI com pools HTTP keep-alive próprios (síncrono e assíncrono).
+    """
+
+    provider = "openai"
+    suporta_n = True
+
+    def __init__(self, api_key: str, modelo: Optional[str] = None):
+        super().__init__(api_key, modelo)
+        import httpx
+        from openai import OpenAI, AsyncOpenAI
+
+        timeout = httpx.Timeout(TIMEOUT_S, connect=TIMEOUT_CONEXAO_S)
+        limites = httpx.Limits(max_keepalive_connections=POOL_CONEXOES, max_connections=POOL_CONEXOES * 5)
+        self._cliente = OpenAI(
+            api_key=api_key,
+            base_url=OPENAI_BASE_URL,
+            timeout=timeout,
+            max_retries=0,  # 429s e erros transitórios são refeitos em ClienteLLM (ver _tratar_erro)
+            http_client=httpx.Client(timeout=timeout, limits=limites),
+        )
+        self._cliente_async = AsyncOpenAI(
+            api_key=api_key,
+            base_url=OPENAI_BASE_URL,
+            timeout=timeout,
+            max_retries=0,
+            http_client=httpx.AsyncClient(timeout=timeout, limits=limites),
+        )
+
+    @staticmethod
+    def _mensagens(prompt: str) -> List[dict]:
+        """Prefixo estático como mensagem de sistema, para o cache de prompt da OpenAI."""
+        prefixo, sufixo = dividir_prompt(prompt)
+        mensagens = [{"role": "system", "content": prefixo}] if prefixo else []
+        return mensagens + [{"role": "user", "content": sufixo}]
+
+    def _registrar_usage(self, usage, inicio: float, ttft_s: Optional[float] = None):
+        if usage is None:
+            return
+        detalhes = getattr(usage, "prompt_tokens_details", None)
+        self._registrar_uso(usage.prompt_tokens, getattr(detalhes, "cached_tokens", 0) or 0, inicio, ttft_s)
+
+    def _criar(self, prompt: str, temperature: float, max_tokens: int, stream: bool = False):
+        extras = {"stream_options": {"include_usage": True}} if stream else {}
+        return self._cliente.chat.completions.create(
+            model=self.modelo,
+            messages=self._mensagens(prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=stream,
+            **extras,
+        )
+
+    def _gerar(self, prompt: str, temperature: float, max_tokens: int) -> str:
+        inicio = time.perf_counter()
+        response = self._criar(prompt, temperature, max_tokens)
+        self._registrar_usage(response.usage, inicio)
+        return response.choices[0].message.content
+
+    async def _gerar_async(self, prompt: str, temperature: float, max_tokens: int) -> str:
+        inicio = time.perf_counter()
+        response = await self._cliente_async.chat.completions.create(
+            model=self.modelo,
+            messages=self._mensagens(prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        self._registrar_usage(response.usage, inicio)
+        return response.choices[0].message.content
+
+    async def _gerar_varios_async(self, prompt: str, n: int, temperature: float, max_tokens: int) -> List[str]:
+        # O prompt é cobrado uma vez só; cada escolha é uma resposta independente
+        inicio = time.perf_counter()
+        response = await self._cliente_async.chat.completions.create(
+            model=self.modelo,
+            messages=self._mensagens(prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            n=n,
+        )
+        self._registrar_usage(response.usage, inicio)
+        return [choice.message.content for choice in response.choices]
+
+    def _gerar_stream(self, prompt: str, temperature: float, max_tokens: int) -> Iterator[str]:
+        inicio = time.perf_counter()
+        ttft_s = None
+        # O with fecha a resposta HTTP se o gerador for fechado antes do fim (stream abandonado)
+        with self._criar(prompt, temperature, max_tokens, stream=True) as stream:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if ttft_s is None:
+                        ttft_s = time.perf_counter() - inicio
+                    yield chunk.choices[0].delta.content
+                # Com include_usage, o último chunk vem sem choices e com o uso de tokens
+                if getattr(chunk, "usage", None):
+                    self._registrar_usage(chunk.usage, inicio, ttft_s)
+
+
+class ClienteGemini(ClienteLLM):
+    """
+    Cliente Gemini com canais gRPC próprios por chave (síncrono e assíncrono).
+    """
+
+    provider = "gemini"
+
+    def __init__(self, api_key: str, modelo: Optional[str] = None):
+        super().__init__(api_key, modelo)
+        from google.ai import generativelanguage as glm
+
+        # Clientes do serviço usados diretamente: genai.configure() é global ao processo,
+        # e cada chave precisa do próprio canal
+        self._glm = glm
+        self._nome_modelo = self.modelo if "/" in self.modelo else f"models/{self.modelo}"
+        self._async_client = None
+        if GEMINI_BASE_URL:
+            # Endpoint próprio (ex.: simulador local) só pelo transporte REST, que não tem cliente assíncrono
+            self._client = glm.GenerativeServiceClient(
+                transport="rest", client_options={"api_key": api_key, "api_endpoint": GEMINI_BASE_URL}
+            )
+        else:
+            self._client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+            self._async_client = glm.GenerativeServiceAsyncClient(client_options={"api_key": api_key})
+
+    def _registrar_usage(self, response, inicio: float, ttft_s: Optional[float] = None):
+        uso = getattr(response, "usage_metadata", None)
+        if uso is None:
+            return
+        self._registrar_uso(uso.prompt_token_count, getattr(uso, "cached_content_token_count", 0) or 0, inicio, ttft_s)
+
+    def _requisicao(self, prompt: str, temperature: float, max_tokens: int):
+        # Sem mensagem de sistema por chamada: o prefixo estático vai no início do texto
+        glm = self._glm
+        return glm.GenerateContentRequest(
+            model=self._nome_modelo,
+            contents=[glm.Content(role="user", parts=[glm.Part(text=prompt_unico(prompt))])],
+            generation_config=glm.GenerationConfig(temperature=temperature, max_output_tokens=max_tokens),
+        )
+
+    @staticmethod
+    def _texto(response) -> str:
+        """Texto do primeiro candidato; trechos sem partes (ex.: só metadados de segurança) dão ""."""
+        if not response.candidates:
+            return ""
+        return "".join(parte.text for parte in response.candidates[0].content.parts)
+
+    def _resposta(self, response) -> str:
+        if not response.candidates:
+            motivo = response.prompt_feedback.block_reason if "prompt_feedback" in response else None
+            raise ValueError(f"Erro ao gerar com gemini: resposta sem candidatos (bloqueio: {motivo})")
+        return self._texto(response)
+
+    def _gerar(self, prompt: str, temperature: float, max_tokens: int) -> str:
+        inicio = time.perf_counter()
+        response = self._client.generate_content(
+            request=self._requisicao(prompt, temperature, max_tokens), timeout=TIMEOUT_S
+        )
+        self._registrar_usage(response, inicio)
+        return self._resposta(response)
+
+    async def _gerar_async(self, prompt: str, temperature: float, max_tokens: int) -> str:
+        if self._async_client is None:
+            return await asyncio.to_thread(self._gerar, prompt, temperature, max_tokens)
+        inicio = time.perf_counter()
+        response = await self._async_client.generate_content(
+            request=self._requisicao(prompt, temperature, max_tokens), timeout=TIMEOUT_S
+        )
+        self._registrar_usage(response, inicio)
+        return self._resposta(response)
+
+    def _gerar_stream(self, prompt: str, temperature: float, max_tokens: int) -> Iterator[str]:
+        inicio = time.perf_counter()
+        ttft_s = None
+        ultimo = None
+        stream = self._client.stream_generate_content(
+            request=self._requisicao(prompt, temperature, max_tokens), timeout=TIMEOUT_S
+        )
+        for chunk in stream:
+            ultimo = chunk
+            texto = self._texto(chunk)
+            if texto:
+                if ttft_s is None:
+                    ttft_s = time.perf_counter() - inicio
+                yield texto
+        # O uso de tokens acumulado vem no último trecho
+        self._registrar_usage(ultimo, inicio, ttft_s)
+
+
+CLIENTES = {
+    "openai": ClienteOpenAI,
+    "gemini": ClienteGemini,
+}
+
+
+def obter_cliente_llm(provider: str, contexto: Optional[ContextoSessao] = None) -> ClienteLLM:
+    """
+    Cliente de longa duração do provedor para a chave da sessão.
+
+    Args:
+        provider (str): "openai" ou "gemini"
+        contexto (ContextoSessao): Credenciais da sessão (padrão: variáveis de ambiente)
+
+    Returns:
+        ClienteLLM: Cliente compartilhado por todo o processo
+
+    Raises:
+        ValueError: Se o provedor não tiver cliente ou a chave não estiver configurada
+    """
+    if provider not in CLIENTES:
+        raise ValueError(f"Provedor sem cliente LLM: {provider}")
+
+    contexto = contexto or ContextoSessao.do_ambiente()
+    api_key = contexto.chave_api(provider)
+    if not api_key:
+        variavel = "OPENAI_API_KEY" if provider == "openai" else "GOOGLE_API_KEY"
+        raise ValueError(f"{variavel} não configurada para esta sessão")
+
+    return obter_recurso(f"llm:{provider}:{chave_segura(api_key)}", lambda: CLIENTES[provider](api_key))
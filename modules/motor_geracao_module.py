@@ -0,0 +1,337 @@
+"""
+Módulo do Motor de Geração (motor_geracao_module.py)
+
+Executa gerações de IA de forma assíncrona, com vários prompts em voo ao
+mesmo tempo. Um event loop permanente roda em uma thread própria; os
+clientes assíncronos dos provedores (llm_module) ficam presos a ele e
+reaproveitam as conexões entre chamadas. Um semáforo global limita quantas
+requisições ficam abertas em todo o processo, e cada lote pode impor um
+limite próprio menor. A vaga do semáforo só é ocupada depois que o pedido
+passou pelo limite de taxa do provedor, então a fila de um provedor
+contido não trava os pedidos ao outro.
+
+O código síncrono (CerebroCopy, CriadorEntregaveis, jobs, CLI de lote) usa
+gerar() e gerar_lote(), que entregam o trabalho ao loop e esperam o
+resultado; código assíncrono pode aguardar gerar_async() e
+gerar_lote_async() diretamente no loop do motor.
+
+Pedidos idênticos com cache ligado que chegam juntos (de qualquer thread
+ou de outro processo) viram uma só chamada ao provedor; ver
+coalescencia_module.
+
+Um lote pode receber uma função de cancelamento: ela é consultada a cada
+INTERVALO_CANCELAMENTO_S e, quando retorna True, os pedidos ainda em voo ou
+na fila são cancelados e voltam como GeracaoCancelada.
+
+O callback de conclusão de um lote (que costuma gravar em SQLite e publicar
+progresso) nunca roda no loop: vai para uma thread própria do lote, um de
+cada vez e na ordem de conclusão, para não travar as outras gerações.
+
+Configuração:
+    LLM_CONCORRENCIA    Requisições simultâneas no processo (padrão: 8)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from modules.cache_module import chave_segura
+from modules.cache_respostas_module import obter_cache_respostas, chave_resposta
+from modules.coalescencia_module import obter_coordenador_voos
+from modules.contexto_module import ContextoSessao
+from modules.llm_module import MAX_TOKENS, obter_cliente_llm
+from modules.roteador_module import PROVEDOR_AUTO, obter_roteador, provedores_disponiveis
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CONCORRENCIA_PADRAO = int(os.getenv("LLM_CONCORRENCIA", "8"))
+INTERVALO_CANCELAMENTO_S = 0.5
+
+
+class GeracaoCancelada(Exception):
+    """Resultado de um pedido de lote interrompido pela função de cancelamento."""
+
+
+class PedidoGeracao:
+    """
+    Um prompt a gerar, com o provedor e as opções da chamada.
+    """
+
+    def __init__(self, prompt: str, provider: str, contexto: Optional[ContextoSessao] = None,
+                 temperature: float = 0.7, max_tokens: int = MAX_TOKENS, usar_cache: bool = True):
+        """
+        Args:
+            prompt (str): Prompt completo
+            provider (str): "openai", "gemini" ou "auto"
+            contexto (ContextoSessao): Credenciais da sessão (padrão: variáveis de ambiente)
+            temperature (float): Temperatura da geração
+            max_tokens (int): Limite de tokens da resposta
+            usar_cache (bool): Consultar e alimentar o cache de respostas
+        """
+        self.prompt = prompt
+        self.provider = provider
+        self.contexto = contexto
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.usar_cache = usar_cache
+
+    def __repr__(self):
+        return f"PedidoGeracao(provider={self.provider!r}, prompt={len(self.prompt)} caracteres)"
+
+
+class MotorGeracao:
+    """
+    Event loop dedicado com fan-out limitado por semáforo.
+    """
+
+    def __init__(self, concorrencia: int = CONCORRENCIA_PADRAO):
+        """
+        Args:
+            concorrencia (int): Máximo de requisições abertas ao mesmo tempo no processo
+        """
+        self.concorrencia = concorrencia
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="motor-geracao", daemon=True)
+        self._thread.start()
+        # Primitivas do asyncio são criadas dentro do loop que vai usá-las
+        self._semaforo = self._executar(self._criar_semaforo(concorrencia))
+        logger.info(f"⚙️ Motor de geração iniciado ({concorrencia} requisições simultâneas)")
+
+    @staticmethod
+    async def _criar_semaforo(limite: int) -> asyncio.Semaphore:
+        return asyncio.Semaphore(limite)
+
+    def _executar(self, corrotina):
+        """Roda a corrotina no loop do motor e espera o resultado na thread atual."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Use gerar_async()/gerar_lote_async() dentro do loop do motor")
+        return asyncio.run_coroutine_threadsafe(corrotina, self._loop).result()
+
+    # ------------------------------------------------------------------
+    # API assíncrona (roda no loop do motor)
+    # ------------------------------------------------------------------
+    async def gerar_async(self, pedido: PedidoGeracao) -> str:
+        """
+        Gera a resposta de um pedido, passando pelo cache de respostas.
+
+        No provedor "auto", o roteador escolhe o provedor (com failover e,
+        se o contexto pedir, hedging).
+
+        Returns:
+            str: Texto gerado
+        """
+        if pedido.provider != PROVEDOR_AUTO:
+            return await self._gerar_no_provedor(pedido, pedido.provider)
+
+        contexto = pedido.contexto or ContextoSessao.do_ambiente()
+        candidatos = provedores_disponiveis(contexto)
+        if not candidatos:
+            raise ValueError("Nenhum provedor de IA com chave configurada para o modo automático")
+
+        # Respostas do modo automático são guardadas sob "auto", valendo para qualquer provedor
+        chave = chave_resposta(pedido.prompt, PROVEDOR_AUTO, PROVEDOR_AUTO, pedido.temperature) if pedido.usar_cache else None
+        if chave:
+            resposta = await asyncio.to_thread(obter_cache_respostas().obter, chave)
+            if resposta is not None:
+                return resposta
+
+        sem_cache = PedidoGeracao(pedido.prompt, PROVEDOR_AUTO, contexto, pedido.temperature,
+                                  pedido.max_tokens, usar_cache=False)
+
+        async def rotear() -> str:
+            resposta = await obter_roteador().executar_async(
+                candidatos, lambda provider: self._gerar_no_provedor(sem_cache, provider), hedge=contexto.hedge
+            )
+            if chave and resposta:
+                await asyncio.to_thread(obter_cache_respostas().gravar, chave, resposta, PROVEDOR_AUTO, PROVEDOR_AUTO)
+            return resposta
+
+        if not chave:
+            return await rotear()
+        credencial = chave_segura(*(contexto.chave_api(provider) for provider in candidatos))
+        return await obter_coordenador_voos().executar(chave, rotear, lambda: obter_cache_respostas().obter(chave),
+                                                       credencial=credencial)
+
+    async def _gerar_no_provedor(self, pedido: PedidoGeracao, provider: str) -> str:
+        cliente = obter_cliente_llm(provider, pedido.contexto)
+        chave = None
+        if pedido.usar_cache:
+            chave = chave_resposta(pedido.prompt, provider, cliente.modelo, pedido.temperature)
+            resposta = await asyncio.to_thread(obter_cache_respostas().obter, chave)
+            if resposta is not None:
+                return resposta
+
+        async def chamar() -> str:
+            inicio = time.perf_counter()
+            try:
+                # A vaga do semáforo só é ocupada depois do orçamento de RPM/TPM do provedor
+                resposta = await cliente.gerar_async(pedido.prompt, pedido.temperature, pedido.max_tokens,
+                                                     limite=self._semaforo)
+            except Exception:
+                obter_roteador().registrar(provider, time.perf_counter() - inicio, False)
+                raise
+            obter_roteador().registrar(provider, time.perf_counter() - inicio, True)
+
+            # Gravada antes de liberar a trava, para quem espera em outro processo
+            if chave and resposta:
+                await asyncio.to_thread(obter_cache_respostas().gravar, chave, resposta, provider, cliente.modelo)
+            return resposta
+
+        if not chave:
+            return await chamar()
+        return await obter_coordenador_voos().executar(chave, chamar, lambda: obter_cache_respostas().obter(chave),
+                                                       credencial=cliente.chave_limite)
+
+    async def gerar_varios_async(self, pedido: PedidoGeracao, n: int) -> List[str]:
+        """
+        N respostas diferentes para o mesmo pedido, sem passar pelo cache.
+
+        Com provedor que aceita N respostas por chamada (ClienteLLM.suporta_n),
+        é uma só requisição; nos demais, N requisições simultâneas. No
+        provedor "auto", o roteador escolhe o provedor como em gerar_async().
+
+        Returns:
+            list: As respostas obtidas (pode ter menos de N se algumas falharem)
+        """
+        if pedido.provider != PROVEDOR_AUTO:
+            return await self._gerar_varios_no_provedor(pedido, pedido.provider, n)
+
+        contexto = pedido.contexto or ContextoSessao.do_ambiente()
+        candidatos = provedores_disponiveis(contexto)
+        if not candidatos:
+            raise ValueError("Nenhum provedor de IA com chave configurada para o modo automático")
+        return await obter_roteador().executar_async(
+            candidatos, lambda provider: self._gerar_varios_no_provedor(pedido, provider, n), hedge=contexto.hedge
+        )
+
+    async def _gerar_varios_no_provedor(self, pedido: PedidoGeracao, provider: str, n: int) -> List[str]:
+        cliente = obter_cliente_llm(provider, pedido.contexto)
+        if not cliente.suporta_n:
+            unitario = PedidoGeracao(pedido.prompt, provider, pedido.contexto, pedido.temperature,
+                                     pedido.max_tokens, usar_cache=False)
+            resultados = await asyncio.gather(*(self._gerar_no_provedor(unitario, provider) for _ in range(n)),
+                                              return_exceptions=True)
+            respostas = [r for r in resultados if isinstance(r, str) and r.strip()]
+            if not respostas:
+                raise next((r for r in resultados if isinstance(r, Exception)), RuntimeError("Respostas vazias"))
+            return respostas
+
+        inicio = time.perf_counter()
+        try:
+            respostas = await cliente.gerar_varios_async(pedido.prompt, n, pedido.temperature, pedido.max_tokens,
+                                                         limite=self._semaforo)
+        except Exception:
+            obter_roteador().registrar(provider, time.perf_counter() - inicio, False)
+            raise
+        obter_roteador().registrar(provider, time.perf_counter() - inicio, True)
+        return [r for r in respostas if r and r.strip()]
+
+    async def gerar_lote_async(self, pedidos: List[PedidoGeracao], concorrencia: Optional[int] = None,
+                               ao_concluir: Optional[Callable[[int, object], None]] = None,
+                               cancelado: Optional[Callable[[], bool]] = None) -> List:
+        """
+        Gera vários pedidos em paralelo, devolvendo os resultados na ordem dos pedidos.
+
+        Args:
+            pedidos (list): Pedidos a gerar
+            concorrencia (int): Limite adicional só para este lote (o global continua valendo)
+            ao_concluir (callable): Chamado com (índice, resultado) assim que cada pedido termina,
+                fora do loop e um de cada vez; o lote só retorna depois do último
+            cancelado (callable): Consultada periodicamente (fora do loop); True interrompe o lote
+
+        Returns:
+            list: Texto gerado ou a exceção de cada pedido (GeracaoCancelada se
+                interrompido), na mesma ordem
+        """
+        limite_lote = asyncio.Semaphore(concorrencia) if concorrencia else None
+        # Uma thread só: os callbacks mexem em estado do chamador sem trava
+        callbacks = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lote-callback") if ao_concluir else None
+
+        def notificar(indice: int, resultado):
+            try:
+                ao_concluir(indice, resultado)
+            except Exception as e:
+                logger.error(f"Erro no callback da geração {indice}: {e}")
+
+        async def gerar_um(indice: int, pedido: PedidoGeracao):
+            try:
+                if limite_lote:
+                    async with limite_lote:
+                        resultado = await self.gerar_async(pedido)
+                else:
+                    resultado = await self.gerar_async(pedido)
+            except asyncio.CancelledError:
+                return GeracaoCancelada(f"Geração {indice} cancelada")
+            except Exception as e:
+                logger.error(f"Erro na geração {indice} ({pedido.provider}): {e}")
+                resultado = e
+            if callbacks:
+                # Sem esperar: o callback segue na fila mesmo se o lote for cancelado agora
+                callbacks.submit(notificar, indice, resultado)
+            return resultado
+
+        tarefas = [asyncio.ensure_future(gerar_um(i, pedido)) for i, pedido in enumerate(pedidos)]
+
+        async def vigiar():
+            while not all(tarefa.done() for tarefa in tarefas):
+                if await asyncio.to_thread(cancelado):
+                    logger.info(f"🛑 Lote cancelado: {sum(not t.done() for t in tarefas)} geração(ões) interrompida(s)")
+                    for tarefa in tarefas:
+                        tarefa.cancel()
+                    return
+                await asyncio.sleep(INTERVALO_CANCELAMENTO_S)
+
+        vigia = asyncio.ensure_future(vigiar()) if cancelado else None
+        try:
+            return await asyncio.gather(*tarefas)
+        finally:
+            if vigia:
+                vigia.cancel()
+            if callbacks:
+                await asyncio.to_thread(callbacks.shutdown, True)
+
+    # ------------------------------------------------------------------
+    # API síncrona (qualquer outra thread)
+    # ------------------------------------------------------------------
+    def gerar(self, pedido: PedidoGeracao) -> str:
+        """
+        Gera um pedido e bloqueia até a resposta.
+
+        Raises:
+            Exception: O erro do provedor, se a geração falhar
+        """
+        return self._executar(self.gerar_async(pedido))
+
+    def gerar_varios(self, pedido: PedidoGeracao, n: int) -> List[str]:
+        """Versão bloqueante de gerar_varios_async()."""
+        return self._executar(self.gerar_varios_async(pedido, n))
+
+    def gerar_lote(self, pedidos: List[PedidoGeracao], concorrencia: Optional[int] = None,
+                   ao_concluir: Optional[Callable[[int, object], None]] = None,
+                   cancelado: Optional[Callable[[], bool]] = None) -> List:
+        """
+        Versão bloqueante de gerar_lote_async().
+
+        O callback ao_concluir roda em uma thread auxiliar do lote, nunca no
+        loop do motor; quando esta função retorna, todos já terminaram.
+        """
+        return self._executar(self.gerar_lote_async(pedidos, concorrencia, ao_concluir, cancelado))
+
+
+_motor: Optional[MotorGeracao] = None
+_trava_motor = threading.Lock()
+
+
+def obter_motor() -> MotorGeracao:
+    """Motor de geração único do processo."""
+    global _motor
+    with _trava_motor:
+        if _motor is None:
+            _motor = MotorGeracao()
+    return _motor
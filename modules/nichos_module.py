@@ -0,0 +1,339 @@
+"""
+Módulo de Mapeamento de Nichos (nichos_module.py)
+
+Agrupa as ofertas garimpadas em nichos (ex.: planos keto, scanners de trading,
+manifestação) para identificar espaços saturados e espaços vazios no mercado.
+
+Os títulos e categorias viram vetores TF-IDF esparsos (SciPy) e são agrupados
+com um k-means esférico em mini-lotes, treinado incrementalmente a cada novo
+lote de ofertas. O vocabulário do vetorizador e os centróides ficam em cache
+em disco, então cada execução do garimpo apenas refina o modelo existente.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import unicodedata
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DIRETORIO_NICHOS = os.path.join("data", "nichos")
+
+# Palavras sem valor semântico para agrupar nichos (pt + en)
+STOPWORDS = {
+    "a", "o", "as", "os", "de", "da", "do", "das", "dos", "e", "em", "para", "com",
+    "um", "uma", "no", "na", "por", "que", "se", "seu", "sua",
+    "the", "and", "of", "to", "for", "in", "on", "with", "your", "you", "how",
+    "an", "by", "is", "my", "at", "from", "best", "new", "edition", "n", "version",
+}
+
+
+def _normalizar_texto(texto: str) -> str:
+    """Remove acentos e converte para minúsculas."""
+    texto = unicodedata.normalize("NFKD", str(texto))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return texto.lower()
+
+
+def _tokenizar(texto: str) -> List[str]:
+    """Quebra o texto em termos relevantes para o agrupamento."""
+    termos = re.findall(r"[a-z0-9]+", _normalizar_texto(texto))
+    return [t for t in termos if len(t) > 2 and t not in STOPWORDS and not t.isdigit()]
+
+
+def _chave_oferta(oferta: Dict) -> str:
+    """Gera uma chave estável para reconhecer ofertas já vistas."""
+    base = f"{oferta.get('plataforma', '')}|{oferta.get('titulo', '')}"
+    return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+
+def _extrair_numero(valor) -> float:
+    """Extrai o primeiro número de textos como '$31.50' ou '42.5'."""
+    match = re.search(r"\d+(?:[.,]\d+)?", str(valor))
+    if not match:
+        return np.nan
+    return float(match.group(0).replace(",", "."))
+
+
+class MapeadorNichos:
+    """
+    Agrupamento incremental de ofertas em nichos via TF-IDF + mini-batch k-means.
+    """
+
+    def __init__(self, n_clusters: int = 12, limiar_novo_cluster: float = 0.15,
+                 diretorio: str = DIRETORIO_NICHOS):
+        """
+        Inicializa o mapeador e carrega o estado salvo, se existir.
+
+        Args:
+            n_clusters (int): Número máximo de nichos
+            limiar_novo_cluster (float): Similaridade mínima com um nicho existente;
+                abaixo dela a oferta abre um novo nicho (enquanto houver vagas)
+            diretorio (str): Diretório onde vocabulário e centróides são salvos
+        """
+        self.n_clusters = n_clusters
+        self.limiar_novo_cluster = limiar_novo_cluster
+        self.diretorio = diretorio
+
+        self.vocabulario: Dict[str, int] = {}
+        self.freq_documentos = np.zeros(0, dtype=np.float64)
+        self.n_documentos = 0
+        self.centroides = np.zeros((0, 0), dtype=np.float64)
+        self.contagens = np.zeros(0, dtype=np.float64)
+        self.vistos = set()
+
+        self._carregar_estado()
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+    def _caminhos(self):
+        return (
+            os.path.join(self.diretorio, "vocabulario.json"),
+            os.path.join(self.diretorio, "centroides.npz"),
+        )
+
+    def _carregar_estado(self):
+        """Carrega vocabulário e centróides do cache em disco."""
+        arquivo_vocab, arquivo_centroides = self._caminhos()
+        if not (os.path.exists(arquivo_vocab) and os.path.exists(arquivo_centroides)):
+            return
+
+        try:
+            with open(arquivo_vocab, "r", encoding="utf-8") as f:
+                estado = json.load(f)
+            dados = np.load(arquivo_centroides)
+
+            self.vocabulario = estado["vocabulario"]
+            self.n_documentos = estado["n_documentos"]
+            self.vistos = set(estado.get("vistos", []))
+            self.freq_documentos = dados["freq_documentos"]
+            self.centroides = dados["centroides"]
+            self.contagens = dados["contagens"]
+            logger.info(f"🗂️ Estado de nichos carregado: {len(self.vocabulario)} termos, {len(self.contagens)} nichos")
+        except Exception as e:
+            logger.warning(f"⚠️ Não foi possível carregar estado de nichos, recomeçando: {e}")
+
+    def salvar_estado(self):
+        """Salva vocabulário e centróides em disco."""
+        os.makedirs(self.diretorio, exist_ok=True)
+        arquivo_vocab, arquivo_centroides = self._caminhos()
+
+        with open(arquivo_vocab, "w", encoding="utf-8") as f:
+            json.dump({
+                "vocabulario": self.vocabulario,
+                "n_documentos": self.n_documentos,
+                "vistos": sorted(self.vistos),
+            }, f, ensure_ascii=False)
+
+        np.savez_compressed(
+            arquivo_centroides,
+            freq_documentos=self.freq_documentos,
+            centroides=self.centroides,
+            contagens=self.contagens,
+        )
+
+    # ------------------------------------------------------------------
+    # Vetorização
+    # ------------------------------------------------------------------
+    def _documento(self, oferta: Dict) -> List[str]:
+        return _tokenizar(f"{oferta.get('titulo', '')} {oferta.get('categoria', '')}")
+
+    def _expandir_vocabulario(self, documentos: List[List[str]]):
+        """Adiciona termos novos e atualiza a frequência de documentos."""
+        for termos in documentos:
+            for termo in set(termos):
+                if termo not in self.vocabulario:
+                    self.vocabulario[termo] = len(self.vocabulario)
+
+        novos = len(self.vocabulario) - len(self.freq_documentos)
+        if novos > 0:
+            self.freq_documentos = np.concatenate([self.freq_documentos, np.zeros(novos)])
+            if self.centroides.size or len(self.contagens):
+                self.centroides = np.hstack([
+                    self.centroides,
+                    np.zeros((self.centroides.shape[0], novos)),
+                ])
+
+        for termos in documentos:
+            for termo in set(termos):
+                self.freq_documentos[self.vocabulario[termo]] += 1
+        self.n_documentos += len(documentos)
+
+    def _vetorizar(self, documentos: List[List[str]]) -> sparse.csr_matrix:
+        """Converte documentos em matriz TF-IDF esparsa, normalizada por linha."""
+        linhas, colunas, valores = [], [], []
+        for i, termos in enumerate(documentos):
+            contagem: Dict[int, int] = {}
+            for termo in termos:
+                indice = self.vocabulario.get(termo)
+                if indice is not None:
+                    contagem[indice] = contagem.get(indice, 0) + 1
+            for indice, tf in contagem.items():
+                linhas.append(i)
+                colunas.append(indice)
+                valores.append(1.0 + np.log(tf))
+
+        matriz = sparse.csr_matrix(
+            (valores, (linhas, colunas)),
+            shape=(len(documentos), len(self.vocabulario)),
+        )
+
+        idf = np.log((1.0 + self.n_documentos) / (1.0 + self.freq_documentos)) + 1.0
+        matriz = matriz @ sparse.diags(idf)
+
+        normas = np.sqrt(matriz.multiply(matriz).sum(axis=1)).A1
+        normas[normas == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / normas) @ matriz)
+
+    # ------------------------------------------------------------------
+    # Agrupamento
+    # ------------------------------------------------------------------
+    def _similaridades(self, matriz: sparse.csr_matrix) -> np.ndarray:
+        if not len(self.contagens):
+            return np.zeros((matriz.shape[0], 0))
+        return np.asarray(matriz @ self.centroides.T)
+
+    def _treinar_lote(self, matriz: sparse.csr_matrix):
+        """Atualiza os centróides com um mini-lote (k-means esférico de Sculley)."""
+        for i in range(matriz.shape[0]):
+            linha = matriz.getrow(i).toarray().ravel()
+            if not linha.any():
+                continue
+
+            sims = self.centroides @ linha if len(self.contagens) else np.zeros(0)
+            melhor = int(np.argmax(sims)) if len(sims) else -1
+
+            if melhor < 0 or (sims[melhor] < self.limiar_novo_cluster and len(self.contagens) < self.n_clusters):
+                # Abre um novo nicho
+                if not self.centroides.size:
+                    self.centroides = np.zeros((0, len(linha)))
+                self.centroides = np.vstack([self.centroides, linha])
+                self.contagens = np.append(self.contagens, 1.0)
+                continue
+
+            self.contagens[melhor] += 1
+            taxa = 1.0 / self.contagens[melhor]
+            centroide = (1.0 - taxa) * self.centroides[melhor] + taxa * linha
+            norma = np.linalg.norm(centroide)
+            self.centroides[melhor] = centroide / norma if norma else centroide
+
+    def atualizar(self, ofertas: List[Dict], tamanho_lote: int = 64) -> pd.DataFrame:
+        """
+        Treina o modelo com as ofertas ainda não vistas e atribui um nicho a todas.
+
+        Args:
+            ofertas (list): Registros do garimpo (dicts com titulo, categoria, ...)
+            tamanho_lote (int): Tamanho de cada mini-lote de treino
+
+        Returns:
+            pd.DataFrame: Ofertas com as colunas nicho_id e nicho_rotulo
+        """
+        if not ofertas:
+            return pd.DataFrame()
+
+        novas = [o for o in ofertas if _chave_oferta(o) not in self.vistos]
+        if novas:
+            documentos = [self._documento(o) for o in novas]
+            self._expandir_vocabulario(documentos)
+
+            for inicio in range(0, len(documentos), tamanho_lote):
+                lote = documentos[inicio:inicio + tamanho_lote]
+                self._treinar_lote(self._vetorizar(lote))
+
+            self.vistos.update(_chave_oferta(o) for o in novas)
+            self.salvar_estado()
+            logger.info(f"🧭 Nichos atualizados com {len(novas)} ofertas novas ({len(self.contagens)} nichos)")
+
+        return self.atribuir(ofertas)
+
+    def atribuir(self, ofertas: List[Dict]) -> pd.DataFrame:
+        """
+        Atribui cada oferta ao nicho mais próximo, sem treinar o modelo.
+
+        Returns:
+            pd.DataFrame: Ofertas com as colunas nicho_id, nicho_rotulo e nicho_similaridade
+        """
+        df = pd.DataFrame(ofertas)
+        if df.empty:
+            return df
+
+        matriz = self._vetorizar([self._documento(o) for o in ofertas])
+        sims = self._similaridades(matriz)
+
+        if sims.shape[1] == 0:
+            df["nicho_id"] = -1
+            df["nicho_similaridade"] = 0.0
+        else:
+            df["nicho_id"] = sims.argmax(axis=1)
+            df["nicho_similaridade"] = sims.max(axis=1).round(3)
+
+        rotulos = self.rotulos()
+        df["nicho_rotulo"] = df["nicho_id"].map(lambda i: rotulos.get(int(i), "Sem nicho"))
+        return df
+
+    def rotulos(self, n_termos: int = 3) -> Dict[int, str]:
+        """Gera um rótulo legível para cada nicho a partir dos termos de maior peso."""
+        termos = {indice: termo for termo, indice in self.vocabulario.items()}
+        rotulos = {}
+        for i, centroide in enumerate(self.centroides):
+            principais = np.argsort(centroide)[::-1][:n_termos]
+            rotulos[i] = " / ".join(termos[j] for j in principais if centroide[j] > 0) or f"Nicho {i}"
+        return rotulos
+
+    def metricas_nichos(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcula métricas agregadas por nicho.
+
+        Args:
+            df (pd.DataFrame): Saída de atualizar() ou atribuir()
+
+        Returns:
+            pd.DataFrame: Uma linha por nicho com volume, participação, gravidade,
+                comissão, coesão e classificação de saturação
+        """
+        if df.empty or "nicho_id" not in df.columns:
+            return pd.DataFrame()
+
+        df = df.copy()
+        df["gravidade_num"] = df["gravidade"].map(_extrair_numero) if "gravidade" in df.columns else np.nan
+        coluna_comissao = "comissao_inicial" if "comissao_inicial" in df.columns else "comissao"
+        df["comissao_num"] = df[coluna_comissao].map(_extrair_numero) if coluna_comissao in df.columns else np.nan
+
+        metricas = df.groupby(["nicho_id", "nicho_rotulo"]).agg(
+            ofertas=("titulo", "count"),
+            plataformas=("plataforma", "nunique"),
+            gravidade_media=("gravidade_num", "mean"),
+            comissao_media=("comissao_num", "mean"),
+            coesao=("nicho_similaridade", "mean"),
+        ).reset_index()
+
+        metricas["participacao"] = (metricas["ofertas"] / metricas["ofertas"].sum()).round(3)
+        media = metricas["ofertas"].mean()
+        metricas["saturacao"] = np.where(
+            metricas["ofertas"] >= 1.5 * media, "Saturado",
+            np.where(metricas["ofertas"] <= 0.5 * media, "Espaço vazio", "Equilibrado"),
+        )
+
+        return metricas.sort_values("ofertas", ascending=False).round(2).reset_index(drop=True)
+
+
+def mapear_nichos(ofertas: List[Dict], n_clusters: int = 12) -> Optional[Dict]:
+    """
+    Função simplificada para atualizar o mapa de nichos com novas ofertas.
+
+    Returns:
+        dict: {"ofertas": DataFrame com nicho_id, "nichos": DataFrame de métricas}
+    """
+    mapeador = MapeadorNichos(n_clusters=n_clusters)
+    df = mapeador.atualizar(ofertas)
+    return {"ofertas": df, "nichos": mapeador.metricas_nichos(df)}
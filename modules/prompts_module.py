@@ -0,0 +1,140 @@
+"""
+Módulo de Montagem de Prompts (prompts_module.py)
+
+Os provedores reaproveitam o processamento do início de um prompt que já
+viram há pouco (prompt caching da OpenAI a partir de 1024 tokens iguais;
+cache implícito do Gemini): os tokens em cache custam menos e o primeiro
+trecho da resposta chega antes. Para isso, o que não muda entre pedidos
+(persona, princípios, formato da resposta) precisa vir primeiro e sem
+nenhuma interpolação, e o que muda (tópico, nicho, copy) vai no fim.
+
+montar_prompt() junta as duas partes com um marcador; o prompt continua
+sendo uma string (vale para o cache de respostas, a coalescência e o
+limite de tokens). O cliente OpenAI envia o prefixo como mensagem de
+sistema e o sufixo como mensagem do usuário; o Gemini recebe os dois
+juntos, na mesma ordem.
+
+MetricasPrompt acompanha, por provedor, a fração dos tokens de entrada que
+veio do cache do provedor e a latência (total e até o primeiro trecho).
+"""
+
+import time
+import logging
+import textwrap
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from modules.cache_module import obter_recurso
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MARCADOR_SUFIXO = "\n\n<<<PEDIDO>>>\n\n"
+JANELA_METRICAS = 200
+
+
+def _limpar(texto: str) -> str:
+    """Remove a indentação do código e as linhas em branco das bordas."""
+    return textwrap.dedent(texto).strip()
+
+
+def montar_prompt(prefixo: str, sufixo: str) -> str:
+    """
+    Prompt com uma parte estática (prefixo) e uma variável (sufixo).
+
+    Args:
+        prefixo (str): Texto idêntico entre pedidos do mesmo tipo (sem f-string)
+        sufixo (str): Dados deste pedido
+
+    Returns:
+        str: Prompt pronto para PedidoGeracao / gerar_stream
+    """
+    return f"{_limpar(prefixo)}{MARCADOR_SUFIXO}{_limpar(sufixo)}"
+
+
+def dividir_prompt(prompt: str) -> Tuple[str, str]:
+    """
+    Separa um prompt de montar_prompt() em (prefixo, sufixo).
+
+    Prompts montados sem prefixo voltam como ("", prompt).
+    """
+    if MARCADOR_SUFIXO not in prompt:
+        return "", prompt
+    prefixo, sufixo = prompt.split(MARCADOR_SUFIXO, 1)
+    return prefixo, sufixo
+
+
+def prompt_unico(prompt: str) -> str:
+    """O prompt em um só texto, para provedores sem mensagem de sistema."""
+    prefixo, sufixo = dividir_prompt(prompt)
+    return f"{prefixo}\n\n{sufixo}" if prefixo else sufixo
+
+
+def _mediana(valores: List[float]) -> Optional[float]:
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    return round(ordenados[len(ordenados) // 2], 2)
+
+
+class MetricasPrompt:
+    """
+    Janela móvel de uso de tokens e latência por provedor.
+    """
+
+    def __init__(self, janela: int = JANELA_METRICAS):
+        """
+        Args:
+            janela (int): Requisições mantidas por provedor
+        """
+        self.janela = janela
+        self._amostras: Dict[str, deque] = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, provider: str, tokens_prompt: int, tokens_em_cache: int, latencia_s: float,
+                  ttft_s: Optional[float] = None):
+        """
+        Registra uma requisição concluída.
+
+        Args:
+            provider (str): Provedor que atendeu
+            tokens_prompt (int): Tokens de entrada cobrados pelo provedor
+            tokens_em_cache (int): Quantos deles vieram do cache do provedor
+            latencia_s (float): Tempo total da requisição
+            ttft_s (float): Tempo até o primeiro trecho (só em streaming)
+        """
+        with self._trava:
+            self._amostras.setdefault(provider, deque(maxlen=self.janela)).append(
+                (time.time(), tokens_prompt or 0, tokens_em_cache or 0, latencia_s, ttft_s)
+            )
+
+    def metricas(self) -> List[Dict]:
+        """
+        Returns:
+            list: Por provedor: requisicoes, tokens_prompt, tokens_em_cache,
+                taxa_cache, latencia_p50_s e ttft_p50_s
+        """
+        with self._trava:
+            amostras = {provider: list(valores) for provider, valores in self._amostras.items()}
+
+        resultado = []
+        for provider, valores in amostras.items():
+            tokens = sum(v[1] for v in valores)
+            em_cache = sum(v[2] for v in valores)
+            resultado.append({
+                "provider": provider,
+                "requisicoes": len(valores),
+                "tokens_prompt": tokens,
+                "tokens_em_cache": em_cache,
+                "taxa_cache": round(em_cache / tokens, 3) if tokens else 0.0,
+                "latencia_p50_s": _mediana([v[3] for v in valores]),
+                "ttft_p50_s": _mediana([v[4] for v in valores if v[4] is not None]),
+            })
+        return resultado
+
+
+def obter_metricas_prompt() -> MetricasPrompt:
+    """Métricas de prompt únicas do processo."""
+    return obter_recurso("metricas_prompt", MetricasPrompt)
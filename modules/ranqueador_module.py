@@ -0,0 +1,118 @@
+"""
+Módulo de Ranqueamento de Copies (ranqueador_module.py)
+
+Pontua variações de copy com heurísticas locais, sem chamar nenhum
+provedor, para ordenar os candidatos de uma geração N-best. Cada critério
+vai de 0 a 1 e a pontuação final (0 a 100) é a média ponderada:
+
+- legibilidade: Flesch adaptado ao português (Martins et al., 1996);
+- hooks: tamanho, números, perguntas, "você" e palavras de impacto;
+- tamanho: o corpo deve ter pelo menos PALAVRAS_CORPO_MIN palavras;
+- placeholders: marcações que vazaram para o texto, como "[DATA ESPECÍFICA]";
+- estrutura: presença das quatro seções do formato de resposta.
+"""
+
+import re
+import logging
+from typing import Dict, List
+
+from modules.copy_module import SECOES_COPY, CopyEstruturada
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PESOS = {
+    "legibilidade": 0.2,
+    "hooks": 0.3,
+    "tamanho": 0.15,
+    "placeholders": 0.25,
+    "estrutura": 0.1,
+}
+
+PALAVRAS_CORPO_MIN = 300
+PALAVRAS_HOOK = (6, 22)
+
+PALAVRAS_IMPACTO = (
+    "segredo", "descubra", "revelado", "exatamente", "garantido", "comprovado", "grátis", "novo",
+    "agora", "hoje", "último", "última", "nunca", "pare", "erro", "método", "sem", "rápido", "fácil",
+    "resultado", "transforme", "finalmente", "atenção", "imagine", "por que", "como",
+)
+
+# Marcações entre colchetes em maiúsculas ("[DATA ESPECÍFICA]") e instruções do
+# próprio formato de resposta que o modelo devolveu sem preencher
+PADRAO_PLACEHOLDER = re.compile(
+    r"\[(?:[A-ZÀ-Ú0-9][A-ZÀ-Ú0-9 /_\-]{2,}|(?:Hook|Corpo|Chamada|Lista|Nome|Benefício|Descrição)[^\]]*)\]"
+)
+
+
+def _contar_silabas(palavra: str) -> int:
+    """Aproximação de sílabas pelos grupos de vogais (suficiente para o índice Flesch)."""
+    return max(1, len(re.findall(r"[aeiouáéíóúâêôãõàü]+", palavra.lower())))
+
+
+def legibilidade(texto: str) -> float:
+    """Índice Flesch para o português, de 0 (muito difícil) a 100 (muito fácil)."""
+    palavras = re.findall(r"[A-Za-zÀ-ÿ]+", texto)
+    if not palavras:
+        return 0.0
+    frases = max(1, len(re.findall(r"[.!?…]+(?:\s|$)", texto)))
+    silabas = sum(_contar_silabas(p) for p in palavras)
+    indice = 248.835 - 1.015 * (len(palavras) / frases) - 84.6 * (silabas / len(palavras))
+    return max(0.0, min(100.0, indice))
+
+
+def forca_hook(hook: str) -> float:
+    """Pontuação de 0 a 1 de um hook isolado."""
+    texto = re.sub(r"\*\*[^*]*:\*\*", "", hook)  # rótulo "**Hook de Curiosidade:**"
+    palavras = texto.split()
+    if not palavras:
+        return 0.0
+    minimo, maximo = PALAVRAS_HOOK
+    pontos = 0.35 if minimo <= len(palavras) <= maximo else 0.1
+    minusculo = texto.lower()
+    if re.search(r"\d", texto):
+        pontos += 0.15
+    if "?" in texto or "..." in texto or "…" in texto:
+        pontos += 0.15
+    if re.search(r"\bvocê\b|\bseu\b|\bsua\b", minusculo):
+        pontos += 0.15
+    pontos += min(0.2, 0.1 * sum(1 for p in PALAVRAS_IMPACTO if re.search(rf"\b{p}\b", minusculo)))
+    return min(1.0, pontos)
+
+
+def avaliar_copy(texto: str) -> Dict:
+    """
+    Critérios (0 a 1) e pontuação final (0 a 100) de uma copy.
+
+    Returns:
+        dict: pontuacao, criterios, placeholders (lista dos vazamentos encontrados)
+    """
+    estruturada = CopyEstruturada.de_markdown(texto)
+    hooks = [h for h in re.findall(r"^\s*(?:\d+[.)]|[-*])\s+(.+)$", estruturada.hooks, flags=re.MULTILINE) if h.strip()]
+    placeholders = PADRAO_PLACEHOLDER.findall(texto)
+    palavras_corpo = len(estruturada.corpo.split())
+
+    criterios = {
+        "legibilidade": round(legibilidade(estruturada.corpo or texto) / 100, 3),
+        "hooks": round(sum(forca_hook(h) for h in hooks) / len(hooks), 3) if hooks else 0.0,
+        "tamanho": round(min(1.0, palavras_corpo / PALAVRAS_CORPO_MIN), 3),
+        "placeholders": round(max(0.0, 1 - 0.2 * len(placeholders)), 3),
+        "estrutura": round(sum(1 for nome in SECOES_COPY if estruturada.secao(nome)) / len(SECOES_COPY), 3),
+    }
+    pontuacao = round(100 * sum(PESOS[nome] * valor for nome, valor in criterios.items()), 1)
+    return {"pontuacao": pontuacao, "criterios": criterios, "placeholders": placeholders}
+
+
+def ranquear_copies(candidatos: List[str]) -> List[Dict]:
+    """
+    Ordena as variações da melhor para a pior.
+
+    Returns:
+        list: Dicts com texto, pontuacao, criterios e placeholders, em ordem decrescente
+    """
+    avaliados = [{"texto": texto, **avaliar_copy(texto)} for texto in candidatos]
+    avaliados.sort(key=lambda item: item["pontuacao"], reverse=True)
+    if avaliados:
+        logger.info(f"🏅 {len(avaliados)} variações ranqueadas: {[item['pontuacao'] for item in avaliados]}")
+    return avaliados
@@ -0,0 +1,328 @@
+"""
+Módulo de Roteamento de Provedores (roteador_module.py)
+
+Modo "auto" de provedor: em vez de fixar OpenAI ou Gemini, cada pedido vai
+para o provedor que está respondendo melhor agora. O roteador guarda uma
+janela móvel de latências e falhas por provedor (p50, p95, taxa de erro) e
+ordena os candidatos por essas métricas; provedores com poucas amostras vão
+na frente, para que as métricas de todos continuem atualizadas.
+
+Com hedging ligado, se o primeiro provedor não responder dentro do limiar
+(o p95 dele, ou HEDGE_PADRAO_S sem histórico), um segundo pedido sai para o
+próximo provedor e vale a resposta que chegar primeiro. Em streaming, o
+limiar é o p95 do tempo até o primeiro trecho, medido à parte (a latência
+da resposta completa, que mistura capítulos longos e hooks curtos, nunca
+seria atingida esperando só o primeiro trecho). Isso troca um pouco de
+custo extra por uma cauda de latência bem menor para quem está esperando
+na tela.
+"""
+
+import time
+import queue
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Dict, Iterator, List, Optional
+
+from modules.contexto_module import ContextoSessao
+from modules.llm_module import MAX_TOKENS, obter_cliente_llm
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROVEDOR_AUTO = "auto"
+PROVEDORES_ROTEAVEIS = ("openai", "gemini")
+
+JANELA_AMOSTRAS = 50
+JANELA_TEMPO_S = 15 * 60
+MIN_AMOSTRAS = 5
+HEDGE_PADRAO_S = 15.0
+HEDGE_PRIMEIRO_TRECHO_PADRAO_S = 5.0
+
+
+def provedores_disponiveis(contexto: ContextoSessao) -> List[str]:
+    """Provedores com chave configurada no contexto."""
+    return [provider for provider in PROVEDORES_ROTEAVEIS if contexto.chave_api(provider)]
+
+
+def _percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+class RoteadorProvedores:
+    """
+    Métricas móveis por provedor e escolha do melhor candidato.
+    """
+
+    def __init__(self, janela: int = JANELA_AMOSTRAS, janela_tempo_s: float = JANELA_TEMPO_S):
+        """
+        Args:
+            janela (int): Amostras mantidas por provedor
+            janela_tempo_s (float): Idade máxima de uma amostra, em segundos
+        """
+        self.janela_tempo_s = janela_tempo_s
+        self._amostras: Dict[str, deque] = {provider: deque(maxlen=janela) for provider in PROVEDORES_ROTEAVEIS}
+        self._primeiros_trechos: Dict[str, deque] = {provider: deque(maxlen=janela) for provider in PROVEDORES_ROTEAVEIS}
+        self._trava = threading.Lock()
+
+    def registrar(self, provider: str, latencia_s: float, sucesso: bool):
+        """Registra o resultado de uma chamada ao provedor."""
+        with self._trava:
+            self._amostras.setdefault(provider, deque(maxlen=JANELA_AMOSTRAS)).append(
+                (time.monotonic(), latencia_s, sucesso)
+            )
+
+    def registrar_primeiro_trecho(self, provider: str, ttft_s: float):
+        """Registra o tempo até o primeiro trecho de um stream do provedor."""
+        with self._trava:
+            self._primeiros_trechos.setdefault(provider, deque(maxlen=JANELA_AMOSTRAS)).append(
+                (time.monotonic(), ttft_s, True)
+            )
+
+    def _recentes(self, provider: str, amostras: Optional[Dict[str, deque]] = None) -> list:
+        limite = time.monotonic() - self.janela_tempo_s
+        return [amostra for amostra in (amostras or self._amostras).get(provider, ()) if amostra[0] >= limite]
+
+    def estatisticas(self, provider: str) -> Dict:
+        """
+        Returns:
+            dict: amostras, p50_s, p95_s (só chamadas bem-sucedidas), taxa_erro,
+                amostras_ttft e p95_ttft_s (tempo até o primeiro trecho dos streams)
+        """
+        with self._trava:
+            recentes = self._recentes(provider)
+            primeiros = [ttft for _, ttft, _ in self._recentes(provider, self._primeiros_trechos)]
+        latencias = [latencia for _, latencia, sucesso in recentes if sucesso]
+        return {
+            "amostras": len(recentes),
+            "p50_s": round(_percentil(latencias, 50), 2) if latencias else None,
+            "p95_s": round(_percentil(latencias, 95), 2) if latencias else None,
+            "taxa_erro": round(sum(1 for *_, sucesso in recentes if not sucesso) / len(recentes), 3) if recentes else 0.0,
+            "amostras_ttft": len(primeiros),
+            "p95_ttft_s": round(_percentil(primeiros, 95), 2) if primeiros else None,
+        }
+
+    def ordenar(self, candidatos: List[str]) -> List[str]:
+        """
+        Candidatos do melhor para o pior.
+
+        Quem tem menos de MIN_AMOSTRAS vem primeiro (exploração); os demais
+        são ordenados pela média de p50 e p95, penalizada pela taxa de erro.
+        """
+        def pontuacao(provider):
+            estat = self.estatisticas(provider)
+            if estat["amostras"] < MIN_AMOSTRAS or estat["p50_s"] is None:
+                return (0, estat["amostras"])
+            return (1, (estat["p50_s"] + estat["p95_s"]) / 2 * (1 + 4 * estat["taxa_erro"]))
+
+        return sorted(candidatos, key=pontuacao)
+
+    def limiar_hedge(self, provider: str, primeiro_trecho: bool = False) -> float:
+        """
+        Tempo de espera pelo provedor antes de disparar o pedido de reserva.
+
+        Args:
+            primeiro_trecho (bool): Limiar de um stream: p95 do tempo até o primeiro trecho
+        """
+        estat = self.estatisticas(provider)
+        if primeiro_trecho:
+            if estat["amostras_ttft"] < MIN_AMOSTRAS:
+                return HEDGE_PRIMEIRO_TRECHO_PADRAO_S
+            return estat["p95_ttft_s"]
+        if estat["amostras"] < MIN_AMOSTRAS or estat["p95_s"] is None:
+            return HEDGE_PADRAO_S
+        return estat["p95_s"]
+
+    def metricas(self) -> List[Dict]:
+        """Estatísticas de todos os provedores com amostras."""
+        return [{"provider": provider, **self.estatisticas(provider)}
+                for provider in self._amostras if self._amostras[provider]]
+
+    # ------------------------------------------------------------------
+    # Execução roteada
+    # ------------------------------------------------------------------
+    async def executar_async(self, candidatos: List[str], gerar_com, hedge: bool = False):
+        """
+        Executa `gerar_com(provider)` (corrotina) no melhor candidato.
+
+        Sem hedging, uma falha passa para o próximo candidato. Com hedging,
+        o próximo candidato também entra quando o atual passa do limiar;
+        vale o primeiro sucesso e os pedidos restantes são cancelados.
+        """
+        ordem = self.ordenar(candidatos)
+        tarefas = set()
+        proximo = 0
+        ultimo_erro = None
+
+        def lancar():
+            nonlocal proximo
+            tarefas.add(asyncio.ensure_future(gerar_com(ordem[proximo])))
+            proximo += 1
+
+        lancar()
+        try:
+            while tarefas:
+                espera = self.limiar_hedge(ordem[proximo - 1]) if hedge and proximo < len(ordem) else None
+                concluidas, tarefas = await asyncio.wait(tarefas, timeout=espera, return_when=asyncio.FIRST_COMPLETED)
+                if not concluidas:
+                    logger.info(f"🏎️ Hedging: {ordem[proximo - 1]} passou de {espera:.1f}s, disparando {ordem[proximo]}")
+                    lancar()
+                    continue
+
+                for tarefa in concluidas:
+                    if tarefa.exception() is None:
+                        return tarefa.result()
+                    ultimo_erro = tarefa.exception()
+
+                if not tarefas and proximo < len(ordem):
+                    logger.info(f"↪️ Failover para {ordem[proximo]}: {ultimo_erro}")
+                    lancar()
+        finally:
+            # Pedidos restantes (perdedores do hedging ou um cancelamento de fora)
+            for pendente in tarefas:
+                pendente.cancel()
+
+        raise ultimo_erro
+
+    def executar_stream(self, candidatos: List[str], stream_com, hedge: bool = False) -> Iterator[str]:
+        """
+        Versão em streaming de executar_async(), para código síncrono.
+
+        `stream_com(provider)` retorna um iterador de trechos. Cada stream roda
+        em uma thread própria; o primeiro provedor a entregar um trecho vence
+        e os demais são abandonados. São registrados o tempo até o primeiro
+        trecho (limiar do hedging em streams) e a latência do stream completo.
+
+        Se quem consome parar antes do fim (ex.: job cancelado), todos os
+        streams são abandonados e fechados, em vez de lidos até o fim.
+        """
+        ordem = self.ordenar(candidatos)
+        fila: queue.Queue = queue.Queue()
+        abandonar = {provider: threading.Event() for provider in ordem}
+        iteradores: Dict[str, Iterator[str]] = {}
+        iniciados: List[str] = []
+
+        def consumir(provider: str):
+            inicio = time.perf_counter()
+            primeiro = True
+            iterador = iteradores[provider] = iter(stream_com(provider))
+            try:
+                for trecho in iterador:
+                    if primeiro:
+                        primeiro = False
+                        self.registrar_primeiro_trecho(provider, time.perf_counter() - inicio)
+                    if abandonar[provider].is_set():
+                        return
+                    fila.put((provider, "trecho", trecho))
+                self.registrar(provider, time.perf_counter() - inicio, True)
+                fila.put((provider, "fim", None))
+            except Exception as e:
+                self.registrar(provider, time.perf_counter() - inicio, False)
+                fila.put((provider, "erro", e))
+            finally:
+                _fechar(iterador)
+
+        def lancar():
+            provider = ordem[len(iniciados)]
+            iniciados.append(provider)
+            threading.Thread(target=consumir, args=(provider,), name=f"stream-{provider}", daemon=True).start()
+
+        lancar()
+        vencedor = None
+        ativos = 1
+        ultimo_erro = None
+        try:
+            while True:
+                espera = None
+                if vencedor is None and hedge and len(iniciados) < len(ordem):
+                    espera = self.limiar_hedge(iniciados[-1], primeiro_trecho=True)
+                try:
+                    provider, tipo, valor = fila.get(timeout=espera)
+                except queue.Empty:
+                    logger.info(f"🏎️ Hedging: {iniciados[-1]} sem primeiro trecho em {espera:.1f}s, disparando {ordem[len(iniciados)]}")
+                    lancar()
+                    ativos += 1
+                    continue
+
+                if vencedor is None and tipo == "trecho":
+                    vencedor = provider
+                    for outro in iniciados:
+                        if outro != provider:
+                            abandonar[outro].set()
+                if vencedor is not None and provider != vencedor:
+                    continue
+
+                if tipo == "trecho":
+                    yield valor
+                elif tipo == "fim":
+                    return
+                elif vencedor is not None:
+                    raise valor  # falhou no meio do stream vencedor
+                else:
+                    ultimo_erro = valor
+                    ativos -= 1
+                    if ativos == 0:
+                        if len(iniciados) == len(ordem):
+                            raise ultimo_erro
+                        logger.info(f"↪️ Failover para {ordem[len(iniciados)]}: {ultimo_erro}")
+                        lancar()
+                        ativos += 1
+        finally:
+            # Consumidor parou (fim, erro ou cancelamento do job): nenhum stream segue sendo lido e pago
+            for evento in abandonar.values():
+                evento.set()
+            for iterador in list(iteradores.values()):
+                _fechar(iterador)
+
+
+def _fechar(iterador):
+    """
+    Fecha o stream do provedor (e a conexão HTTP por trás dele).
+
+    Um gerador em execução em outra thread não pode ser fechado daqui; essa
+    thread vê o pedido de abandono no próximo trecho e o fecha ela mesma.
+    """
+    fechar = getattr(iterador, "close", None)
+    if fechar is None:
+        return
+    try:
+        fechar()
+    except ValueError:
+        pass  # "generator already executing"
+    except Exception as e:
+        logger.debug(f"Erro ao fechar stream: {e}")
+
+
+_roteador: Optional[RoteadorProvedores] = None
+_trava_roteador = threading.Lock()
+
+
+def obter_roteador() -> RoteadorProvedores:
+    """Roteador único do processo."""
+    global _roteador
+    with _trava_roteador:
+        if _roteador is None:
+            _roteador = RoteadorProvedores()
+    return _roteador
+
+
+def gerar_stream_auto(prompt: str, contexto: ContextoSessao, temperature: float = 0.7,
+                      max_tokens: int = MAX_TOKENS) -> Iterator[str]:
+    """
+    Streaming no provedor "auto", para CerebroCopy e CriadorEntregaveis.
+
+    Raises:
+        ValueError: Se nenhum provedor tiver chave configurada
+    """
+    candidatos = provedores_disponiveis(contexto)
+    if not candidatos:
+        raise ValueError("Nenhum provedor de IA com chave configurada para o modo automático")
+    yield from obter_roteador().executar_stream(
+        candidatos,
+        lambda provider: obter_cliente_llm(provider, contexto).gerar_stream(prompt, temperature, max_tokens),
+        hedge=contexto.hedge,
+    )
@@ -0,0 +1,209 @@
+"""
+Módulo de Templates Offline (templates_module.py)
+
+Motor de templates do provedor nativo "manus": gera copies sem chamar
+nenhuma API, com latência e custo zero, e serve de fallback quando um
+provedor de IA falha. Os templates ficam em templates/manus/*.md e são
+lidos e compilados uma única vez por processo.
+
+Sintaxe dos templates:
+    {{campo}}                                 valor extraído da entrada (ver CAMPOS)
+    {% variante %} A {% ou %} B {% fim %}     uma das alternativas
+
+A alternativa de cada bloco é escolhida pelo hash da entrada: a mesma copy
+sempre gera o mesmo texto, e copies diferentes variam entre si.
+"""
+
+import os
+import re
+import glob
+import hashlib
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from modules.cache_module import obter_recurso
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DIRETORIO_TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "manus")
+
+CAMPOS = (
+    "nicho", "publico", "resultado", "tempo", "dor", "desejo", "produto", "palavra_chave",
+    "palavras_chave", "prazo", "produto_maiusculo", "desejo_maiusculo",
+)
+
+PRAZOS = ("até domingo às 23:59", "nas próximas 72 horas", "até a meia-noite de hoje")
+
+STOPWORDS = {
+    "para", "como", "mais", "você", "voce", "seus", "suas", "está", "esta", "este", "isso", "isto",
+    "essa", "esse", "aqui", "quem", "quando", "onde", "porque", "pois", "mesmo", "muito", "muita",
+    "sobre", "entre", "depois", "antes", "ainda", "também", "tudo", "todo", "toda", "todos", "nunca",
+    "sempre", "agora", "hoje", "apenas", "só", "sem", "com", "uma", "umas", "uns", "pelo", "pela",
+    "pelos", "pelas", "nosso", "nossa", "meu", "minha", "dele", "dela", "eles", "elas", "será", "seria",
+    "pode", "podem", "fazer", "faz", "ter", "tem", "têm", "vai", "vão", "sua", "seu", "que", "não",
+    "descubra", "segredo", "dias", "semanas", "meses", "horas", "minutos", "clique", "compre",
+    "garanta", "vaga", "chega", "cansado", "cansada", "cansados", "cansadas", "funciona", "funcionam",
+    "quer", "querem", "precisa", "precisar", "consegue", "conseguir", "método", "passo",
+}
+
+VERBOS_RESULTADO = (
+    "emagrecer", "perder", "ganhar", "faturar", "vender", "conquistar", "aprender", "eliminar",
+    "alcançar", "sair", "criar", "construir", "dominar", "economizar", "investir", "conseguir",
+)
+
+PADRAO_TOKEN = re.compile(r"(\{%\s*variante\s*%\}|\{%\s*ou\s*%\}|\{%\s*fim\s*%\}|\{\{\s*\w+\s*\}\})")
+
+
+class TemplateCompilado:
+    """
+    Template já transformado em uma lista de nós, pronto para renderizar.
+
+    Nós: ("texto", str), ("campo", nome) e ("variante", [lista de nós por alternativa]).
+    """
+
+    def __init__(self, nome: str, fonte: str):
+        """
+        Raises:
+            ValueError: Se a sintaxe estiver quebrada ou houver campo desconhecido
+        """
+        self.nome = nome
+        self.nos = self._compilar(fonte)
+
+    def _compilar(self, fonte: str) -> List[Tuple]:
+        nos: List[Tuple] = []
+        variante: Optional[List[List[Tuple]]] = None
+        destino = nos
+        for token in PADRAO_TOKEN.split(fonte):
+            if not token:
+                continue
+            marcador = re.sub(r"\s+", "", token)
+            if marcador == "{%variante%}":
+                if variante is not None:
+                    raise ValueError(f"Template {self.nome}: variantes aninhadas não são suportadas")
+                variante = [[]]
+                destino = variante[0]
+            elif marcador == "{%ou%}":
+                if variante is None:
+                    raise ValueError(f"Template {self.nome}: {{% ou %}} fora de uma variante")
+                variante.append([])
+                destino = variante[-1]
+            elif marcador == "{%fim%}":
+                if variante is None:
+                    raise ValueError(f"Template {self.nome}: {{% fim %}} sem {{% variante %}}")
+                nos.append(("variante", variante))
+                variante = None
+                destino = nos
+            elif marcador.startswith("{{"):
+                campo = marcador[2:-2]
+                if campo not in CAMPOS:
+                    raise ValueError(f"Template {self.nome}: campo desconhecido {{{{{campo}}}}}")
+                destino.append(("campo", campo))
+            else:
+                destino.append(("texto", token))
+        if variante is not None:
+            raise ValueError(f"Template {self.nome}: variante sem {{% fim %}}")
+        return nos
+
+    def renderizar(self, valores: Dict[str, str], semente: str) -> str:
+        """Preenche os campos e escolhe as variantes de forma determinística pela semente."""
+        partes = []
+        indice_variante = 0
+        for tipo, valor in self.nos:
+            if tipo == "texto":
+                partes.append(valor)
+            elif tipo == "campo":
+                partes.append(valores.get(valor, ""))
+            else:
+                escolha = int(hashlib.sha256(f"{semente}:{indice_variante}".encode("utf-8")).hexdigest(), 16) % len(valor)
+                indice_variante += 1
+                partes.extend(valores.get(v, "") if t == "campo" else v for t, v in valor[escolha])
+        return "".join(partes)
+
+
+class MotorTemplates:
+    """
+    Templates compilados de um diretório, carregados uma vez.
+    """
+
+    def __init__(self, diretorio: str = DIRETORIO_TEMPLATES):
+        """
+        Args:
+            diretorio (str): Diretório com os arquivos .md dos templates
+        """
+        self.templates: Dict[str, TemplateCompilado] = {}
+        for caminho in sorted(glob.glob(os.path.join(diretorio, "*.md"))):
+            nome = os.path.splitext(os.path.basename(caminho))[0]
+            with open(caminho, encoding="utf-8") as arquivo:
+                self.templates[nome] = TemplateCompilado(nome, arquivo.read())
+        logger.info(f"🧩 {len(self.templates)} templates offline compilados: {', '.join(self.templates)}")
+
+    def renderizar(self, nome: str, copy_original: str = "", nicho: str = "", publico_alvo: str = "") -> str:
+        """
+        Renderiza um template com os campos extraídos da entrada.
+
+        Raises:
+            KeyError: Se não houver template com esse nome
+        """
+        semente = hashlib.sha256(f"{copy_original}|{nicho}|{publico_alvo}".encode("utf-8")).hexdigest()
+        return self.templates[nome].renderizar(extrair_campos(copy_original, nicho, publico_alvo, semente), semente)
+
+
+def extrair_campos(copy_original: str, nicho: str = "", publico_alvo: str = "", semente: str = "") -> Dict[str, str]:
+    """
+    Valores dos campos a partir da copy original, do nicho e do público.
+
+    Tudo o que não puder ser extraído recebe um texto neutro, para que
+    nenhuma marcação como "[RESULTADO ESPECÍFICO]" apareça no resultado.
+    """
+    texto = copy_original.strip()
+    minusculo = texto.lower()
+
+    palavras = [p for p in re.findall(r"[a-zà-ÿ]{4,}", minusculo) if p not in STOPWORDS]
+    palavras_chave = [p for p, _ in Counter(palavras).most_common(3)]
+    nicho = nicho.strip() or "seu nicho"
+    palavra_chave = palavras_chave[0] if palavras_chave else nicho
+
+    tempo_encontrado = re.search(r"\b\d+\s?(?:dias|semanas|meses|horas|minutos)\b", minusculo)
+    tempo = tempo_encontrado.group(0) if tempo_encontrado else "poucas semanas"
+
+    resultado = f"ter resultados reais em {nicho}"
+    encontrado = re.search(rf"\b(?:{'|'.join(VERBOS_RESULTADO)})\b[^.!?,;:\n]*", minusculo)
+    if encontrado:
+        frase = encontrado.group(0)
+        if tempo_encontrado:
+            frase = frase.replace(f"em {tempo}", "")
+        resultado = " ".join(frase.split()[:8])
+
+    dor = "tentar de tudo sem resultado"
+    encontrada = re.search(r"\b(?:cansad[oa]s? de|chega de|sem precisar de|sem)\s+([^.!?,;:\n]{3,60})", minusculo)
+    if encontrada:
+        dor = " ".join(encontrada.group(1).split()[:6])
+
+    nome_produto = re.search(
+        r"\b(?:Método|Programa|Protocolo|Sistema|Curso|Desafio)(?:\s+[A-ZÀ-Ú0-9][\wÀ-ÿ]*)+", texto
+    )
+    produto = nome_produto.group(0) if nome_produto else f"Método {palavra_chave.title()}"
+
+    indice_prazo = int(semente, 16) % len(PRAZOS) if semente else 0
+    return {
+        "nicho": nicho,
+        "publico": publico_alvo.strip() or "quem quer resultados de verdade",
+        "resultado": resultado,
+        "tempo": tempo,
+        "dor": dor,
+        "desejo": resultado,
+        "produto": produto,
+        "palavra_chave": palavra_chave,
+        "palavras_chave": ", ".join(palavras_chave) or "nenhuma identificada",
+        "prazo": PRAZOS[indice_prazo],
+        "produto_maiusculo": produto.upper(),
+        "desejo_maiusculo": resultado.upper(),
+    }
+
+
+def obter_motor_templates() -> MotorTemplates:
+    """Templates offline compilados uma vez por processo."""
+    return obter_recurso("motor_templates", MotorTemplates)
@@ -0,0 +1,274 @@
+"""
+Módulo de Tradução de Entregáveis (traducao_module.py)
+
+Gera as versões em outros idiomas a partir de uma versão mestre já pronta,
+em vez de gerar o entregável do zero em cada idioma. A versão mestre é
+dividida em seções (pelos títulos Markdown) e cada seção que falta vira um
+prompt curto de tradução; todas as seções de todos os idiomas saem juntas
+pelo motor de geração.
+
+A memória de tradução (SQLite) guarda cada seção traduzida pelo hash do
+texto original e cada versão completa pelo hash da versão mestre. Se a
+mestre mudar, só as seções cujo texto mudou são traduzidas de novo.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from modules.cache_module import obter_recurso
+from modules.contexto_module import ContextoSessao
+from modules.cache_respostas_module import normalizar_prompt
+from modules.limites_module import estimar_tokens
+from modules.motor_geracao_module import GeracaoCancelada, PedidoGeracao, obter_motor
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IDIOMAS = {
+    "pt": "Português",
+    "en": "Inglês",
+    "es": "Espanhol",
+    "it": "Italiano",
+    "de": "Alemão",
+    "fr": "Francês"
+}
+
+CAMINHO_TRADUCOES = os.path.join("data", "traducoes.db")
+TEMPERATURA_TRADUCAO = 0.2
+MAX_TOKENS_TRADUCAO = 4096
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS secoes (
+    hash_origem TEXT NOT NULL,
+    idioma TEXT NOT NULL,
+    texto TEXT NOT NULL,
+    criado_em REAL NOT NULL,
+    PRIMARY KEY (hash_origem, idioma)
+);
+CREATE TABLE IF NOT EXISTS documentos (
+    hash_mestre TEXT NOT NULL,
+    idioma TEXT NOT NULL,
+    texto TEXT NOT NULL,
+    criado_em REAL NOT NULL,
+    PRIMARY KEY (hash_mestre, idioma)
+);
+"""
+
+
+def hash_conteudo(texto: str, idioma_origem: str) -> str:
+    """Hash do texto original (normalizado) junto com o idioma em que foi escrito."""
+    return hashlib.sha256(f"{idioma_origem}|{normalizar_prompt(texto)}".encode("utf-8")).hexdigest()
+
+
+def dividir_secoes(texto: str) -> List[str]:
+    """
+    Divide um documento Markdown em seções, cada uma começando em um título.
+
+    O texto antes do primeiro título (se houver) vira a primeira seção;
+    juntar as seções com "\\n" devolve o documento original.
+    """
+    secoes, atual = [], []
+    for linha in texto.split("\n"):
+        if re.match(r"^#{1,6}\s", linha) and any(l.strip() for l in atual):
+            secoes.append("\n".join(atual))
+            atual = []
+        atual.append(linha)
+    secoes.append("\n".join(atual))
+    return secoes
+
+
+class MemoriaTraducao:
+    """
+    Seções e documentos já traduzidos, pelo hash do texto original.
+    """
+
+    def __init__(self, caminho: str = CAMINHO_TRADUCOES):
+        """
+        Args:
+            caminho (str): Arquivo SQLite da memória de tradução
+        """
+        self.caminho = caminho
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with self._conexao() as conn:
+            conn.executescript(ESQUEMA)
+
+    @contextmanager
+    def _conexao(self):
+        conn = sqlite3.connect(self.caminho, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def documento(self, hash_mestre: str, idioma: str) -> Optional[str]:
+        """Versão completa já traduzida desta versão mestre, ou None."""
+        with self._conexao() as conn:
+            linha = conn.execute(
+                "SELECT texto FROM documentos WHERE hash_mestre = ? AND idioma = ?", (hash_mestre, idioma)
+            ).fetchone()
+        return linha[0] if linha else None
+
+    def secoes(self, hashes: List[str], idioma: str) -> Dict[str, str]:
+        """Traduções já existentes das seções (hash -> texto)."""
+        if not hashes:
+            return {}
+        with self._conexao() as conn:
+            linhas = conn.execute(
+                f"SELECT hash_origem, texto FROM secoes WHERE idioma = ? AND hash_origem IN ({', '.join('?' * len(hashes))})",
+                (idioma, *hashes),
+            ).fetchall()
+        return dict(linhas)
+
+    def gravar_secoes(self, secoes: List[tuple]):
+        """Grava várias traduções de seção (hash_origem, idioma, texto) em uma só transação."""
+        if not secoes:
+            return
+        agora = time.time()
+        with self._conexao() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO secoes VALUES (?, ?, ?, ?)",
+                [(hash_origem, idioma, texto, agora) for hash_origem, idioma, texto in secoes],
+            )
+
+    def gravar_documento(self, hash_mestre: str, idioma: str, texto: str):
+        with self._conexao() as conn:
+            conn.execute("INSERT OR REPLACE INTO documentos VALUES (?, ?, ?, ?)", (hash_mestre, idioma, texto, time.time()))
+
+
+def obter_memoria_traducao() -> MemoriaTraducao:
+    """Memória de tradução única do processo."""
+    return obter_recurso("memoria_traducao", MemoriaTraducao)
+
+
+class TradutorEntregaveis:
+    """
+    Tradução de uma versão mestre para vários idiomas, seção a seção.
+    """
+
+    def __init__(self, provider: str = "openai", contexto: Optional[ContextoSessao] = None, usar_cache: bool = True):
+        """
+        Args:
+            provider (str): Provedor de IA ("openai", "gemini" ou "auto")
+            contexto (ContextoSessao): Credenciais da sessão (padrão: variáveis de ambiente)
+            usar_cache (bool): Reaproveitar traduções da memória (as novas são gravadas sempre)
+        """
+        self.provider = provider
+        self.contexto = contexto or ContextoSessao.do_ambiente()
+        self.usar_cache = usar_cache
+        self.memoria = obter_memoria_traducao()
+        self.ultima_execucao = {"documentos_reaproveitados": 0, "secoes_reaproveitadas": 0, "secoes_traduzidas": 0}
+
+    @staticmethod
+    def _prompt(secao: str, idioma_origem: str, idioma: str) -> str:
+        """Prompt curto de tradução: sem persona nem diretrizes, só a seção."""
+        return (
+            f"Traduza o texto Markdown abaixo do {IDIOMAS.get(idioma_origem, idioma_origem)} para o "
+            f"{IDIOMAS.get(idioma, idioma)}. Mantenha a formatação, os emojis, as listas e os espaços "
+            f"em branco para preencher. Responda apenas com a tradução.\n\n{secao}"
+        )
+
+    def _pedido(self, secao: str, idioma_origem: str, idioma: str) -> PedidoGeracao:
+        # A memória de tradução já faz o papel do cache de respostas
+        max_tokens = min(MAX_TOKENS_TRADUCAO, int(estimar_tokens(secao) * 1.4) + 100)
+        return PedidoGeracao(self._prompt(secao, idioma_origem, idioma), self.provider, self.contexto,
+                             TEMPERATURA_TRADUCAO, max_tokens, usar_cache=False)
+
+    def traduzir(self, texto: str, idioma_origem: str, idiomas: List[str],
+                 cancelado: Optional[Callable[[], bool]] = None) -> Dict[str, str]:
+        """
+        Traduz a versão mestre para cada idioma pedido.
+
+        Args:
+            texto (str): Versão mestre em Markdown
+            idioma_origem (str): Idioma da versão mestre
+            idiomas (list): Idiomas de destino (o de origem é ignorado)
+            cancelado (callable): Consultada durante as traduções; True interrompe o lote
+
+        Returns:
+            dict: idioma -> texto traduzido (ou mensagem de erro, se alguma seção falhar)
+
+        Raises:
+            GeracaoCancelada: Se o cancelamento foi solicitado (as seções prontas ficam na memória)
+        """
+        idiomas = [i for i in dict.fromkeys(idiomas) if i != idioma_origem]
+        hash_mestre = hash_conteudo(texto, idioma_origem)
+        secoes = dividir_secoes(texto)
+        hashes = [hash_conteudo(secao, idioma_origem) for secao in secoes]
+        estatisticas = {"documentos_reaproveitados": 0, "secoes_reaproveitadas": 0, "secoes_traduzidas": 0}
+
+        versoes: Dict[str, str] = {}
+        traduzidas: Dict[str, Dict[str, str]] = {}
+        pendentes = []  # (idioma, índice da seção)
+        for idioma in idiomas:
+            documento = self.memoria.documento(hash_mestre, idioma) if self.usar_cache else None
+            if documento is not None:
+                versoes[idioma] = documento
+                estatisticas["documentos_reaproveitados"] += 1
+                continue
+            conhecidas = self.memoria.secoes(hashes, idioma) if self.usar_cache else {}
+            traduzidas[idioma] = {}
+            for i, (secao, hash_secao) in enumerate(zip(secoes, hashes)):
+                if not re.search(r"\w", secao):
+                    traduzidas[idioma][i] = secao  # separadores e linhas em branco
+                elif hash_secao in conhecidas:
+                    traduzidas[idioma][i] = conhecidas[hash_secao]
+                    estatisticas["secoes_reaproveitadas"] += 1
+                else:
+                    pendentes.append((idioma, i))
+
+        def ao_concluir(posicao: int, resultado):
+            if isinstance(resultado, str) and resultado.strip():
+                idioma, i = pendentes[posicao]
+                # A tradução volta sem as linhas em branco das bordas; as do original são mantidas
+                secao = secoes[i]
+                borda_inicio = secao[:len(secao) - len(secao.lstrip())]
+                borda_fim = secao[len(secao.rstrip()):]
+                traduzidas[idioma][i] = f"{borda_inicio}{resultado.strip()}{borda_fim}"
+                novas.append((hashes[i], idioma, traduzidas[idioma][i]))
+
+        erros: Dict[str, Exception] = {}
+        novas = []  # gravadas de uma vez na memória, depois do lote (também se cancelado)
+        if pendentes:
+            logger.info(f"🌐 Traduzindo {len(pendentes)} seção(ões) para {', '.join(traduzidas)}")
+            pedidos = [self._pedido(secoes[i].strip(), idioma_origem, idioma) for idioma, i in pendentes]
+            try:
+                resultados = obter_motor().gerar_lote(pedidos, ao_concluir=ao_concluir, cancelado=cancelado)
+            finally:
+                self.memoria.gravar_secoes(novas)
+            if any(isinstance(r, GeracaoCancelada) for r in resultados):
+                raise GeracaoCancelada("Tradução cancelada")
+            for (idioma, _), resultado in zip(pendentes, resultados):
+                if isinstance(resultado, Exception):
+                    erros.setdefault(idioma, resultado)
+                elif resultado and resultado.strip():
+                    estatisticas["secoes_traduzidas"] += 1
+
+        for idioma, partes in traduzidas.items():
+            if idioma in erros or len(partes) < len(secoes):
+                versoes[idioma] = f"Erro ao traduzir: {erros.get(idioma) or 'resposta vazia'}"
+                continue
+            versoes[idioma] = "\n".join(partes[i] for i in range(len(secoes)))
+            self.memoria.gravar_documento(hash_mestre, idioma, versoes[idioma])
+
+        self.ultima_execucao = estatisticas
+        logger.info(f"🌐 Tradução concluída: {estatisticas}")
+        return {idioma: versoes[idioma] for idioma in idiomas}
+
+
+def traduzir_entregavel(texto: str, idioma_origem: str, idiomas: List[str], provider: str = "openai",
+                        contexto: Optional[ContextoSessao] = None, usar_cache: bool = True,
+                        cancelado: Optional[Callable[[], bool]] = None) -> Dict[str, str]:
+    """
+    Função simplificada para traduzir uma versão mestre para vários idiomas.
+    """
+    tradutor = TradutorEntregaveis(provider=provider, contexto=contexto, usar_cache=usar_cache)
+    return tradutor.traduzir(texto, idioma_origem, idiomas, cancelado)
@@ -0,0 +1,389 @@
+"""
+Simulador Local de Provedores de IA
+
+Servidor HTTP que imita a API da OpenAI (chat completions) e a do Gemini
+(generateContent), para testar carga e latência da modelagem de copy, dos
+entregáveis, dos jobs e do lote sem gastar créditos nem esbarrar nos
+limites reais. As respostas são determinísticas (derivadas do hash do
+prompt) e seguem o formato que cada módulo espera: copy com as quatro
+seções, sumário em JSON para os entregáveis longos, seção "traduzida" e
+texto Markdown nos demais casos.
+
+Também simula o que importa para o desempenho:
+- latência até o primeiro token (fixa, normal ou lognormal) e vazão de tokens;
+- streaming (SSE da OpenAI; SSE ou array JSON do Gemini);
+- erros 500 e 429 (com retry-after-ms) em taxas configuráveis;
+- cache de prompt: prefixos de 1024+ tokens já vistos voltam como cached_tokens.
+
+Execução:
+    python simulador_llm.py --porta 8100 --latencia-ms 400 --distribuicao lognormal --taxa-429 0.05
+
+Apontando o ecossistema para o simulador (.env ou variáveis de ambiente):
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1
+    GEMINI_BASE_URL=http://127.0.0.1:8100
+    OPENAI_API_KEY=simulador
+    GOOGLE_API_KEY=simulador
+
+Métricas do simulador: GET /metricas
+"""
+
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from modules.limites_module import estimar_tokens
+
+DISTRIBUICOES = ("fixa", "normal", "lognormal")
+
+# Regras do cache de prompt da OpenAI: prefixos a partir de 1024 tokens, em blocos de 128
+MIN_TOKENS_CACHE = 1024
+BLOCO_TOKENS_CACHE = 128
+CAPACIDADE_CACHE_PREFIXOS = 1000
+
+PALAVRAS = (
+    "resultado", "método", "simples", "prático", "você", "transformação", "rotina", "passo", "clareza",
+    "estratégia", "hoje", "conquista", "foco", "progresso", "decisão", "hábito", "ganho", "prova",
+    "confiança", "valor", "tempo", "energia", "semana", "objetivo", "escolha", "plano", "ação",
+)
+
+
+class ConfiguracaoSimulador:
+    """
+    Parâmetros do simulador (padrões das variáveis SIMULADOR_*).
+    """
+
+    def __init__(self, latencia_ms: float = None, desvio_ms: float = None, distribuicao: str = None,
+                 tokens_s: float = None, taxa_erro: float = None, taxa_429: float = None,
+                 retry_after_ms: int = None, semente: int = None):
+        """
+        Args:
+            latencia_ms (float): Latência típica até o primeiro token (mediana na lognormal)
+            desvio_ms (float): Desvio padrão (normal) ou escala do sigma (lognormal)
+            distribuicao (str): "fixa", "normal" ou "lognormal"
+            tokens_s (float): Vazão de tokens da resposta, por segundo
+            taxa_erro (float): Fração de requisições respondidas com 500
+            taxa_429 (float): Fração de requisições respondidas com 429
+            retry_after_ms (int): Espera sugerida nos 429
+            semente (int): Semente dos sorteios de latência e erros
+        """
+        def env(nome, padrao, tipo):
+            return tipo(os.getenv(f"SIMULADOR_{nome}", padrao))
+
+        self.latencia_ms = latencia_ms if latencia_ms is not None else env("LATENCIA_MS", "400", float)
+        self.desvio_ms = desvio_ms if desvio_ms is not None else env("DESVIO_MS", "150", float)
+        self.distribuicao = distribuicao or env("DISTRIBUICAO", "lognormal", str)
+        self.tokens_s = tokens_s if tokens_s is not None else env("TOKENS_S", "80", float)
+        self.taxa_erro = taxa_erro if taxa_erro is not None else env("TAXA_ERRO", "0", float)
+        self.taxa_429 = taxa_429 if taxa_429 is not None else env("TAXA_429", "0", float)
+        self.retry_after_ms = retry_after_ms if retry_after_ms is not None else env("RETRY_AFTER_MS", "1000", int)
+        self.semente = semente if semente is not None else env("SEMENTE", "42", int)
+        if self.distribuicao not in DISTRIBUICOES:
+            raise ValueError(f"Distribuição inválida: {self.distribuicao} (use {', '.join(DISTRIBUICOES)})")
+
+
+class SimuladorLLM:
+    """
+    Estado do simulador: sorteios, cache de prefixos e contadores.
+    """
+
+    def __init__(self, config: ConfiguracaoSimulador):
+        self.config = config
+        self._aleatorio = random.Random(config.semente)
+        self._prefixos: "OrderedDict[str, bool]" = OrderedDict()
+        self._trava = threading.Lock()
+        self._metricas = {"requisicoes": 0, "streams": 0, "erros_500": 0, "erros_429": 0,
+                          "tokens_prompt": 0, "tokens_em_cache": 0, "tokens_resposta": 0}
+
+    def _contar(self, **valores):
+        with self._trava:
+            for nome, valor in valores.items():
+                self._metricas[nome] += valor
+
+    def sortear_falha(self) -> Optional[int]:
+        """Status de erro a devolver nesta requisição (429 ou 500), ou None."""
+        with self._trava:
+            sorteio = self._aleatorio.random()
+        if sorteio < self.config.taxa_429:
+            self._contar(erros_429=1)
+            return 429
+        if sorteio < self.config.taxa_429 + self.config.taxa_erro:
+            self._contar(erros_500=1)
+            return 500
+        return None
+
+    def sortear_ttft_s(self) -> float:
+        """Latência até o primeiro token, pela distribuição configurada."""
+        media, desvio = self.config.latencia_ms / 1000, self.config.desvio_ms / 1000
+        with self._trava:
+            if self.config.distribuicao == "fixa":
+                return media
+            if self.config.distribuicao == "normal":
+                return max(0.0, self._aleatorio.gauss(media, desvio))
+            # Lognormal com mediana = latencia_ms: cauda longa como a dos provedores reais
+            sigma = desvio / media if media else 0.0
+            return self._aleatorio.lognormvariate(0.0, sigma) * media
+
+    def tokens_em_cache(self, prefixo: str) -> int:
+        """Tokens do prefixo que "estavam em cache" (prefixo longo já visto antes)."""
+        tokens = estimar_tokens(prefixo)
+        if tokens < MIN_TOKENS_CACHE:
+            return 0
+        chave = hashlib.sha256(prefixo.encode("utf-8")).hexdigest()
+        with self._trava:
+            visto = chave in self._prefixos
+            self._prefixos[chave] = True
+            self._prefixos.move_to_end(chave)
+            while len(self._prefixos) > CAPACIDADE_CACHE_PREFIXOS:
+                self._prefixos.popitem(last=False)
+        return tokens // BLOCO_TOKENS_CACHE * BLOCO_TOKENS_CACHE if visto else 0
+
+    def registrar(self, tokens_prompt: int, tokens_cache: int, tokens_resposta: int, stream: bool):
+        self._contar(requisicoes=1, streams=int(stream), tokens_prompt=tokens_prompt,
+                     tokens_em_cache=tokens_cache, tokens_resposta=tokens_resposta)
+
+    def metricas(self) -> Dict:
+        with self._trava:
+            return dict(self._metricas)
+
+
+# --- RESPOSTAS DETERMINÍSTICAS ---
+
+def _frases(semente: str, quantidade: int) -> List[str]:
+    aleatorio = random.Random(semente)
+    frases = []
+    for _ in range(quantidade):
+        palavras = [aleatorio.choice(PALAVRAS) for _ in range(aleatorio.randint(8, 16))]
+        frases.append(" ".join(palavras).capitalize() + aleatorio.choice((".", ".", "!", "?")))
+    return frases
+
+
+def _paragrafos(semente: str, palavras_alvo: int) -> str:
+    frases = _frases(semente, max(1, palavras_alvo // 12))
+    return "\n\n".join(" ".join(frases[i:i + 4]) for i in range(0, len(frases), 4))
+
+
+def gerar_texto(prompt: str, max_tokens: int, variante: int = 0) -> str:
+    """
+    Resposta determinística no formato que o prompt pede.
+
+    Args:
+        prompt (str): Prompt completo (sistema + usuário)
+        max_tokens (int): Limite de tokens da resposta
+        variante (int): Índice da resposta quando o pedido tem n > 1
+    """
+    semente = hashlib.sha256(f"{variante}|{prompt}".encode("utf-8")).hexdigest()
+    limite_palavras = max(20, int(max_tokens * 0.7))
+
+    if "HOOKS OTIMIZADOS" in prompt and "CORPO OTIMIZADO" in prompt:
+        hooks = "\n".join(f"{i}. **Hook {i}:** {frase}" for i, frase in enumerate(_frases(semente + "h", 5), start=1))
+        return (
+            f"## 🎯 HOOKS OTIMIZADOS\n\n{hooks}\n\n"
+            f"## 📝 CORPO OTIMIZADO\n\n{_paragrafos(semente + 'c', min(360, limite_palavras))}\n\n"
+            f"## 🚀 NOVA CHAMADA PARA AÇÃO\n\n{' '.join(_frases(semente + 'a', 2))}\n\n"
+            f"## 📊 ANÁLISE DA OTIMIZAÇÃO\n\n" + "\n".join(f"- {f}" for f in _frases(semente + "n", 3))
+        )
+
+    if "Responda APENAS com um JSON" in prompt:
+        encontrado = re.search(r"em (\d+) capítulos", prompt)
+        capitulos = int(encontrado.group(1)) if encontrado else 8
+        frases = _frases(semente, capitulos + 4)
+        return json.dumps({
+            "titulo": frases[0].rstrip(".!?"),
+            "objetivo": frases[1],
+            "para_quem": frases[2],
+            "tom": "didático e direto",
+            "capitulos": [{"titulo": f"Capítulo {i + 1}: {frases[3 + i][:40].rstrip()}", "resumo": frases[3 + i]}
+                          for i in range(capitulos)],
+            "beneficios": frases[-3:],
+        }, ensure_ascii=False)
+
+    if prompt.startswith("Traduza"):
+        # "Tradução": devolve a própria seção, preservando a estrutura Markdown
+        return prompt.split("\n\n", 1)[-1]
+
+    return _paragrafos(semente, min(400, limite_palavras))
+
+
+def _trechos(texto: str, tamanho: int = 4) -> Iterator[str]:
+    """Divide o texto em trechos de algumas palavras, mantendo os espaços."""
+    partes = re.findall(r"\S+\s*|\s+", texto)
+    for i in range(0, len(partes), tamanho):
+        yield "".join(partes[i:i + tamanho])
+
+
+# --- APLICAÇÃO ---
+
+def criar_app(config: Optional[ConfiguracaoSimulador] = None) -> FastAPI:
+    """Aplicação FastAPI do simulador."""
+    simulador = SimuladorLLM(config or ConfiguracaoSimulador())
+    app = FastAPI(title="Simulador de provedores de IA", version="1.0.0")
+    app.state.simulador = simulador
+
+    def erro_openai(status: int) -> JSONResponse:
+        cabecalhos = {"retry-after-ms": str(simulador.config.retry_after_ms)} if status == 429 else {}
+        tipo = "rate_limit_exceeded" if status == 429 else "server_error"
+        return JSONResponse({"error": {"message": f"Erro simulado ({status})", "type": tipo, "code": tipo}},
+                            status_code=status, headers=cabecalhos)
+
+    def erro_gemini(status: int) -> JSONResponse:
+        estado = "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"
+        return JSONResponse({"error": {"code": status, "message": f"Erro simulado ({status})", "status": estado}},
+                            status_code=status)
+
+    async def esperar_geracao(tokens: int):
+        await asyncio.sleep(tokens / simulador.config.tokens_s if simulador.config.tokens_s else 0)
+
+    @app.get("/metricas")
+    async def metricas():
+        return simulador.metricas()
+
+    # OpenAI -------------------------------------------------------------
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        corpo = await request.json()
+        mensagens = corpo.get("messages", [])
+        prefixo = "".join(m.get("content", "") for m in mensagens if m.get("role") == "system")
+        prompt = "\n\n".join(m.get("content", "") for m in mensagens)
+        max_tokens = corpo.get("max_tokens") or corpo.get("max_completion_tokens") or 2000
+        n = int(corpo.get("n") or 1)
+        modelo = corpo.get("model", "simulador")
+
+        await asyncio.sleep(simulador.sortear_ttft_s())
+        status = simulador.sortear_falha()
+        if status:
+            return erro_openai(status)
+
+        textos = [gerar_texto(prompt, max_tokens, variante) for variante in range(n)]
+        tokens_prompt = estimar_tokens(prompt)
+        tokens_cache = simulador.tokens_em_cache(prefixo)
+        tokens_resposta = sum(estimar_tokens(t) for t in textos)
+        uso = {
+            "prompt_tokens": tokens_prompt,
+            "completion_tokens": tokens_resposta,
+            "total_tokens": tokens_prompt + tokens_resposta,
+            "prompt_tokens_details": {"cached_tokens": tokens_cache},
+        }
+        identificador = f"chatcmpl-{hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:24]}"
+        criado = int(time.time())
+        simulador.registrar(tokens_prompt, tokens_cache, tokens_resposta, bool(corpo.get("stream")))
+
+        if not corpo.get("stream"):
+            await esperar_geracao(tokens_resposta)
+            return {
+                "id": identificador, "object": "chat.completion", "created": criado, "model": modelo,
+                "choices": [{"index": i, "message": {"role": "assistant", "content": texto}, "finish_reason": "stop"}
+                            for i, texto in enumerate(textos)],
+                "usage": uso,
+            }
+
+        incluir_uso = (corpo.get("stream_options") or {}).get("include_usage")
+
+        async def eventos():
+            base = {"id": identificador, "object": "chat.completion.chunk", "created": criado, "model": modelo}
+            for trecho in _trechos(textos[0]):
+                await esperar_geracao(estimar_tokens(trecho))
+                evento = {**base, "choices": [{"index": 0, "delta": {"content": trecho}, "finish_reason": None}]}
+                yield f"data: {json.dumps(evento, ensure_ascii=False)}\n\n"
+            final = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            yield f"data: {json.dumps(final)}\n\n"
+            if incluir_uso:
+                yield f"data: {json.dumps({**base, 'choices': [], 'usage': uso})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(eventos(), media_type="text/event-stream")
+
+    # Gemini -------------------------------------------------------------
+    @app.post("/v1beta/models/{alvo}")
+    async def gemini(alvo: str, request: Request):
+        modelo, _, acao = alvo.partition(":")
+        if acao not in ("generateContent", "streamGenerateContent"):
+            return erro_gemini(404)
+        corpo = await request.json()
+        prompt = "\n\n".join(
+            parte.get("text", "") for conteudo in corpo.get("contents", []) for parte in conteudo.get("parts", [])
+        )
+        max_tokens = (corpo.get("generationConfig") or corpo.get("generation_config") or {}).get(
+            "maxOutputTokens") or 2000
+
+        await asyncio.sleep(simulador.sortear_ttft_s())
+        status = simulador.sortear_falha()
+        if status:
+            return erro_gemini(status)
+
+        texto = gerar_texto(prompt, int(max_tokens))
+        tokens_prompt = estimar_tokens(prompt)
+        # Cache implícito do Gemini: vale para o início do texto, sem mensagem de sistema
+        tokens_cache = simulador.tokens_em_cache(prompt[:len(prompt) * 3 // 4])
+        tokens_resposta = estimar_tokens(texto)
+        uso = {"promptTokenCount": tokens_prompt, "candidatesTokenCount": tokens_resposta,
+               "totalTokenCount": tokens_prompt + tokens_resposta, "cachedContentTokenCount": tokens_cache}
+        simulador.registrar(tokens_prompt, tokens_cache, tokens_resposta, acao == "streamGenerateContent")
+
+        def resposta(trecho: str, final: bool) -> Dict:
+            candidato = {"content": {"parts": [{"text": trecho}], "role": "model"}, "index": 0}
+            if final:
+                candidato["finishReason"] = "STOP"
+            return {"candidates": [candidato], "usageMetadata": uso, "modelVersion": modelo}
+
+        if acao == "generateContent":
+            await esperar_geracao(tokens_resposta)
+            return resposta(texto, True)
+
+        trechos = list(_trechos(texto, 12))
+        sse = request.query_params.get("alt") == "sse"
+
+        async def eventos():
+            # alt=sse: eventos SSE (API pública); sem ele: array JSON em partes (transporte REST do SDK)
+            if not sse:
+                yield "["
+            for i, trecho in enumerate(trechos):
+                await esperar_geracao(estimar_tokens(trecho))
+                dados = json.dumps(resposta(trecho, i == len(trechos) - 1), ensure_ascii=False)
+                if sse:
+                    yield f"data: {dados}\n\n"
+                else:
+                    yield ("," if i else "") + dados
+            if not sse:
+                yield "]"
+
+        return StreamingResponse(eventos(), media_type="text/event-stream" if sse else "application/json")
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulador local das APIs da OpenAI e do Gemini.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8100)
+    parser.add_argument("--latencia-ms", type=float, help="Latência típica até o primeiro token (padrão: 400)")
+    parser.add_argument("--desvio-ms", type=float, help="Dispersão da latência (padrão: 150)")
+    parser.add_argument("--distribuicao", choices=DISTRIBUICOES, help="Distribuição da latência (padrão: lognormal)")
+    parser.add_argument("--tokens-s", type=float, help="Vazão de tokens da resposta (padrão: 80)")
+    parser.add_argument("--taxa-erro", type=float, help="Fração de respostas 500 (padrão: 0)")
+    parser.add_argument("--taxa-429", type=float, help="Fração de respostas 429 (padrão: 0)")
+    parser.add_argument("--retry-after-ms", type=int, help="Espera sugerida nos 429 (padrão: 1000)")
+    parser.add_argument("--semente", type=int, help="Semente dos sorteios (padrão: 42)")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    config = ConfiguracaoSimulador(args.latencia_ms, args.desvio_ms, args.distribuicao, args.tokens_s,
+                                   args.taxa_erro, args.taxa_429, args.retry_after_ms, args.semente)
+    print(f"🧪 Simulador em http://{args.host}:{args.porta} · {config.distribuicao} {config.latencia_ms:.0f}ms · "
+          f"{config.tokens_s:.0f} tokens/s · 429 {config.taxa_429:.0%} · 500 {config.taxa_erro:.0%}")
+    uvicorn.run(criar_app(config), host=args.host, port=args.porta, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()